@@ -9,16 +9,28 @@ __description__ = """Powerful and Lightweight Python Tree Data Structure.."""
 __url__ = "https://github.com/c0fec0de/anytree"
 
 from .search import CountError  # noqa
+from .search import Q  # noqa
 from .search import find  # noqa
 from .search import find_by_attr  # noqa
 from .search import findall  # noqa
 from .search import findall_by_attr  # noqa
+from .search import findall_by_range  # noqa
+from .search import ifindall  # noqa
+from .search import ifindall_by_attr  # noqa
+from .search import topk  # noqa
+from .index import BloomIndex  # noqa
+from .index import PrefixIndex  # noqa
+from .index import RangeIndex  # noqa
+from .index import TreeIndex  # noqa
+from .iterators import BestFirstIter  # noqa
+from .iterators import ConcurrentModificationError  # noqa
 from .iterators import LevelOrderGroupIter  # noqa
 from .iterators import LevelOrderIter  # noqa
 from .iterators import PostOrderIter  # noqa
 from .iterators import PreOrderIter  # noqa
 from .iterators import ZigZagGroupIter  # noqa
 from .node import AnyNode  # noqa
+from .node import AttrNotifyMixin  # noqa
 from .node import LoopError  # noqa
 from .node import Node  # noqa
 from .node import NodeMixin  # noqa
@@ -28,12 +40,16 @@ from .render import AsciiStyle  # noqa
 from .render import ContRoundStyle  # noqa
 from .render import ContStyle  # noqa
 from .render import DoubleStyle  # noqa
+from .render import LiveRender  # noqa
 from .render import RenderTree  # noqa
+from .render import RowChange  # noqa
 from .resolver import ChildResolverError  # noqa
 from .resolver import Resolver  # noqa
 from .resolver import ResolverError  # noqa
 from .walker import WalkError  # noqa
 from .walker import Walker  # noqa
+from .differ import apply_patch  # noqa
+from .differ import diff  # noqa
 from . import util  # noqa
 
 
@@ -0,0 +1,225 @@
+# -*- coding: utf-8 -*-
+"""
+Asynchronous Tree Iteration.
+
+* :any:`AsyncPreOrderIter`: iterate over tree using pre-order strategy (self, children)
+* :any:`AsyncLevelOrderIter`: iterate over tree using level-order strategy
+* :any:`async_findall`: search nodes
+
+The functions `filter_`, `stop` and `children` may be coroutine functions.
+The predicates of a whole frontier are awaited concurrently, limited by `concurrency`.
+The frontier of :any:`AsyncPreOrderIter` is formed by the children of a node,
+the frontier of :any:`AsyncLevelOrderIter` is the next level.
+The nodes are returned in the traversal order, independent of the completion order.
+
+This module requires Python 3.6, the examples use `asyncio.run` of Python 3.7.
+"""
+
+import asyncio
+import inspect
+
+from anytree.search import CountError
+from anytree.search import _MAXPREVIEW
+
+
+class AsyncAbstractIter(object):
+
+    def __init__(self, node, filter_=None, stop=None, maxlevel=None, concurrency=16, children=None):
+        """
+        Base class for all asynchronous iterators.
+
+        Iterate over tree starting at `node`.
+
+        Keyword Args:
+            filter_: function called with every `node` as argument, `node` is returned if `True`.
+            stop: stop iteration at `node` if `stop` function returns `True` for `node`.
+            maxlevel (int): maximum decending in the node hierarchy.
+            concurrency (int): maximum number of concurrently awaited predicates.
+            children: function returning the sequence of child nodes of a node.
+        """
+        self.node = node
+        self.filter_ = filter_
+        self.stop = stop
+        self.maxlevel = maxlevel
+        self.concurrency = concurrency
+        self.children = children
+
+    def __aiter__(self):
+        return self._iter(_Checker(self))
+
+    async def _iter(self, checker):
+        raise NotImplementedError("Implement it")
+        yield
+
+    def _abort_at_level(self, level):
+        return self.maxlevel is not None and level > self.maxlevel
+
+
+class AsyncPreOrderIter(AsyncAbstractIter):
+
+    """
+    Iterate over tree applying pre-order strategy starting at `node`.
+
+    The predicates of all children of a node are awaited concurrently.
+
+    >>> import asyncio
+    >>> from anytree import Node
+    >>> f = Node("f")
+    >>> b = Node("b", parent=f)
+    >>> a = Node("a", parent=b)
+    >>> d = Node("d", parent=b)
+    >>> g = Node("g", parent=f)
+    >>> async def is_leaf(node):
+    ...     await asyncio.sleep(0)
+    ...     return node.is_leaf
+    >>> async def main():
+    ...     return [node.name async for node in AsyncPreOrderIter(f, filter_=is_leaf)]
+    >>> asyncio.run(main())
+    ['a', 'd', 'g']
+    """
+
+    async def _iter(self, checker):
+        if self._abort_at_level(1):
+            return
+        stack = [(iter(await checker.check([self.node])), 1)]
+        while stack:
+            items, level = stack[-1]
+            for node, match in items:
+                if match:
+                    yield node
+                if not self._abort_at_level(level + 1):
+                    children = await checker.check(await checker.children(node))
+                    if children:
+                        stack.append((iter(children), level + 1))
+                break
+            else:
+                stack.pop()
+
+
+class AsyncLevelOrderIter(AsyncAbstractIter):
+
+    """
+    Iterate over tree applying level-order strategy starting at `node`.
+
+    The predicates of all nodes of a level are awaited concurrently.
+
+    >>> import asyncio
+    >>> from anytree import Node
+    >>> f = Node("f")
+    >>> b = Node("b", parent=f)
+    >>> a = Node("a", parent=b)
+    >>> d = Node("d", parent=b)
+    >>> g = Node("g", parent=f)
+    >>> async def main():
+    ...     return [node.name async for node in AsyncLevelOrderIter(f)]
+    >>> asyncio.run(main())
+    ['f', 'b', 'g', 'a', 'd']
+    """
+
+    async def _iter(self, checker):
+        level = 1
+        if self._abort_at_level(level):
+            return
+        frontier = await checker.check([self.node])
+        while frontier:
+            for node, match in frontier:
+                if match:
+                    yield node
+            level += 1
+            if self._abort_at_level(level):
+                break
+            nodes = []
+            for children in await asyncio.gather(*[checker.children(node) for node, _ in frontier]):
+                nodes.extend(children)
+            frontier = await checker.check(nodes)
+
+
+async def async_findall(node, filter_=None, stop=None, maxlevel=None, mincount=None, maxcount=None,
+                        concurrency=16, children=None):
+    """
+    Search nodes matching `filter_` but stop at `maxlevel` or `stop`.
+
+    Return tuple with matching nodes in pre-order like :any:`findall`.
+
+    Args:
+        node: top node, start searching.
+
+    Keyword Args:
+        filter_: function called with every `node` as argument, `node` is returned if `True`.
+        stop: stop iteration at `node` if `stop` function returns `True` for `node`.
+        maxlevel (int): maximum decending in the node hierarchy.
+        mincount (int): minimum number of nodes.
+        maxcount (int): maximum number of nodes.
+        concurrency (int): maximum number of concurrently awaited predicates.
+        children: function returning the sequence of child nodes of a node.
+
+    >>> import asyncio
+    >>> from anytree import Node
+    >>> f = Node("f")
+    >>> b = Node("b", parent=f, size=4)
+    >>> a = Node("a", parent=b, size=2)
+    >>> g = Node("g", parent=f, size=8)
+    >>> async def large(node):
+    ...     await asyncio.sleep(0)
+    ...     return getattr(node, "size", 0) > 3
+    >>> asyncio.run(async_findall(f, filter_=large))
+    (Node('/f/b', size=4), Node('/f/g', size=8))
+    """
+    nodes = AsyncPreOrderIter(node, filter_=filter_, stop=stop, maxlevel=maxlevel, concurrency=concurrency,
+                              children=children)
+    result = []
+    async for item in nodes:
+        result.append(item)
+        if maxcount is not None and len(result) > maxcount:
+            # stop at the first match exceeding `maxcount`
+            msg = "Expecting %d elements at maximum, but found at least %d."
+            raise CountError(msg % (maxcount, len(result)), result[:_MAXPREVIEW + 1])
+    if mincount is not None and len(result) < mincount:
+        msg = "Expecting at least %d elements, but found %d."
+        raise CountError(msg % (mincount, len(result)), result)
+    return tuple(result)
+
+
+class _Checker(object):
+
+    """Concurrent evaluation of the predicates of one iteration."""
+
+    def __init__(self, iter_):
+        self.filter_ = iter_.filter_
+        self.stop = iter_.stop
+        self.getchildren = iter_.children
+        self.concurrency = iter_.concurrency
+        self.__semaphore = None
+
+    @property
+    def semaphore(self):
+        # created within the running event loop, as Python < 3.10 binds it on creation
+        if self.__semaphore is None:
+            self.__semaphore = asyncio.Semaphore(self.concurrency)
+        return self.__semaphore
+
+    async def check(self, nodes):
+        """Return list of (node, match) for all nodes not stopped."""
+        results = await asyncio.gather(*[self.__check(node) for node in nodes])
+        return [(node, match) for node, (stopped, match) in zip(nodes, results) if not stopped]
+
+    async def children(self, node):
+        if self.getchildren is None:
+            return node.children
+        async with self.semaphore:
+            return tuple(await _call(self.getchildren, node))
+
+    async def __check(self, node):
+        async with self.semaphore:
+            if self.stop is not None and await _call(self.stop, node):
+                return True, False
+            if self.filter_ is None:
+                return False, True
+            return False, bool(await _call(self.filter_, node))
+
+
+async def _call(func, node):
+    result = func(node)
+    if inspect.isawaitable(result):
+        result = await result
+    return result
@@ -0,0 +1,276 @@
+# -*- coding: utf-8 -*-
+"""
+Tree Differences.
+
+* :any:`diff`: edit script transforming one tree into another.
+* :any:`apply_patch`: apply edit script to a tree.
+
+Nodes are identified by a `key`, which is unique within each tree.
+The edit script is a list of the operations :any:`Insert`, :any:`Move`, :any:`Update` and :any:`Delete`.
+"""
+
+import collections
+
+
+class Insert(collections.namedtuple("Insert", ("key", "parent", "index", "attrs"))):
+
+    """Insert new node `key` with attributes `attrs` as child at `index` of `parent`."""
+
+    __slots__ = ()
+
+
+class Move(collections.namedtuple("Move", ("key", "parent", "index"))):
+
+    """Move node `key` to child at `index` of `parent`."""
+
+    __slots__ = ()
+
+
+class Update(collections.namedtuple("Update", ("key", "attrs", "deleted"))):
+
+    """Set attributes `attrs` and delete the attributes named by `deleted` of node `key`."""
+
+    __slots__ = ()
+
+
+class Delete(collections.namedtuple("Delete", ("key",))):
+
+    """Delete node `key` with all its descendants."""
+
+    __slots__ = ()
+
+
+def diff(old, new, key=None):
+    """
+    Return edit script transforming the tree `old` into the tree `new`.
+
+    Args:
+        old: root node of the original tree.
+        new: root node of the modified tree.
+
+    Keyword Args:
+        key: function returning the unique key of a node.
+             Default is the tuple of the `name` attributes along the path below the root node,
+             which requires unique names among siblings.
+             Duplicate keys raise a :any:`ValueError`.
+
+    The edit script contains the minimal number of operations for the given keys:
+    an :any:`Insert` for every new node, a :any:`Move` for every node with another parent
+    or out of order within its siblings, an :any:`Update` for every node with modified public attributes
+    and a :any:`Delete` for every removed node with a remaining parent.
+    Positions are the final child indices within the modified tree.
+    The operations are grouped by parent, the parents are ordered like the modified tree (pre-order),
+    deletions come last.
+    Identical subtrees are skipped via :any:`subtree_hash`,
+    which is calculated once per call for nodes not derived from :any:`AttrNotifyMixin`.
+    Nodes are only moved between parents, if `key` is independent of the node path.
+
+    >>> from anytree import AnyNode, RenderTree
+    >>> old = AnyNode(id="root")
+    >>> a = AnyNode(id="a", parent=old, size=1)
+    >>> b = AnyNode(id="b", parent=old)
+    >>> c = AnyNode(id="c", parent=b)
+    >>> d = AnyNode(id="d", parent=b)
+    >>> new = AnyNode(id="root")
+    >>> b2 = AnyNode(id="b", parent=new)
+    >>> d2 = AnyNode(id="d", parent=b2)
+    >>> c2 = AnyNode(id="c", parent=b2)
+    >>> a2 = AnyNode(id="a", parent=d2, size=2)
+    >>> e2 = AnyNode(id="e", parent=new)
+    >>> for op in diff(old, new, key=lambda node: node.id):
+    ...     print(op)
+    Insert(key='e', parent='root', index=1, attrs={'id': 'e'})
+    Move(key='d', parent='b', index=0)
+    Move(key='a', parent='d', index=0)
+    Update(key='a', attrs={'size': 2}, deleted=())
+
+    The edit script transforms the original tree:
+
+    >>> ops = diff(old, new, key=lambda node: node.id)
+    >>> apply_patch(old, ops, key=lambda node: node.id)
+    >>> print(RenderTree(old))
+    AnyNode(id='root')
+    ├── AnyNode(id='b')
+    │   ├── AnyNode(id='d')
+    │   │   └── AnyNode(id='a', size=2)
+    │   └── AnyNode(id='c')
+    └── AnyNode(id='e')
+    """
+    oldnodes = _keymap(old, key)
+    oldkey = _key(old, key, None)
+    newkey = _key(new, key, None)
+    if oldkey != newkey:
+        raise ValueError("Root nodes differ: %r != %r." % (oldkey, newkey))
+    ops = []
+    update = _update(oldkey, old, new)
+    if update:
+        ops.append(update)
+    matched = set([id(old)])
+    skipped = set()
+    newkeys = set([newkey])
+    hashes = {}
+    if old._subtree_hash(hashes) == new._subtree_hash(hashes):
+        skipped.add(id(old))
+        stack = []
+    else:
+        stack = [(new, newkey)]
+    while stack:
+        parent, parentkey = stack.pop()
+        children = parent.children
+        keys = [_key(child, key, parentkey) for child in children]
+        origs = [oldnodes.get(childkey) for childkey in keys]
+        stationary = _stationary(oldnodes.get(parentkey), origs)
+        pending = []
+        for index, (child, childkey, orig) in enumerate(zip(children, keys, origs)):
+            if childkey in newkeys:
+                raise ValueError("Duplicate key %r." % (childkey,))
+            newkeys.add(childkey)
+            if orig is None:
+                ops.append(Insert(childkey, parentkey, index, _attrs(child)))
+            else:
+                matched.add(id(orig))
+                if id(orig) not in stationary:
+                    ops.append(Move(childkey, parentkey, index))
+                if orig._subtree_hash(hashes) == child._subtree_hash(hashes):
+                    skipped.add(id(orig))
+                    continue
+                update = _update(childkey, orig, child)
+                if update:
+                    ops.append(update)
+            pending.append((child, childkey))
+        stack.extend(reversed(pending))
+    # removed nodes with remaining parent, the removed nodes below may contain moved nodes
+    stack = [] if id(old) in skipped else [(old, oldkey)]
+    while stack:
+        node, nodekey = stack.pop()
+        for child in reversed(node.children):
+            childkey = _key(child, key, nodekey)
+            if id(child) not in matched:
+                if id(node) in matched:
+                    ops.append(Delete(childkey))
+                stack.append((child, childkey))
+            elif id(child) not in skipped:
+                stack.append((child, childkey))
+    return ops
+
+
+def apply_patch(root, ops, key=None, factory=None):
+    """
+    Apply the edit script `ops` created by :any:`diff` to the tree `root`.
+
+    Keyword Args:
+        key: function returning the unique key of a node, see :any:`diff`.
+        factory: function creating inserted nodes from their attributes. Default is the class of `root`.
+
+    Just the inserted, moved and deleted nodes are detached and attached.
+    """
+    nodes = _keymap(root, key)
+    factory = factory or root.__class__
+    # per modified parent: list of (index, node)
+    placed = {}
+    order = []
+    deleted = []
+    for op in ops:
+        if isinstance(op, Insert):
+            nodes[op.key] = node = factory(**op.attrs)
+        elif isinstance(op, Move):
+            node = nodes[op.key]
+        elif isinstance(op, Update):
+            node = nodes[op.key]
+            for attr, value in op.attrs.items():
+                setattr(node, attr, value)
+            for attr in op.deleted:
+                delattr(node, attr)
+            continue
+        elif isinstance(op, Delete):
+            deleted.append(nodes[op.key])
+            continue
+        else:
+            raise ValueError("Unknown operation %r." % (op,))
+        if op.parent not in placed:
+            placed[op.parent] = []
+            order.append(op.parent)
+        placed[op.parent].append((op.index, node))
+    # moved and deleted nodes leave their parents
+    removed = set([id(node) for items in placed.values() for _, node in items] + [id(node) for node in deleted])
+    # parents in pre-order of the resulting tree: the ancestors are final already
+    for parentkey in order:
+        parent = nodes[parentkey]
+        # moved and deleted children leave first, the remaining children are in their final order then
+        for child in [child for child in parent.children if id(child) in removed]:
+            child.parent = None
+        # each placed node goes to its final position, as all its predecessors are in place already
+        for index, node in sorted(placed[parentkey], key=lambda item: item[0]):
+            node._set_parent(parent, index)
+    for node in deleted:
+        node.parent = None
+
+
+def _keymap(root, key):
+    nodes = {}
+    stack = [(root, _key(root, key, None))]
+    while stack:
+        node, nodekey = stack.pop()
+        if nodekey in nodes:
+            raise ValueError("Duplicate key %r." % (nodekey,))
+        nodes[nodekey] = node
+        stack.extend([(child, _key(child, key, nodekey)) for child in reversed(node.children)])
+    return nodes
+
+
+def _key(node, key, parentkey):
+    # `parentkey` is `None` for the root node
+    if key is not None:
+        return key(node)
+    elif parentkey is None:
+        return ()
+    return parentkey + (getattr(node, "name", None),)
+
+
+def _attrs(node):
+    try:
+        items = node.__dict__.items()
+    except AttributeError:
+        items = ()
+    return dict([(attr, value) for attr, value in items if not attr.startswith("_")])
+
+
+def _update(nodekey, old, new):
+    oldattrs = _attrs(old)
+    newattrs = _attrs(new)
+    attrs = dict([(attr, value) for attr, value in newattrs.items()
+                  if attr not in oldattrs or oldattrs[attr] != value])
+    deleted = tuple(sorted([attr for attr in oldattrs if attr not in newattrs]))
+    if attrs or deleted:
+        return Update(nodekey, attrs, deleted)
+    return None
+
+
+def _stationary(parent, origs):
+    """Return ids of the longest sequence of children of `parent` within `origs` keeping their order."""
+    if parent is None:
+        return set()
+    positions = dict([(id(child), idx) for idx, child in enumerate(parent.children)])
+    items = [(positions[id(orig)], orig) for orig in origs if orig is not None and id(orig) in positions]
+    # longest increasing subsequence of the old positions
+    tails = []
+    prev = []
+    for idx, (position, _) in enumerate(items):
+        lo, hi = 0, len(tails)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if items[tails[mid]][0] < position:
+                lo = mid + 1
+            else:
+                hi = mid
+        prev.append(tails[lo - 1] if lo else None)
+        if lo == len(tails):
+            tails.append(idx)
+        else:
+            tails[lo] = idx
+    result = set()
+    idx = tails[-1] if tails else None
+    while idx is not None:
+        result.add(id(items[idx][1]))
+        idx = prev[idx]
+    return result
@@ -1,7 +1,13 @@
 
+try:
+    from collections.abc import Mapping
+except ImportError:  # pragma: no cover
+    from collections import Mapping
+
+
 class DictExporter(object):
 
-    def __init__(self, dictcls=dict, attriter=None, childiter=list):
+    def __init__(self, dictcls=dict, attriter=None, childiter=list, children=None):
         """
         Tree to dictionary exporter.
 
@@ -14,6 +20,7 @@ class DictExporter(object):
             dictcls: class used as dictionary. :any:`dict` by default.
             attriter: attribute iterator for sorting and/or filtering.
             childiter: child iterator for sorting and/or filtering.
+            children: function returning the sequence of child nodes of a node.
 
         >>> from pprint import pprint  # just for nice printing
         >>> from anytree import AnyNode
@@ -62,10 +69,33 @@ class DictExporter(object):
         {'a': 'root',
          'children': [{'a': 'sub0',
                        'children': [{'a': 'sub0A', 'b': 'foo'}, {'a': 'sub0B'}]}]}
+
+        Any other object tree can be exported by `children`:
+
+        >>> class Dir(object):
+        ...     def __init__(self, name, entries=()):
+        ...         self.name = name
+        ...         self.entries = entries
+        >>> tree = Dir("root", [Dir("sub0", [Dir("sub0A")]), Dir("sub1")])
+        >>> exporter = DictExporter(children=lambda item: item.entries,
+        ...                         attriter=lambda attrs: [(k, v) for k, v in attrs if k != "entries"])
+        >>> pprint(exporter.export(tree))
+        {'children': [{'children': [{'name': 'sub0A'}], 'name': 'sub0'},
+                      {'name': 'sub1'}],
+         'name': 'root'}
+
+        Mappings traversed by `children` are exported with their items:
+
+        >>> tree = {"name": "root", "children": [{"name": "sub0", "children": [{"name": "sub0A"}]}]}
+        >>> exporter = DictExporter(children=lambda item: item.get("children", ()))
+        >>> pprint(exporter.export(tree))
+        {'children': [{'children': [{'name': 'sub0A'}], 'name': 'sub0'}],
+         'name': 'root'}
         """
         self.dictcls = dictcls
         self.attriter = attriter
         self.childiter = childiter
+        self.children = children
 
     def export(self, node):
         """Export tree starting at `node`."""
@@ -76,18 +106,21 @@ class DictExporter(object):
         attr_values = attriter(self._iter_attr_values(node))
         attr_values = DictExporter.__filter_node_internals(attr_values)
         data = dictcls(attr_values)
+        nodechildren = node.children if self.children is None else self.children(node)
         children = [self.__export(child, dictcls, attriter, childiter)
-                    for child in childiter(node.children)]
+                    for child in childiter(nodechildren)]
         if children:
             data['children'] = children
         return data
 
     def _iter_attr_values(self, node):
-        return node.__dict__.items()
+        if self.children is not None and isinstance(node, Mapping):
+            return node.items()
+        return getattr(node, "__dict__", {}).items()
 
     @staticmethod
     def __filter_node_internals(attr_values):
         for attr, value in attr_values:
-            if attr in ("_NodeMixin__parent", "_NodeMixin__children"):
+            if attr in ("_NodeMixin__parent", "_NodeMixin__children", "children"):
                 continue
             yield attr, value
@@ -0,0 +1,22 @@
+# -*- coding: utf-8 -*-
+"""
+Tree Indexes.
+
+* :any:`TreeIndex`: hash index from attribute value to nodes
+* :any:`PrefixIndex`: sorted index for prefix and substring searches on string attributes
+* :any:`RangeIndex`: sorted index for range searches on orderable attributes
+* :any:`BloomIndex`: bloom filter summaries of large subtrees, skipped by searches if not containing a value
+
+Indexes are updated on every attach and detach within the subtree of their root.
+Attribute changes are just tracked for nodes derived from :any:`AttrNotifyMixin`.
+
+The search functions, like :any:`find_by_attr`, :any:`findall_by_attr` and :any:`findall_by_range`,
+use an index automatically, if the searched node is covered by it.
+:any:`Q` queries pick the index with the fewest candidates.
+"""
+
+from .abstractindex import AbstractIndex  # noqa
+from .bloomindex import BloomIndex  # noqa
+from .prefixindex import PrefixIndex  # noqa
+from .rangeindex import RangeIndex  # noqa
+from .treeindex import TreeIndex  # noqa
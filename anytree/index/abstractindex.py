@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+
+from anytree.iterators import PreOrderIter
+
+_MISSING = object()
+
+
+class AbstractIndex(object):
+
+    def __init__(self, root, attr="name"):
+        """
+        Base class for all indexes on the attribute `attr` of all nodes within the subtree of `root`.
+
+        The index registers itself as observer at `root` and follows all tree modifications
+        until :any:`close` is called.
+
+        Args:
+            root: top node of the indexed subtree.
+
+        Keyword Args:
+            attr (str): indexed attribute name.
+        """
+        self.root = root
+        self.attr = attr
+        values = self.__values = {}
+        items = []
+        for node in PreOrderIter(root):
+            value = getattr(node, attr, _MISSING)
+            if value is not _MISSING:
+                values[id(node)] = value
+                items.append((node, value))
+        self._build(items)
+        root._add_observer(self)
+        self.__closed = False
+
+    def close(self):
+        """Stop following tree modifications and release all nodes. Further calls do nothing."""
+        if self.__closed:
+            return
+        self.__closed = True
+        self.root._remove_observer(self)
+        self.__values.clear()
+        self._clear()
+
+    @classmethod
+    def lookup(cls, node, attr):
+        """Return index of this type on `attr` covering `node`, or `None` if there is none."""
+        try:
+            observers = node._iter_observers()
+        except AttributeError:
+            return None
+        for observer in observers:
+            if isinstance(observer, cls) and observer.attr == attr:
+                return observer
+        return None
+
+    def _value(self, node, default=None):
+        """Return the indexed value of `node` or `default` if `node` is not indexed."""
+        return self.__values.get(id(node), default)
+
+    def _lookup(self, lookup, value):
+        """
+        Return list of all nodes matching the :any:`Q` `lookup` with `value`.
+
+        Return `None` if the `lookup` is not supported by the index.
+        """
+        return None
+
+    def _estimate(self, lookup, value):
+        """
+        Return the estimated number of nodes returned by :any:`_lookup`.
+
+        Return `None` if the `lookup` is not supported by the index.
+        """
+        candidates = self._lookup(lookup, value)
+        return None if candidates is None else len(candidates)
+
+    def _build(self, items):
+        """Add all `(node, value)` pairs of the initial tree, one by one by default."""
+        for node, value in items:
+            self._insert(node, value)
+
+    def _insert(self, node, value):
+        """Add `node` with `value`."""
+        raise NotImplementedError("Implement it")
+
+    def _remove(self, node, value):
+        """Remove `node` with `value`."""
+        raise NotImplementedError("Implement it")
+
+    def _clear(self):
+        """Remove all nodes."""
+        raise NotImplementedError("Implement it")
+
+    def _observe_attach(self, node):
+        for item in PreOrderIter(node):
+            self.__add(item)
+
+    def _observe_detach(self, node, parent, index):
+        for item in PreOrderIter(node):
+            self.__discard(item)
+
+    def _observe_attr(self, node, name):
+        if name == self.attr:
+            self.__discard(node)
+            self.__add(node)
+
+    def __add(self, node):
+        value = getattr(node, self.attr, _MISSING)
+        if value is not _MISSING:
+            self.__values[id(node)] = value
+            self._insert(node, value)
+
+    def __discard(self, node):
+        # the value stored on insertion is used, as the attribute might have changed unnoticed
+        value = self.__values.pop(id(node), _MISSING)
+        if value is not _MISSING:
+            self._remove(node, value)
+
+    def _select(self, nodes, node=None, maxlevel=None, ordered=True):
+        """
+        Return tuple of `nodes` within the subtree of `node` and above `maxlevel`, in pre-order if `ordered`.
+
+        Unordered results of the whole index are returned as they are.
+        """
+        if not ordered and maxlevel is None and (node is None or node is self.root):
+            return tuple(nodes)
+        return self._preorder(nodes, node or self.root, maxlevel=maxlevel, ordered=ordered)
+
+    @staticmethod
+    def _preorder(nodes, node, maxlevel=None, shallowest=False, ordered=True):
+        """
+        Return tuple of `nodes` within the subtree of `node` and above `maxlevel` in pre-order.
+
+        With `shallowest`, return the first node in level-order only.
+        Without `ordered`, keep the order of `nodes`.
+        """
+        selected = []
+        for item in nodes:
+            path = AbstractIndex.__path(item, node, maxlevel)
+            if path is not None:
+                selected.append((item, path))
+        if len(selected) > 1 and (ordered or shallowest):
+            def key(selection):
+                path = selection[1]
+                positions = tuple([child.parent._child_positions()[id(child)] for child in path])
+                return (len(path), positions) if shallowest else positions
+            selected.sort(key=key)
+        if shallowest:
+            selected = selected[:1]
+        return tuple([item for item, _ in selected])
+
+    @staticmethod
+    def __path(item, top, maxlevel):
+        # nodes from `top` (exclusive) to `item` (inclusive) or `None` if outside
+        path = []
+        while item is not top:
+            if item is None:
+                return None
+            path.append(item)
+            item = item.parent
+        if maxlevel is not None and len(path) >= maxlevel:
+            return None
+        return path[::-1]
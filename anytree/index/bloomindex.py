@@ -0,0 +1,266 @@
+# -*- coding: utf-8 -*-
+
+import math
+
+from anytree.iterators import PostOrderIter
+from anytree.iterators import PreOrderIter
+from anytree.node.attrnotifymixin import AttrNotifyMixin
+
+from .abstractindex import AbstractIndex
+
+_MISSING = object()
+
+
+class BloomIndex(AbstractIndex):
+
+    """
+    Bloom filter summaries of the values of attribute `attr` within large subtrees.
+
+    A summary tells if a value cannot occur within the subtree of a node.
+    Searches skip these subtrees, if all nodes within the index are derived from :any:`AttrNotifyMixin`.
+    Otherwise, an unnoticed attribute change could hide a matching node.
+
+    Keyword Args:
+        fpr (float): false positive rate of every summary.
+        minsize (int): minimal number of nodes within a subtree to be summarized.
+        maxbytes (int): memory budget of all summaries. Unlimited by default.
+                        Every counter takes one byte. Large subtrees are summarized first.
+
+    Summaries are created on indexing and on attaching a subtree.
+    Summaries are counting bloom filters and follow all later modifications,
+    but their size is not adapted to added nodes.
+
+    >>> from anytree import AttrNotifyMixin, Node, RenderTree, AsciiStyle, BloomIndex
+    >>> class MyNode(AttrNotifyMixin, Node):
+    ...     pass
+    >>> root = MyNode("root", kind="dir")
+    >>> a = MyNode("a", parent=root, kind="dir")
+    >>> MyNode("a0", parent=a, kind="file")
+    MyNode('/root/a/a0', kind='file')
+    >>> MyNode("a1", parent=a, kind="file")
+    MyNode('/root/a/a1', kind='file')
+    >>> b = MyNode("b", parent=root, kind="dir")
+    >>> MyNode("b0", parent=b, kind="link")
+    MyNode('/root/b/b0', kind='link')
+    >>> MyNode("b1", parent=b, kind="dir")
+    MyNode('/root/b/b1', kind='dir')
+    >>> print(RenderTree(root, style=AsciiStyle()).by_attr())
+    root
+    |-- a
+    |   |-- a0
+    |   +-- a1
+    +-- b
+        |-- b0
+        +-- b1
+
+    >>> index = BloomIndex(root, "kind", minsize=3)
+    >>> index.might_contain("link", node=a)
+    False
+    >>> index.might_contain("link", node=b)
+    True
+
+    :any:`findall_by_attr`, :any:`find_by_attr` and :any:`Q` queries skip summarized subtrees:
+
+    >>> from anytree import findall_by_attr, Q
+    >>> findall_by_attr(root, "link", name="kind")
+    (MyNode('/root/b/b0', kind='link'),)
+    >>> print(Q(kind="link").explain(root))
+    plan: pre-order scan, pruned by bloom filter on kind
+    maxlevel: None
+    filter: Q(kind='link')
+    visits: at most 7
+    """
+
+    def __init__(self, root, attr="name", fpr=0.01, minsize=64, maxbytes=None):
+        self.fpr = fpr
+        self.minsize = minsize
+        self.maxbytes = maxbytes
+        self.__filters = {}
+        self.__bulk = False
+        # number of nodes not notifying attribute changes
+        self.__unnotified = BloomIndex.__count_unnotified(root)
+        super(BloomIndex, self).__init__(root, attr=attr)
+        self.__summarize(root)
+
+    @property
+    def nbytes(self):
+        """Memory consumption of all summaries in bytes."""
+        return sum([len(counters) for counters in self.__filters.values()])
+
+    def might_contain(self, value, node=None):
+        """
+        Return `False` if no node within the subtree of `node` has `attr` equal to `value`.
+
+        Nodes without summary always might contain `value`.
+        """
+        prune = self._prune(value)
+        return prune is None or not prune(node or self.root)
+
+    def _autoprune(self, value):
+        """Return :any:`_prune` function for searches or `None` if the summaries might miss changes."""
+        if self.__unnotified:
+            return None
+        return self._prune(value)
+
+    def _prune(self, value):
+        """Return function returning `True` for all nodes, which cannot contain `value`."""
+        try:
+            hashes = BloomIndex.__hash(value)
+        except TypeError:
+            return None
+        filters = self.__filters
+
+        def prune(node):
+            counters = filters.get(id(node), None)
+            if counters is None:
+                return False
+            for position in BloomIndex.__positions(hashes, len(counters), counters.hashes):
+                if not counters[position]:
+                    return True
+            return False
+        return prune
+
+    def _insert(self, node, value):
+        if not self.__bulk:
+            self.__update(self.__chain(node), (value,), 1)
+
+    def _remove(self, node, value):
+        if not self.__bulk:
+            self.__update(self.__chain(node), (value,), -1)
+
+    def _clear(self):
+        self.__filters.clear()
+        self.__unnotified = 0
+
+    def _observe_attach(self, node):
+        self.__bulk = True
+        try:
+            super(BloomIndex, self)._observe_attach(node)
+        finally:
+            self.__bulk = False
+        self.__update(self.__chain(node.parent), self.__subtree_values(node), 1)
+        self.__summarize(node)
+        self.__unnotified += BloomIndex.__count_unnotified(node)
+
+    def _observe_detach(self, node, parent, index):
+        # summaries within the detached subtree are dropped
+        values = self.__subtree_values(node)
+        for item in PreOrderIter(node):
+            self.__filters.pop(id(item), None)
+        self.__bulk = True
+        try:
+            super(BloomIndex, self)._observe_detach(node, parent, index)
+        finally:
+            self.__bulk = False
+        self.__update(self.__chain(parent), values, -1)
+        self.__unnotified -= BloomIndex.__count_unnotified(node)
+
+    def __chain(self, node):
+        # summaries of `node` and all its ancestors within the index
+        filters = self.__filters
+        chain = []
+        while node is not None:
+            counters = filters.get(id(node), None)
+            if counters is not None:
+                chain.append(counters)
+            if node is self.root:
+                break
+            node = node.parent
+        return chain
+
+    @staticmethod
+    def __count_unnotified(node):
+        return sum([1 for item in PreOrderIter(node) if not isinstance(item, AttrNotifyMixin)])
+
+    def __subtree_values(self, node):
+        values = []
+        for item in PreOrderIter(node):
+            value = self._value(item, _MISSING)
+            if value is not _MISSING:
+                values.append(value)
+        return values
+
+    @staticmethod
+    def __update(chain, values, delta):
+        hashes = []
+        for value in values:
+            try:
+                hashes.append(BloomIndex.__hash(value))
+            except TypeError:
+                pass
+        for counters in chain:
+            BloomIndex.__count(counters, hashes, delta)
+
+    @staticmethod
+    def __count(counters, hashes, delta):
+        size = len(counters)
+        indices = range(counters.hashes)
+        for first, second in hashes:
+            position = first % size
+            step = second % size
+            for _ in indices:
+                count = counters[position]
+                # saturated counters are never decremented
+                if count < 255:
+                    if delta > 0:
+                        counters[position] = count + 1
+                    elif count:
+                        counters[position] = count - 1
+                position = (position + step) % size
+
+    def __summarize(self, node):
+        # determine subtree sizes and summarize the largest subtrees within the budget
+        sizes = {}
+        hashes = {}
+        candidates = []
+        for item in PostOrderIter(node):
+            size = 1 + sum([sizes.pop(id(child)) for child in item.children])
+            sizes[id(item)] = size
+            if size >= self.minsize:
+                candidates.append((size, item))
+            value = self._value(item, _MISSING)
+            if value is not _MISSING:
+                try:
+                    hashes[id(item)] = BloomIndex.__hash(value)
+                except TypeError:
+                    pass
+        candidates.sort(key=lambda candidate: -candidate[0])
+        budget = None if self.maxbytes is None else self.maxbytes - self.nbytes
+        for size, item in candidates:
+            length, count = self.__dimension(size)
+            # one byte per counter
+            if budget is not None:
+                if length > budget:
+                    continue
+                budget -= length
+            counters = _Counters(length)
+            counters.hashes = count
+            self.__filters[id(item)] = counters
+            subtree = [hashes[id(sub)] for sub in PreOrderIter(item) if id(sub) in hashes]
+            BloomIndex.__count(counters, subtree, 1)
+
+    def __dimension(self, size):
+        """Return number of counters and number of hash functions of a summary for `size` values."""
+        length = int(math.ceil(-size * math.log(self.fpr) / (math.log(2) ** 2)))
+        hashes = max(1, int(round(float(length) / size * math.log(2))))
+        return max(length, 8), hashes
+
+    @staticmethod
+    def __hash(value):
+        return hash(value), hash((value, "bloom")) | 1
+
+    @staticmethod
+    def __positions(hashes, size, count):
+        first, second = hashes
+        position = first % size
+        step = second % size
+        positions = []
+        for _ in range(count):
+            positions.append(position)
+            position = (position + step) % size
+        return positions
+
+
+class _Counters(bytearray):
+
+    """Saturating counters of a counting bloom filter."""
@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+
+import bisect
+import numbers
+import sys
+
+import six
+
+from .abstractindex import AbstractIndex
+
+# largest character, sorted behind all strings with the same prefix
+_MAXCHAR = six.unichr(sys.maxunicode)
+
+
+def _is_searchable(value):
+    # values, which might match `startswith` or `contains` lookups without being strings
+    return not (value is None or isinstance(value, (six.string_types, numbers.Number)))
+
+
+class PrefixIndex(AbstractIndex):
+
+    """
+    Sorted index on the string attribute `attr` for prefix and substring searches.
+
+    Keyword Args:
+        ngram (int): length of the n-grams indexed for substring searches. Disabled by default.
+
+    >>> from anytree import Node, RenderTree, AsciiStyle, PrefixIndex
+    >>> root = Node("root")
+    >>> docs = Node("docs", parent=root)
+    >>> Node("document.txt", parent=docs)
+    Node('/root/docs/document.txt')
+    >>> Node("dot.png", parent=docs)
+    Node('/root/docs/dot.png')
+    >>> src = Node("src", parent=root)
+    >>> Node("doc.py", parent=src)
+    Node('/root/src/doc.py')
+    >>> print(RenderTree(root, style=AsciiStyle()).by_attr())
+    root
+    |-- docs
+    |   |-- document.txt
+    |   +-- dot.png
+    +-- src
+        +-- doc.py
+
+    >>> index = PrefixIndex(root, ngram=3)
+    >>> index.complete("do")
+    ('doc.py', 'docs', 'document.txt', 'dot.png')
+    >>> index.complete("do", limit=2)
+    ('doc.py', 'docs')
+    >>> index.startswith("doc")
+    (Node('/root/docs'), Node('/root/docs/document.txt'), Node('/root/src/doc.py'))
+    >>> index.startswith("doc", node=src)
+    (Node('/root/src/doc.py'),)
+    >>> index.contains("cum")
+    (Node('/root/docs/document.txt'),)
+
+    :any:`Q` queries use the index for `startswith` and `contains` lookups:
+
+    >>> from anytree import findall, Q
+    >>> findall(root, filter_=Q(name__startswith="doc", depth=2))
+    (Node('/root/docs/document.txt'), Node('/root/src/doc.py'))
+
+    Nodes with non-string values are not indexed.
+    Queries are not answered by the index, while nodes with other searchable values,
+    like lists, exist.
+    Substrings shorter than `ngram` are searched among all distinct values.
+    The index is built by sorting all distinct values once.
+    A prefix search costs a binary search plus the matching nodes.
+    Sorting the matching nodes in pre-order comes on top, unless `ordered` is disabled.
+    """
+
+    def __init__(self, root, attr="name", ngram=None):
+        self.ngram = ngram
+        self.__buckets = {}
+        self.__values = []
+        self.__grams = {}
+        # number of indexed nodes
+        self.__count = 0
+        # number of unindexed nodes, which might match lookups: non-string values except `None` and numbers
+        self.__unindexed = 0
+        super(PrefixIndex, self).__init__(root, attr=attr)
+
+    def complete(self, prefix, limit=None):
+        """Return sorted tuple of the distinct values starting with `prefix`, at maximum `limit`."""
+        values = []
+        for value in self.__iter_prefix(prefix):
+            if limit is not None and len(values) >= limit:
+                break
+            values.append(value)
+        return tuple(values)
+
+    def startswith(self, prefix, node=None, maxlevel=None, ordered=True):
+        """
+        Return tuple of nodes with `attr` starting with `prefix` in pre-order.
+
+        Keyword Args:
+            node: top node, restrict result to the subtree of `node`. Default is `root`.
+            maxlevel (int): maximum decending in the node hierarchy, relative to `node`.
+            ordered (bool): sort the nodes in pre-order. Otherwise the nodes are returned
+                            ordered by value, which saves sorting the result.
+        """
+        return self._select(self._lookup("startswith", prefix), node, maxlevel=maxlevel, ordered=ordered)
+
+    def contains(self, substring, node=None, maxlevel=None, ordered=True):
+        """
+        Return tuple of nodes with `attr` containing `substring` in pre-order.
+
+        Keyword Args:
+            node: top node, restrict result to the subtree of `node`. Default is `root`.
+            maxlevel (int): maximum decending in the node hierarchy, relative to `node`.
+            ordered (bool): sort the nodes in pre-order. Otherwise the nodes are returned
+                            ordered by value, which saves sorting the result.
+        """
+        return self._select(self._lookup("contains", substring), node, maxlevel=maxlevel, ordered=ordered)
+
+    def _lookup(self, lookup, value):
+        if not isinstance(value, six.string_types):
+            return None
+        if lookup == "startswith":
+            values = self.__iter_prefix(value)
+        elif lookup == "contains":
+            values = self.__iter_substring(value)
+        else:
+            return None
+        buckets = self.__buckets
+        return [node for item in values for node in buckets[item].values()]
+
+    def _estimate(self, lookup, value):
+        if self.__unindexed or not isinstance(value, six.string_types):
+            # unindexed nodes might match
+            return None
+        values = self.__values
+        if lookup == "startswith":
+            distinct = bisect.bisect_left(values, value + _MAXCHAR) - bisect.bisect_left(values, value)
+        elif lookup == "contains":
+            distinct = len(values)
+            if self.ngram and len(value) >= self.ngram:
+                distinct = min([len(self.__grams.get(gram, ())) for gram in self.__split(value)])
+        else:
+            return None
+        # distinct values times the average number of nodes per value
+        return distinct * self.__count // len(values) if values else 0
+
+    def __iter_prefix(self, prefix):
+        values = self.__values
+        idx = bisect.bisect_left(values, prefix)
+        while idx < len(values) and values[idx].startswith(prefix):
+            yield values[idx]
+            idx += 1
+
+    def __iter_substring(self, substring):
+        ngram = self.ngram
+        if ngram and len(substring) >= ngram:
+            postings = []
+            for gram in set(self.__split(substring)):
+                posting = self.__grams.get(gram)
+                if not posting:
+                    return []
+                postings.append(posting)
+            postings.sort(key=len)
+            candidates = postings[0].intersection(*postings[1:])
+        else:
+            candidates = self.__values
+        return sorted([value for value in candidates if substring in value])
+
+    def __split(self, value):
+        ngram = self.ngram
+        return [value[idx:idx + ngram] for idx in range(len(value) - ngram + 1)]
+
+    def _build(self, items):
+        # distinct values are sorted at once instead of one insertion each
+        buckets = self.__buckets
+        added = []
+        for node, value in items:
+            if isinstance(value, six.string_types):
+                bucket = buckets.get(value)
+                if bucket is None:
+                    bucket = buckets[value] = {}
+                    added.append(value)
+                if id(node) not in bucket:
+                    bucket[id(node)] = node
+                    self.__count += 1
+            elif _is_searchable(value):
+                self.__unindexed += 1
+        self.__values.extend(added)
+        self.__values.sort()
+        if self.ngram:
+            for value in added:
+                for gram in self.__split(value):
+                    self.__grams.setdefault(gram, set()).add(value)
+
+    def _insert(self, node, value):
+        if not isinstance(value, six.string_types):
+            self.__unindexed += _is_searchable(value)
+            return
+        try:
+            bucket = self.__buckets[value]
+        except KeyError:
+            bucket = self.__buckets[value] = {}
+            bisect.insort(self.__values, value)
+            if self.ngram:
+                for gram in self.__split(value):
+                    self.__grams.setdefault(gram, set()).add(value)
+        if id(node) not in bucket:
+            bucket[id(node)] = node
+            self.__count += 1
+
+    def _remove(self, node, value):
+        if not isinstance(value, six.string_types):
+            self.__unindexed -= _is_searchable(value)
+            return
+        try:
+            bucket = self.__buckets[value]
+        except KeyError:
+            return
+        if bucket.pop(id(node), None) is not None:
+            self.__count -= 1
+        if not bucket:
+            del self.__buckets[value]
+            values = self.__values
+            del values[bisect.bisect_left(values, value)]
+            if self.ngram:
+                for gram in set(self.__split(value)):
+                    posting = self.__grams[gram]
+                    posting.discard(value)
+                    if not posting:
+                        del self.__grams[gram]
+
+    def _clear(self):
+        self.__count = 0
+        self.__unindexed = 0
+        self.__buckets.clear()
+        del self.__values[:]
+        self.__grams.clear()
@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+
+import bisect
+
+import six
+
+from .abstractindex import AbstractIndex
+
+
+class RangeIndex(AbstractIndex):
+
+    """
+    Sorted index on the orderable attribute `attr` for range searches.
+
+    >>> from anytree import Node, RenderTree, AsciiStyle, RangeIndex
+    >>> root = Node("root", timestamp=10)
+    >>> a = Node("a", parent=root, timestamp=25)
+    >>> b = Node("b", parent=a, timestamp=20)
+    >>> c = Node("c", parent=root, timestamp=40)
+    >>> d = Node("d", parent=c, timestamp=30)
+    >>> print(RenderTree(root, style=AsciiStyle()).by_attr())
+    root
+    |-- a
+    |   +-- b
+    +-- c
+        +-- d
+
+    >>> index = RangeIndex(root, "timestamp")
+    >>> index.range(20, 30)
+    (Node('/root/a', timestamp=25), Node('/root/a/b', timestamp=20), Node('/root/c/d', timestamp=30))
+    >>> index.range(20, 30, node=c)
+    (Node('/root/c/d', timestamp=30),)
+    >>> index.range(lo=30)
+    (Node('/root/c', timestamp=40), Node('/root/c/d', timestamp=30))
+
+    :any:`findall_by_range` and :any:`Q` queries use the index automatically:
+
+    >>> from anytree import findall_by_range
+    >>> findall_by_range(root, "timestamp", 0, 20)
+    (Node('/root', timestamp=10), Node('/root/a/b', timestamp=20))
+
+    Nodes with values not comparable to the other values, like `None`, are not indexed.
+    :any:`Q` queries just use the index for comparable values and as long as no node has an unhashable value,
+    or `None` on Python 2, which orders `None` before all other values.
+    The index is built by sorting all distinct values once.
+    A range search costs a binary search plus the matching nodes.
+    Sorting the matching nodes in pre-order comes on top, unless `ordered` is disabled.
+    """
+
+    def __init__(self, root, attr="name"):
+        self.__buckets = {}
+        self.__values = []
+        # number of indexed nodes
+        self.__count = 0
+        # number of unindexed nodes, which might match comparisons: unhashable values and `None` on py2
+        self.__unindexed = 0
+        super(RangeIndex, self).__init__(root, attr=attr)
+
+    def range(self, lo=None, hi=None, node=None, maxlevel=None, ordered=True):
+        """
+        Return tuple of nodes with `lo <= attr <= hi` in pre-order.
+
+        Keyword Args:
+            lo: lower limit, unlimited if `None`.
+            hi: upper limit, unlimited if `None`.
+            node: top node, restrict result to the subtree of `node`. Default is `root`.
+            maxlevel (int): maximum decending in the node hierarchy, relative to `node`.
+            ordered (bool): sort the nodes in pre-order. Otherwise the nodes are returned
+                            ordered by value, which saves sorting the result.
+        """
+        return self._select(self.__range(lo, hi), node, maxlevel=maxlevel, ordered=ordered)
+
+    def _lookup(self, lookup, value):
+        bounds = self.__bounds(lookup, value)
+        if bounds is None:
+            return None
+        buckets = self.__buckets
+        return [node for item in self.__values[bounds[0]:bounds[1]] for node in buckets[item].values()]
+
+    def _estimate(self, lookup, value):
+        bounds = self.__bounds(lookup, value)
+        if bounds is None:
+            return None
+        # distinct values within the range times the average number of nodes per value
+        distinct = len(self.__values)
+        return (bounds[1] - bounds[0]) * self.__count // distinct if distinct else 0
+
+    def __bounds(self, lookup, value):
+        """Return slice `(start, stop)` of the sorted values matching `lookup` or `None` if not supported."""
+        try:
+            if self.__unindexed or value is None or not value == value:
+                # unindexed nodes might match, `None` would be an unlimited bound
+                return None
+            if lookup == "eq":
+                return self.__slice(value, value)
+            elif lookup == "lt":
+                return self.__slice(None, value, hiincl=False)
+            elif lookup == "le":
+                return self.__slice(None, value)
+            elif lookup == "gt":
+                return self.__slice(value, None, loincl=False)
+            elif lookup == "ge":
+                return self.__slice(value, None)
+        except (TypeError, ValueError):
+            pass
+        return None
+
+    def __range(self, lo, hi):
+        start, stop = self.__slice(lo, hi)
+        buckets = self.__buckets
+        return [node for value in self.__values[start:stop] for node in buckets[value].values()]
+
+    def __slice(self, lo, hi, loincl=True, hiincl=True):
+        values = self.__values
+        if lo is None:
+            start = 0
+        else:
+            start = (bisect.bisect_left if loincl else bisect.bisect_right)(values, lo)
+        if hi is None:
+            stop = len(values)
+        else:
+            stop = (bisect.bisect_right if hiincl else bisect.bisect_left)(values, hi)
+        return start, stop
+
+    def _build(self, items):
+        # distinct values are sorted at once instead of one insertion each
+        buckets = {}
+        for node, value in items:
+            try:
+                buckets.setdefault(value, {})[id(node)] = node
+            except TypeError:
+                self.__unindexed += 1
+        if six.PY2 and None in buckets:
+            self.__unindexed += len(buckets[None])
+        # values not equal to themselves, like NaN, are not orderable
+        distinct = [value for value in buckets if value is not None and value == value]
+        try:
+            distinct.sort()
+        except TypeError:
+            # mixed types, the first inserted values decide
+            self.__unindexed = 0
+            super(RangeIndex, self)._build(items)
+            return
+        self.__values.extend(distinct)
+        self.__values.sort()
+        for value in distinct:
+            self.__buckets[value] = bucket = buckets[value]
+            self.__count += len(bucket)
+
+    def _insert(self, node, value):
+        buckets = self.__buckets
+        try:
+            hash(value)
+        except TypeError:
+            self.__unindexed += 1
+            return
+        if value is None:
+            self.__unindexed += six.PY2
+            return
+        try:
+            bucket = buckets.get(value)
+            if bucket is None:
+                values = self.__values
+                idx = bisect.bisect_left(values, value)
+                if idx < len(values) and not value < values[idx]:
+                    # not orderable
+                    return
+                bucket = buckets[value] = {}
+                values.insert(idx, value)
+        except TypeError:
+            return
+        if id(node) not in bucket:
+            bucket[id(node)] = node
+            self.__count += 1
+
+    def _remove(self, node, value):
+        if value is None:
+            self.__unindexed -= six.PY2
+            return
+        try:
+            bucket = self.__buckets[value]
+        except KeyError:
+            return
+        except TypeError:
+            self.__unindexed -= 1
+            return
+        if bucket.pop(id(node), None) is not None:
+            self.__count -= 1
+        if not bucket:
+            del self.__buckets[value]
+            values = self.__values
+            del values[bisect.bisect_left(values, value)]
+
+    def _clear(self):
+        self.__count = 0
+        self.__unindexed = 0
+        self.__buckets.clear()
+        del self.__values[:]
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+
+from .abstractindex import AbstractIndex
+
+
+class TreeIndex(AbstractIndex):
+
+    """
+    Hash index from the value of attribute `attr` to the nodes within the subtree of `root`.
+
+    >>> from anytree import Node, RenderTree, AsciiStyle, TreeIndex
+    >>> f = Node("f", kind="dir")
+    >>> b = Node("b", parent=f, kind="dir")
+    >>> a = Node("a", parent=b, kind="file")
+    >>> d = Node("d", parent=b, kind="dir")
+    >>> c = Node("c", parent=d, kind="file")
+    >>> g = Node("g", parent=f, kind="file")
+    >>> print(RenderTree(f, style=AsciiStyle()).by_attr())
+    f
+    |-- b
+    |   |-- a
+    |   +-- d
+    |       +-- c
+    +-- g
+
+    >>> index = TreeIndex(f, "kind")
+    >>> index.get("file")
+    (Node('/f/b/a', kind='file'), Node('/f/b/d/c', kind='file'), Node('/f/g', kind='file'))
+    >>> index.get("file", node=b)
+    (Node('/f/b/a', kind='file'), Node('/f/b/d/c', kind='file'))
+    >>> index.get("file", maxlevel=2)
+    (Node('/f/g', kind='file'),)
+
+    The index follows all modifications of the tree structure:
+
+    >>> c.parent = f
+    >>> index.get("file", node=b)
+    (Node('/f/b/a', kind='file'),)
+
+    The search functions use the index automatically:
+
+    >>> from anytree import findall_by_attr
+    >>> findall_by_attr(f, "file", name="kind")
+    (Node('/f/b/a', kind='file'), Node('/f/g', kind='file'), Node('/f/c', kind='file'))
+
+    Attribute changes are just tracked for nodes derived from :any:`AttrNotifyMixin`.
+    Nodes with unhashable values are not indexed.
+    """
+
+    def __init__(self, root, attr="name"):
+        self.__buckets = {}
+        super(TreeIndex, self).__init__(root, attr=attr)
+
+    def get(self, value, node=None, maxlevel=None, shallowest=False):
+        """
+        Return tuple of nodes with `attr` equal to `value` in pre-order.
+
+        Keyword Args:
+            node: top node, restrict result to the subtree of `node`. Default is `root`.
+            maxlevel (int): maximum decending in the node hierarchy, relative to `node`.
+            shallowest (bool): return the first node in level-order only.
+        """
+        try:
+            bucket = self.__buckets.get(value, None)
+        except TypeError:
+            bucket = None
+        if not bucket:
+            return tuple()
+        if node is None:
+            node = self.root
+        return self._preorder(bucket.values(), node, maxlevel=maxlevel, shallowest=shallowest)
+
+    def _lookup(self, lookup, value):
+        if lookup != "eq":
+            return None
+        try:
+            return list(self.__buckets.get(value, {}).values())
+        except TypeError:
+            return None
+
+    def _estimate(self, lookup, value):
+        if lookup != "eq":
+            return None
+        try:
+            return len(self.__buckets.get(value, ()))
+        except TypeError:
+            return None
+
+    def count(self, value):
+        """Return the number of nodes with `attr` equal to `value` in the whole index."""
+        try:
+            return len(self.__buckets.get(value, ()))
+        except TypeError:
+            return 0
+
+    def __contains__(self, value):
+        try:
+            return value in self.__buckets
+        except TypeError:
+            return False
+
+    def _insert(self, node, value):
+        try:
+            self.__buckets.setdefault(value, {})[id(node)] = node
+        except TypeError:
+            pass
+
+    def _remove(self, node, value):
+        try:
+            bucket = self.__buckets[value]
+        except (KeyError, TypeError):
+            return
+        bucket.pop(id(node), None)
+        if not bucket:
+            del self.__buckets[value]
+
+    def _clear(self):
+        self.__buckets.clear()
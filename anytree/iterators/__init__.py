@@ -7,9 +7,15 @@ Tree Iteration.
 * :any:`LevelOrderIter`: iterate over tree using level-order strategy
 * :any:`LevelOrderGroupIter`: iterate over tree using level-order strategy returning group for every level
 * :any:`ZigZagGroupIter`: iterate over tree using level-order strategy returning group for every level
+* :any:`BestFirstIter`: iterate over tree using best-first strategy, nodes with highest score first
+
+:any:`PreOrderIter` and :any:`PostOrderIter` traverse the live children of the nodes.
+Any modification of these children during iteration raises a :any:`ConcurrentModificationError`.
 """
 
 from .abstractiter import AbstractIter  # noqa
+from .abstractiter import ConcurrentModificationError  # noqa
+from .bestfirstiter import BestFirstIter  # noqa
 from .levelordergroupiter import LevelOrderGroupIter  # noqa
 from .levelorderiter import LevelOrderIter  # noqa
 from .postorderiter import PostOrderIter  # noqa
@@ -1,9 +1,14 @@
+import itertools
+
 import six
 
+# node classes by whether they use the plain `children` property of `NodeMixin`
+_PLAINCHILDREN = {}
+
 
 class AbstractIter(six.Iterator):
 
-    def __init__(self, node, filter_=None, stop=None, maxlevel=None):
+    def __init__(self, node, filter_=None, stop=None, maxlevel=None, children=None):
         """
         Base class for all iterators.
 
@@ -13,17 +18,25 @@ class AbstractIter(six.Iterator):
             filter_: function called with every `node` as argument, `node` is returned if `True`.
             stop: stop iteration at `node` if `stop` function returns `True` for `node`.
             maxlevel (int): maximum decending in the node hierarchy.
+            children: function returning the sequence of child nodes of a node.
+                      Iterates over any structure, which is not built from :any:`NodeMixin`.
+
+        >>> from anytree import PreOrderIter
+        >>> tree = {"name": "f", "items": [{"name": "b", "items": [{"name": "a"}]}, {"name": "g"}]}
+        >>> [item["name"] for item in PreOrderIter(tree, children=lambda item: item.get("items", ()))]
+        ['f', 'b', 'a', 'g']
         """
         self.node = node
         self.filter_ = filter_
         self.stop = stop
         self.maxlevel = maxlevel
+        self.children = children
         self.__iter = None
 
-    def __init(self):
+    def __init(self, batchfilter=False):
         node = self.node
         maxlevel = self.maxlevel
-        filter_ = self.filter_ or AbstractIter.__default_filter
+        filter_ = (not batchfilter and self.filter_) or AbstractIter.__default_filter
         stop = self.stop or AbstractIter.__default_stop
         children = [] if AbstractIter._abort_at_level(1, maxlevel) else AbstractIter._get_children([node], stop)
         return self._iter(children, filter_, stop, maxlevel)
@@ -44,6 +57,62 @@ class AbstractIter(six.Iterator):
             self.__iter = self.__init()
         return next(self.__iter)
 
+    def chunks(self, size, batchfilter=False):
+        """
+        Iterate in chunks of `size` items.
+
+        Yield lists with `size` items each, just the last one might be shorter.
+        This amortizes the per item overhead for consumers processing items in batches anyway.
+
+        Keyword Args:
+            batchfilter (bool): `filter_` is a batch predicate. It is called with a list of nodes
+                                and returns a sequence of booleans (mask) of the same length.
+                                A mask of another length raises `ValueError`.
+
+        >>> from anytree import Node, PreOrderIter
+        >>> f = Node("f")
+        >>> b = Node("b", parent=f)
+        >>> a = Node("a", parent=b)
+        >>> d = Node("d", parent=b)
+        >>> g = Node("g", parent=f)
+        >>> [[node.name for node in chunk] for chunk in PreOrderIter(f).chunks(2)]
+        [['f', 'b'], ['a', 'd'], ['g']]
+        >>> def batch(nodes):
+        ...     return [node.name != "b" for node in nodes]
+        >>> [[node.name for node in chunk] for chunk in PreOrderIter(f, filter_=batch).chunks(2, batchfilter=True)]
+        [['f', 'a'], ['d', 'g']]
+        """
+        if size < 1:
+            raise ValueError("Chunk size must be at least 1, not %r." % (size,))
+        items = self.__init(batchfilter=batchfilter)
+        if batchfilter and self.filter_:
+            return AbstractIter.__iter_batchfiltered(items, size, self.filter_)
+        else:
+            return AbstractIter.__iter_chunks(items, size)
+
+    @staticmethod
+    def __iter_chunks(items, size):
+        while True:
+            chunk = list(itertools.islice(items, size))
+            if not chunk:
+                break
+            yield chunk
+
+    @staticmethod
+    def __iter_batchfiltered(items, size, filter_):
+        pending = []
+        for candidates in AbstractIter.__iter_chunks(items, size):
+            mask = list(filter_(candidates))
+            if len(mask) != len(candidates):
+                msg = "Batch filter returned %d values for %d nodes."
+                raise ValueError(msg % (len(mask), len(candidates)))
+            pending.extend([item for item, keep in zip(candidates, mask) if keep])
+            while len(pending) >= size:
+                yield pending[:size]
+                pending = pending[size:]
+        if pending:
+            yield pending
+
     @staticmethod
     def _iter(children, filter_, stop, maxlevel):
         raise NotImplementedError()  # pragma: no cover
@@ -55,3 +124,88 @@ class AbstractIter(six.Iterator):
     @staticmethod
     def _get_children(children, stop):
         return [child for child in children if not stop(child)]
+
+    def _get_live_children(self, node):
+        """Return the children of `node`, without copying the children storage where possible."""
+        if self.children is not None:
+            return self.children(node)
+        children = _live_children(node)
+        return node.children if children is None else children
+
+    def _get_frame(self, node):
+        """Return iteration frame `[children, index, node, modcount]` on the live children of `node`."""
+        modcount = None
+        if self.children is not None:
+            children = self.children(node)
+        else:
+            children = _live_children(node)
+            if children is None:
+                children = node.children
+            elif children:
+                # non-empty children storage always comes along with a modification counter
+                modcount = getattr(node, "_NodeMixin__modcount", None)
+        return [children, 0, node, modcount]
+
+    @staticmethod
+    def _check_frame(frame):
+        modcount = frame[3]
+        if modcount is not None and frame[2]._NodeMixin__modcount != modcount:
+            raise ConcurrentModificationError("Children of %r have been modified during iteration." % (frame[2],))
+
+    def cursor_of(self, node):
+        """
+        Return cursor of `node`.
+
+        The cursor is a tuple of child indices leading from the iteration start node to `node`.
+        It is a plain tuple of integers and can be serialized (i.e. to JSON) and passed
+        via the `cursor` argument of :any:`PreOrderIter` or :any:`LevelOrderIter`
+        to resume the iteration right behind `node`.
+
+        The cursor is built along the `parent` of :any:`NodeMixin` nodes,
+        in about constant time per level while the children are not modified.
+        Iterators with a `children` function have no parents at hand and raise `ValueError` for all other nodes
+        than the start node.
+        """
+        path = []
+        top = self.node
+        child = node
+        while child is not top:
+            if self.children is not None:
+                raise ValueError("Cursor of %r is unknown, as the iterator walks by the children function." % (node,))
+            parent = child.parent
+            if parent is None:
+                raise ValueError("%r is not a descendant of %r." % (node, top))
+            idx = parent._child_positions().get(id(child))
+            if idx is None:
+                # hidden by an overridden `children` property
+                raise ValueError("%r is not a descendant of %r." % (node, top))
+            path.append(idx)
+            child = parent
+        return tuple(reversed(path))
+
+    @staticmethod
+    def _check_cursor(cursor):
+        if any(idx < 0 for idx in cursor):
+            raise ValueError("Invalid cursor %r." % (cursor,))
+
+
+def _live_children(node):
+    """Return the children storage of `node` or `None` for other nodes or an overridden `children` property."""
+    try:
+        children = node._NodeMixin__children
+    except AttributeError:
+        # no children attached yet or no :any:`NodeMixin`
+        return None
+    cls = node.__class__
+    plain = _PLAINCHILDREN.get(cls)
+    if plain is None:
+        from anytree.node.nodemixin import NodeMixin
+        plain = _PLAINCHILDREN[cls] = getattr(cls, "children", None) is NodeMixin.children
+    return children if plain else None
+
+
+class ConcurrentModificationError(RuntimeError):
+
+    """Tree has been modified during iteration."""
+
+    pass
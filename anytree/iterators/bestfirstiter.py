@@ -0,0 +1,91 @@
+import heapq
+import itertools
+
+from .abstractiter import AbstractIter
+
+
+class BestFirstIter(AbstractIter):
+
+    """
+    Iterate over tree applying best-first strategy starting at `node`.
+
+    Nodes are expanded by priority from a heap, nodes with the highest `key` first.
+
+    >>> from anytree import Node, RenderTree, AsciiStyle, BestFirstIter
+    >>> f = Node("f", score=5)
+    >>> b = Node("b", parent=f, score=7)
+    >>> a = Node("a", parent=b, score=2)
+    >>> d = Node("d", parent=b, score=8)
+    >>> c = Node("c", parent=d, score=1)
+    >>> e = Node("e", parent=d, score=9)
+    >>> g = Node("g", parent=f, score=4)
+    >>> i = Node("i", parent=g, score=6)
+    >>> h = Node("h", parent=i, score=3)
+    >>> print(RenderTree(f, style=AsciiStyle()).by_attr())
+    f
+    |-- b
+    |   |-- a
+    |   +-- d
+    |       |-- c
+    |       +-- e
+    +-- g
+        +-- i
+            +-- h
+
+    Without a `bound`, the iterator is greedy: it always continues at the
+    best node seen so far.
+
+    >>> [node.name for node in BestFirstIter(f, key=lambda n: n.score)]
+    ['f', 'b', 'd', 'e', 'g', 'i', 'h', 'a', 'c']
+
+    An admissible `bound` returns an upper limit for the `key` of all nodes within the subtree.
+    The nodes are returned in exact decreasing `key` order then.
+
+    >>> maxscore = dict((node, max(n.score for n in (node,) + node.descendants)) for node in f.descendants + (f,))
+    >>> [node.name for node in BestFirstIter(f, key=lambda n: n.score, bound=lambda n: maxscore[n])]
+    ['e', 'd', 'b', 'i', 'f', 'g', 'h', 'a', 'c']
+    >>> [node.name for node in BestFirstIter(f, key=lambda n: n.score, bound=lambda n: maxscore[n], maxlevel=2)]
+    ['b', 'f', 'g']
+    """
+
+    def __init__(self, node, key, bound=None, filter_=None, stop=None, maxlevel=None, children=None):
+        """
+        Iterate over tree applying best-first strategy starting at `node`.
+
+        Args:
+            key: function returning the numeric score of a node.
+
+        Keyword Args:
+            bound: function returning an upper limit of the score of all nodes in the subtree of a node.
+            filter_: function called with every `node` as argument, `node` is returned if `True`.
+            stop: stop iteration at `node` if `stop` function returns `True` for `node`.
+            maxlevel (int): maximum decending in the node hierarchy.
+            children: function returning the sequence of child nodes of a node.
+        """
+        super(BestFirstIter, self).__init__(node, filter_=filter_, stop=stop, maxlevel=maxlevel,
+                                            children=children)
+        self.key = key
+        self.bound = bound
+
+    def _iter(self, children, filter_, stop, maxlevel):
+        key = self.key
+        bound = self.bound
+        priority = bound or key
+        counter = itertools.count()
+        # heap items: (negative priority, insertion order, node, level, expanded)
+        heap = [(-priority(child), next(counter), child, 1, False) for child in children]
+        heapq.heapify(heap)
+        while heap:
+            _, _, node, level, expanded = heapq.heappop(heap)
+            if expanded:
+                yield node
+                continue
+            if filter_(node):
+                if bound is None:
+                    yield node
+                else:
+                    heapq.heappush(heap, (-key(node), next(counter), node, level, True))
+            if not AbstractIter._abort_at_level(level + 1, maxlevel):
+                for child in self._get_live_children(node):
+                    if not stop(child):
+                        heapq.heappush(heap, (-priority(child), next(counter), child, level + 1, False))
@@ -42,19 +42,17 @@ class LevelOrderGroupIter(AbstractIter):
     [['f'], ['b', 'g'], ['a', 'i'], ['h']]
     """
 
-    @staticmethod
-    def _iter(children, filter_, stop, maxlevel):
+    def _iter(self, children, filter_, stop, maxlevel):
         level = 1
         while children:
             yield tuple([child for child in children if filter_(child)])
             level += 1
             if AbstractIter._abort_at_level(level, maxlevel):
                 break
-            children = LevelOrderGroupIter._get_grandchildren(children, stop)
+            children = self._get_grandchildren(children, stop)
 
-    @staticmethod
-    def _get_grandchildren(children, stop):
+    def _get_grandchildren(self, children, stop):
         next_children = []
         for child in children:
-            next_children = next_children + AbstractIter._get_children(child.children, stop)
+            next_children += AbstractIter._get_children(self._get_live_children(child), stop)
         return next_children
@@ -36,16 +36,90 @@ class LevelOrderIter(AbstractIter):
     ['f', 'b', 'g', 'a', 'i', 'h']
     """
 
-    @staticmethod
-    def _iter(children, filter_, stop, maxlevel):
+    def __init__(self, node, filter_=None, stop=None, maxlevel=None, cursor=None, children=None):
+        """
+        Iterate over tree applying level-order strategy starting at `node`.
+
+        Keyword Args:
+            filter_: function called with every `node` as argument, `node` is returned if `True`.
+            stop: stop iteration at `node` if `stop` function returns `True` for `node`.
+            maxlevel (int): maximum decending in the node hierarchy.
+            cursor: resume iteration behind the node addressed by `cursor` (see :any:`cursor_of`).
+            children: function returning the sequence of child nodes of a node.
+
+        >>> from itertools import islice
+        >>> from anytree import Node
+        >>> f = Node("f")
+        >>> b = Node("b", parent=f)
+        >>> a = Node("a", parent=b)
+        >>> d = Node("d", parent=b)
+        >>> g = Node("g", parent=f)
+        >>> i = Node("i", parent=g)
+        >>> page = list(islice(LevelOrderIter(f), 3))
+        >>> [node.name for node in page]
+        ['f', 'b', 'g']
+        >>> cursor = LevelOrderIter(f).cursor_of(page[-1])
+        >>> cursor
+        (1,)
+        >>> [node.name for node in LevelOrderIter(f, cursor=cursor)]
+        ['a', 'd', 'i']
+        """
+        super(LevelOrderIter, self).__init__(node, filter_=filter_, stop=stop, maxlevel=maxlevel, children=children)
+        self.cursor = cursor
+
+    def _iter(self, children, filter_, stop, maxlevel):
         level = 1
+        cursor = self.cursor
+        if children and cursor is not None:
+            AbstractIter._check_cursor(cursor)
+            top = children[0]
+            level = len(cursor) + 1
+            # remaining nodes on the level of the cursor
+            for child in self.__iter_level(top, len(cursor), stop, after=cursor):
+                if filter_(child):
+                    yield child
+            level += 1
+            if AbstractIter._abort_at_level(level, maxlevel):
+                return
+            children = list(self.__iter_level(top, len(cursor) + 1, stop))
         while children:
             next_children = []
             for child in children:
                 if filter_(child):
                     yield child
-                next_children += AbstractIter._get_children(child.children, stop)
+                next_children += AbstractIter._get_children(self._get_live_children(child), stop)
             children = next_children
             level += 1
             if AbstractIter._abort_at_level(level, maxlevel):
                 break
+
+    def __iter_level(self, node, depth, stop, after=None):
+        """Iterate over all nodes `depth` levels below `node`, optionally just the ones `after` a cursor."""
+        if depth == 0:
+            if after is None:
+                yield node
+            return
+        stack = [[self._get_live_children(node), 0]]
+        if after:
+            for idx in after[:-1]:
+                children = stack[-1][0]
+                stack[-1][1] = idx + 1
+                if idx >= len(children):
+                    break
+                stack.append([self._get_live_children(children[idx]), 0])
+            else:
+                stack[-1][1] = after[-1] + 1
+        while stack:
+            frame = stack[-1]
+            children, idx = frame
+            if idx < len(children):
+                frame[1] = idx + 1
+                child = children[idx]
+                if stop(child):
+                    continue
+                if len(stack) == depth:
+                    yield child
+                else:
+                    stack.append([self._get_live_children(child), 0])
+            else:
+                stack.pop()
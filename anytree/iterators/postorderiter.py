@@ -36,16 +36,28 @@ class PostOrderIter(AbstractIter):
     ['a', 'b', 'h', 'i', 'g', 'f']
     """
 
-    @staticmethod
-    def _iter(children, filter_, stop, maxlevel):
-        return PostOrderIter.__next(children, 1, filter_, stop, maxlevel)
-
-    @staticmethod
-    def __next(children, level, filter_, stop, maxlevel):
-        if not AbstractIter._abort_at_level(level, maxlevel):
-            for child in children:
-                grandchildren = AbstractIter._get_children(child.children, stop)
-                for grandchild in PostOrderIter.__next(grandchildren, level + 1, filter_, stop, maxlevel):
-                    yield grandchild
+    def _iter(self, children, filter_, stop, maxlevel):
+        stack = [[children, 0, None, None]]
+        while stack:
+            frame = stack[-1]
+            children, idx, node, modcount = frame
+            if modcount is not None and node._NodeMixin__modcount != modcount:
+                AbstractIter._check_frame(frame)
+            if idx < len(children):
+                frame[1] = idx + 1
+                child = children[idx]
+                # top level nodes have already been checked against `stop`
+                if node is not None and stop(child):
+                    continue
+                if not AbstractIter._abort_at_level(len(stack) + 1, maxlevel):
+                    grandframe = self._get_frame(child)
+                    if grandframe[0]:
+                        # `child` is returned after its children
+                        stack.append(grandframe)
+                        continue
                 if filter_(child):
                     yield child
+            else:
+                stack.pop()
+                if node is not None and filter_(node):
+                    yield node
@@ -39,18 +39,80 @@ class PreOrderIter(AbstractIter):
     ['f', 'b', 'a', 'g', 'i', 'h']
     """
 
-    @staticmethod
-    def _iter(children, filter_, stop, maxlevel):
-        stack = [children]
+    def __init__(self, node, filter_=None, stop=None, maxlevel=None, cursor=None, children=None):
+        """
+        Iterate over tree applying pre-order strategy starting at `node`.
+
+        Keyword Args:
+            filter_: function called with every `node` as argument, `node` is returned if `True`.
+            stop: stop iteration at `node` if `stop` function returns `True` for `node`.
+            maxlevel (int): maximum decending in the node hierarchy.
+            cursor: resume iteration behind the node addressed by `cursor` (see :any:`cursor_of`).
+            children: function returning the sequence of child nodes of a node.
+
+        Huge trees can be processed page by page.
+        The cursor of the last node of a page resumes the next page in `O(depth)`:
+
+        >>> from itertools import islice
+        >>> from anytree import Node
+        >>> f = Node("f")
+        >>> b = Node("b", parent=f)
+        >>> a = Node("a", parent=b)
+        >>> d = Node("d", parent=b)
+        >>> g = Node("g", parent=f)
+        >>> page = list(islice(PreOrderIter(f), 3))
+        >>> [node.name for node in page]
+        ['f', 'b', 'a']
+        >>> cursor = PreOrderIter(f).cursor_of(page[-1])
+        >>> cursor
+        (0, 0)
+        >>> [node.name for node in PreOrderIter(f, cursor=cursor)]
+        ['d', 'g']
+        """
+        super(PreOrderIter, self).__init__(node, filter_=filter_, stop=stop, maxlevel=maxlevel, children=children)
+        self.cursor = cursor
+
+    def _iter(self, children, filter_, stop, maxlevel):
+        getchildren = self.children
+        stack = [[children, 0, None, None]]
+        if children and self.cursor is not None:
+            self.__resume(stack, self.cursor, stop, maxlevel)
         while stack:
-            children = stack[-1]
-            if children:
-                child = children.pop(0)
+            frame = stack[-1]
+            children, idx, node, modcount = frame
+            if modcount is not None and node._NodeMixin__modcount != modcount:
+                AbstractIter._check_frame(frame)
+            if idx < len(children):
+                frame[1] = idx + 1
+                child = children[idx]
+                # top level nodes have already been checked against `stop`
+                if node is not None and stop(child):
+                    continue
                 if filter_(child):
                     yield child
                 if not AbstractIter._abort_at_level(len(stack) + 1, maxlevel):
-                    grandchildren = AbstractIter._get_children(child.children, stop)
-                    if grandchildren:
-                        stack.append(grandchildren)
+                    if getchildren is not None:
+                        grandchildren = getchildren(child)
+                        if grandchildren:
+                            stack.append([grandchildren, 0, child, None])
+                        continue
+                    childframe = self._get_frame(child)
+                    if childframe[0]:
+                        stack.append(childframe)
             else:
                 stack.pop()
+
+    def __resume(self, stack, cursor, stop, maxlevel):
+        AbstractIter._check_cursor(cursor)
+        node = stack[0][0][0]
+        stack[0][1] = 1
+        for idx in cursor:
+            frame = self._get_frame(node)
+            frame[1] = idx + 1
+            stack.append(frame)
+            if idx >= len(frame[0]):
+                # tree has been modified, continue with the next sibling of `node`
+                return
+            node = frame[0][idx]
+        if (not cursor or not stop(node)) and not AbstractIter._abort_at_level(len(stack) + 1, maxlevel):
+            stack.append(self._get_frame(node))
@@ -44,11 +44,10 @@ class ZigZagGroupIter(AbstractIter):
     [['f'], ['g', 'b'], ['a', 'i'], ['h']]
     """
 
-    @staticmethod
-    def _iter(children, filter_, stop, maxlevel):
+    def _iter(self, children, filter_, stop, maxlevel):
         if children:
             assert len(children) == 1
-            _iter = LevelOrderGroupIter(children[0], filter_, stop, maxlevel)
+            _iter = LevelOrderGroupIter(children[0], filter_, stop, maxlevel, children=self.children)
             while True:
                 yield next(_iter)
                 yield tuple(reversed(next(_iter)))
@@ -4,9 +4,11 @@ Node Classes.
 * :any:`AnyNode`: a generic tree node with any number of attributes.
 * :any:`Node`: a simple tree node with at least a name attribute and any number of additional attributes.
 * :any:`NodeMixin`: extends any python class to a tree node.
+* :any:`AttrNotifyMixin`: extends :any:`NodeMixin` by attribute change notifications.
 """
 
 from .anynode import AnyNode   # noqa
+from .attrnotifymixin import AttrNotifyMixin   # noqa
 from .exceptions import LoopError   # noqa
 from .exceptions import TreeError   # noqa
 from .node import Node   # noqa
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+
+from .nodemixin import NodeMixin
+
+
+class AttrNotifyMixin(NodeMixin):
+
+    u"""
+    The :any:`AttrNotifyMixin` class extends :any:`NodeMixin` by attribute change notifications.
+
+    Observers of the tree, like :any:`TreeIndex`, are notified on every set or delete
+    of a public attribute. Without notifications, observers just track the tree structure.
+    The :any:`subtree_hash` is cached and updated likewise.
+
+    >>> from anytree import AttrNotifyMixin, Node, TreeIndex, find_by_attr
+    >>> class MyNode(AttrNotifyMixin, Node):
+    ...     pass
+    >>> root = MyNode("root")
+    >>> sub = MyNode("sub", parent=root)
+    >>> index = TreeIndex(root, "name")
+    >>> sub.name = "renamed"
+    >>> index.get("renamed")
+    (MyNode('/root/renamed'),)
+    >>> index.get("sub")
+    ()
+    """
+
+    __slots__ = ()
+
+    _attr_notify = True
+
+    def __setattr__(self, name, value):
+        super(AttrNotifyMixin, self).__setattr__(name, value)
+        if not name.startswith("_") and name not in ("parent", "children"):
+            self.__modified(name)
+
+    def __delattr__(self, name):
+        super(AttrNotifyMixin, self).__delattr__(name)
+        if not name.startswith("_") and name not in ("parent", "children"):
+            self.__modified(name)
+
+    def __modified(self, name):
+        parent = self.parent
+        if parent is not None:
+            parent._invalidate_child_map(name)
+        self._invalidate_hash()
+        self._notify_observers("_observe_attr", self, name)
@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 
+import hashlib
 import warnings
 
 from anytree.iterators import PreOrderIter
@@ -10,7 +11,13 @@ from .exceptions import TreeError
 
 class NodeMixin(object):
 
-    __slots__ = ("__parent", "__children")
+    __slots__ = ("__parent", "__children", "__modcount", "__observers", "__childmaps", "__hash", "__size")
+
+    # number of registered observers, notifications are skipped as long as there are none
+    __observed = 0
+
+    # attribute modifications are notified, see :any:`AttrNotifyMixin`
+    _attr_notify = False
 
     separator = "/"
 
@@ -87,6 +94,26 @@ class NodeMixin(object):
 
     @parent.setter
     def parent(self, value):
+        self.__set_parent(value, None)
+
+    def _set_parent(self, value, index):
+        """
+        Set the parent like :any:`parent`, but insert this node as child at `index` of `value`.
+
+        `index` refers to the children of `value` without this node.
+        The node is detached and attached again, even if `value` is its parent already.
+
+        >>> from anytree import Node
+        >>> a = Node("a")
+        >>> b = Node("b", parent=a)
+        >>> c = Node("c", parent=a)
+        >>> c._set_parent(a, 0)
+        >>> a.children
+        (Node('/a/c'), Node('/a/b'))
+        """
+        self.__set_parent(value, index)
+
+    def __set_parent(self, value, index):
         if value is not None and not isinstance(value, NodeMixin):
             msg = "Parent node %r is not of type 'NodeMixin'." % (value)
             raise TreeError(msg)
@@ -94,10 +121,10 @@ class NodeMixin(object):
             parent = self.__parent
         except AttributeError:
             parent = None
-        if parent is not value:
+        if parent is not value or index is not None:
             self.__check_loop(value)
             self.__detach(parent)
-            self.__attach(value)
+            self.__attach(value, index)
 
     def __check_loop(self, node):
         if node is not None:
@@ -112,23 +139,121 @@ class NodeMixin(object):
         if parent is not None:
             self._pre_detach(parent)
             parentchildren = parent.__children_
-            assert any([child is self for child in parentchildren]), "Tree internal data is corrupt."
+            index = self.__index(parentchildren)
+            assert index is not None, "Tree internal data is corrupt."
             # ATOMIC START
-            parentchildren.remove(self)
+            del parentchildren[index]
             self.__parent = None
+            parent.__modified()
+            parent._invalidate_hash()
+            parent.__update_size(self)
             # ATOMIC END
             self._post_detach(parent)
+            if NodeMixin.__observed:
+                parent._notify_observers("_observe_detach", self, parent, index)
 
-    def __attach(self, parent):
+    def __attach(self, parent, index=None):
         if parent is not None:
             self._pre_attach(parent)
             parentchildren = parent.__children_
             assert not any([child is self for child in parentchildren]), "Tree internal data is corrupt."
             # ATOMIC START
-            parentchildren.append(self)
+            if index is None:
+                parentchildren.append(self)
+            else:
+                parentchildren.insert(index, self)
             self.__parent = parent
+            parent.__modified()
+            parent._invalidate_hash()
+            parent.__update_size(self)
             # ATOMIC END
             self._post_attach(parent)
+            if NodeMixin.__observed:
+                parent._notify_observers("_observe_attach", self)
+
+    def __index(self, children):
+        for index, child in enumerate(children):
+            if child is self:
+                return index
+        return None
+
+    def __modified(self):
+        # modification counter of the children list, used by iterators to detect concurrent modifications
+        try:
+            self.__modcount += 1
+        except AttributeError:
+            self.__modcount = 1
+
+    def _child_map(self, attr):
+        """
+        Return dictionary mapping the values of `attr` to the list of children having it, in child order.
+
+        The dictionary is built on first use and cached until the children are modified or
+        a child modifies `attr`. Unhashable values are skipped.
+        Return `None` if modifications of `attr` are not noticed, as not all children are derived
+        from :any:`AttrNotifyMixin`, or if the :any:`children` property is overridden.
+        """
+        if not self.__plain_children():
+            return None
+        modcount = getattr(self, "_NodeMixin__modcount", 0)
+        try:
+            childmaps = self.__childmaps
+        except AttributeError:
+            childmaps = self.__childmaps = {}
+        try:
+            cached, childmap = childmaps[attr]
+            if cached == modcount:
+                return childmap
+        except KeyError:
+            pass
+        children = self.__children_
+        if all([child._attr_notify for child in children]):
+            childmap = {}
+            for child in children:
+                try:
+                    childmap.setdefault(getattr(child, attr, None), []).append(child)
+                except TypeError:
+                    pass
+        else:
+            childmap = None
+        childmaps[attr] = modcount, childmap
+        return childmap
+
+    def _invalidate_child_map(self, attr):
+        """Drop the cached :any:`_child_map` of `attr`, after a child modified `attr`."""
+        try:
+            self.__childmaps.pop(attr, None)
+        except AttributeError:
+            pass
+
+    def _child_positions(self):
+        """
+        Return dictionary mapping the ids of the children to their position.
+
+        The dictionary is built on first use and cached until the children are modified.
+        It is not cached for an overridden :any:`children` property.
+        """
+        if not self.__plain_children():
+            return dict([(id(child), idx) for idx, child in enumerate(self.children)])
+        modcount = getattr(self, "_NodeMixin__modcount", 0)
+        try:
+            childmaps = self.__childmaps
+        except AttributeError:
+            childmaps = self.__childmaps = {}
+        # attribute names are strings, `None` does not collide with `_child_map`
+        try:
+            cached, positions = childmaps[None]
+            if cached == modcount:
+                return positions
+        except KeyError:
+            pass
+        positions = dict([(id(child), idx) for idx, child in enumerate(self.__children_)])
+        childmaps[None] = modcount, positions
+        return positions
+
+    def __plain_children(self):
+        # the children property is not overridden, the children storage is used as it is
+        return getattr(self.__class__, "children", None) is NodeMixin.children
 
     @property
     def __children_(self):
@@ -445,6 +570,202 @@ class NodeMixin(object):
         """
         return len(self._path) - 1
 
+    @property
+    def subtree_size(self):
+        """
+        Number of nodes in the subtree, including this node.
+
+        >>> from anytree import Node
+        >>> udo = Node("Udo")
+        >>> marc = Node("Marc", parent=udo)
+        >>> lian = Node("Lian", parent=marc)
+        >>> loui = Node("Loui", parent=marc)
+        >>> udo.subtree_size
+        4
+        >>> marc.subtree_size
+        3
+        >>> loui.parent = udo
+        >>> udo.subtree_size, marc.subtree_size
+        (4, 2)
+
+        The sizes are cached and updated along the ancestors on every attach and detach.
+        """
+        try:
+            return self.__size
+        except AttributeError:
+            pass
+        # post-order over all nodes without cached size
+        stack = [(self, False)]
+        while stack:
+            node, ready = stack.pop()
+            if ready:
+                node.__size = 1 + sum([child.__size for child in node.__children_])
+            else:
+                stack.append((node, True))
+                for child in node.__children_:
+                    try:
+                        child.__size
+                    except AttributeError:
+                        stack.append((child, False))
+        return self.__size
+
+    def __update_size(self, child):
+        # `child` has been attached or detached
+        try:
+            self.__size
+        except AttributeError:
+            # nodes without size do not have ancestors with size
+            return
+        delta = child.subtree_size if child.__parent is self else -child.subtree_size
+        node = self
+        while node is not None:
+            try:
+                node.__size += delta
+            except AttributeError:
+                break
+            node = node.parent
+
+    @property
+    def subtree_hash(self):
+        """
+        Hash of the subtree as hex string, covering the tree structure and the public attributes.
+
+        Subtrees with the same attribute values in the same structure have the same hash.
+        Attribute values are hashed by their `repr`.
+
+        >>> from anytree import Node
+        >>> a = Node("a")
+        >>> b = Node("b", parent=a, size=4)
+        >>> c = Node("c", parent=a)
+        >>> x = Node("x")
+        >>> y = Node("b", parent=x, size=4)
+        >>> b.subtree_hash == y.subtree_hash
+        True
+        >>> a.subtree_hash == x.subtree_hash
+        False
+
+        The hashes of subtrees consisting of :any:`AttrNotifyMixin` nodes are cached,
+        as their attribute modifications are detected.
+        Attaching and detaching nodes just rehashes the ancestors then.
+        The hashes of all other subtrees are calculated on every access.
+
+        >>> c.parent = None
+        >>> x.name = "a"
+        >>> a.subtree_hash == x.subtree_hash
+        True
+        """
+        return self._subtree_hash({})
+
+    def _subtree_hash(self, hashes):
+        """
+        Return :any:`subtree_hash`, using and extending the uncached hashes by node id in `hashes`.
+
+        `hashes` is valid as long as the involved trees are not modified.
+        """
+        try:
+            return self.__hash
+        except AttributeError:
+            pass
+        try:
+            return hashes[id(self)]
+        except KeyError:
+            pass
+        # post-order over all nodes without hash
+        stack = [(self, False)]
+        while stack:
+            node, ready = stack.pop()
+            if ready:
+                node.__set_hash(hashes)
+            else:
+                stack.append((node, True))
+                for child in node.__children_:
+                    try:
+                        child.__hash
+                    except AttributeError:
+                        if id(child) not in hashes:
+                            stack.append((child, False))
+        try:
+            return hashes[id(self)]
+        except KeyError:
+            return self.__hash
+
+    def __set_hash(self, hashes):
+        try:
+            items = self.__dict__.items()
+        except AttributeError:
+            items = ()
+        attrs = sorted([(attr, value) for attr, value in items if not attr.startswith("_")])
+        sha = hashlib.sha1(repr(attrs).encode("utf-8"))
+        # just cache, if all attribute modifications within the subtree are detected
+        cache = self._attr_notify
+        for child in self.__children_:
+            try:
+                childhash = child.__hash
+            except AttributeError:
+                childhash = hashes[id(child)]
+                cache = False
+            sha.update(b"/")
+            sha.update(childhash.encode("ascii"))
+        if cache:
+            self.__hash = sha.hexdigest()
+        else:
+            hashes[id(self)] = sha.hexdigest()
+
+    def _invalidate_hash(self):
+        """Invalidate the cached :any:`subtree_hash` of this node and all its ancestors."""
+        node = self
+        while node is not None:
+            try:
+                del node.__hash
+            except AttributeError:
+                # ancestors of nodes without hash do not have a hash either
+                break
+            node = node.parent
+
+    def _add_observer(self, observer):
+        """
+        Register `observer` for all modifications within the subtree of this node.
+
+        The observer is notified *after* each modification via:
+
+        * `observer._observe_attach(node)`: `node` has been attached,
+          as last child unless it has been inserted via :any:`_set_parent`.
+        * `observer._observe_detach(node, parent, index)`: `node` has been detached from `parent`,
+          where it has been the child at position `index`.
+        * `observer._observe_attr(node, name)`: the attribute `name` of `node` has been set or deleted.
+          Only nodes derived from :any:`AttrNotifyMixin` notify attribute changes.
+        """
+        try:
+            observers = self.__observers
+        except AttributeError:
+            observers = self.__observers = []
+        observers.append(observer)
+        NodeMixin.__observed += 1
+
+    def _remove_observer(self, observer):
+        """Unregister `observer` registered by :any:`_add_observer`."""
+        self.__observers.remove(observer)
+        NodeMixin.__observed -= 1
+
+    def _iter_observers(self):
+        """Iterate over all observers of this node, registered at the node or any of its ancestors."""
+        node = self
+        while node is not None:
+            try:
+                observers = node.__observers
+            except AttributeError:
+                observers = None
+            if observers:
+                for observer in tuple(observers):
+                    yield observer
+            node = node.parent
+
+    def _notify_observers(self, event, *args):
+        """Call method `event` with `args` on all observers of this node."""
+        if NodeMixin.__observed:
+            for observer in self._iter_observers():
+                getattr(observer, event)(*args)
+
     def _pre_detach(self, parent):
         """Method call before detaching from `parent`."""
         pass
@@ -0,0 +1,292 @@
+# -*- coding: utf-8 -*-
+"""
+Parallel Processing.
+
+The tree is partitioned into shards of similar size.
+Every shard is a sequence of nodes in pre-order, the concatenation of all shards is the pre-order of the tree.
+Whole subtrees are kept within one shard where possible.
+
+The shards are copied into compact snapshots and processed by a process pool.
+The functions are called with copies of the nodes (:any:`AnyNode` instances with all public attributes),
+their `children` are just the descendants within the same shard.
+Items of other structures, traversed by `children`, are copied with their public mapping items,
+or with the values returned by `attrs`, if it is a function.
+The ancestors of every shard are copied along, so `parent`, `path`, `depth`, `ancestors` and `root`
+are the same as in the original tree, but `siblings` are not.
+Functions and attribute values must be picklable.
+
+* :any:`partition`: partition tree into shards.
+* :any:`pmap`: map function to all nodes.
+* :any:`pmap_reduce`: map function to all nodes and reduce the results.
+* :any:`pfindall`: search nodes.
+
+This module requires `concurrent.futures` (Python 3.2 or the `futures` backport).
+"""
+
+import functools
+import itertools
+
+import six
+
+try:
+    from collections.abc import Mapping
+except ImportError:  # pragma: no cover
+    from collections import Mapping
+
+from anytree.iterators import PostOrderIter
+from anytree.node import AnyNode
+from anytree.search import _collect
+
+# shards per worker, to balance varying processing times
+_SHARDSPERWORKER = 4
+
+_MISSING = object()
+
+
+def partition(node, count, children=None):
+    """
+    Partition the tree below `node` into about `count` shards of similar size.
+
+    Return list of shards, every shard is a tuple of nodes in pre-order.
+
+    >>> from anytree import Node, RenderTree, AsciiStyle
+    >>> f = Node("f")
+    >>> b = Node("b", parent=f)
+    >>> a = Node("a", parent=b)
+    >>> d = Node("d", parent=b)
+    >>> c = Node("c", parent=d)
+    >>> e = Node("e", parent=d)
+    >>> g = Node("g", parent=f)
+    >>> i = Node("i", parent=g)
+    >>> h = Node("h", parent=i)
+    >>> print(RenderTree(f, style=AsciiStyle()).by_attr())
+    f
+    |-- b
+    |   |-- a
+    |   +-- d
+    |       |-- c
+    |       +-- e
+    +-- g
+        +-- i
+            +-- h
+    >>> for shard in partition(f, 3):
+    ...     print([node.name for node in shard])
+    ['f', 'b', 'a']
+    ['d', 'c', 'e']
+    ['g', 'i', 'h']
+    """
+    return [tuple([item for item, _ in shard]) for shard in _partition(node, count, children)]
+
+
+def pmap(node, func, workers=None, executor=None, attrs=None, children=None):
+    """
+    Return list with the results of `func` called with every node in pre-order.
+
+    Args:
+        node: top node.
+        func: function called with a copy of every node.
+
+    Keyword Args:
+        workers (int): number of worker processes. Default is the number of processors.
+        executor: `concurrent.futures.Executor` to be used instead of a new process pool.
+        attrs: names of the copied attributes or function returning the `(name, value)` pairs of a node.
+               Default is all public attributes.
+        children: function returning the sequence of child nodes of a node.
+    """
+    results = _run(node, _map, func, workers, executor, attrs, children)
+    return list(itertools.chain.from_iterable(results))
+
+
+def pmap_reduce(node, map_, reduce_, initial=_MISSING, workers=None, executor=None, attrs=None, children=None):
+    """
+    Map `map_` to all nodes and reduce the results by `reduce_` in pre-order.
+
+    The results are reduced within every shard first, so `reduce_` needs to be associative.
+
+    Args:
+        node: top node.
+        map_: function called with a copy of every node.
+        reduce_: function called with two results, returning one.
+
+    Keyword Args:
+        initial: start value of the reduction. Any value including `None`, there is none by default.
+        workers (int): number of worker processes. Default is the number of processors.
+        executor: `concurrent.futures.Executor` to be used instead of a new process pool.
+        attrs: names of the copied attributes or function returning the `(name, value)` pairs of a node.
+               Default is all public attributes.
+        children: function returning the sequence of child nodes of a node.
+    """
+    results = _run(node, _map_reduce, (map_, reduce_), workers, executor, attrs, children)
+    if initial is _MISSING:
+        return functools.reduce(reduce_, results)
+    return functools.reduce(reduce_, results, initial)
+
+
+def pfindall(node, filter_, mincount=None, maxcount=None, workers=None, executor=None, attrs=None,
+             children=None):
+    """
+    Search nodes matching `filter_`.
+
+    Return tuple with the matching (original) nodes in pre-order like :any:`findall`.
+
+    Args:
+        node: top node.
+        filter_: function called with a copy of every node, the node is returned if `True`.
+
+    Keyword Args:
+        mincount (int): minimum number of nodes.
+        maxcount (int): maximum number of nodes.
+        workers (int): number of worker processes. Default is the number of processors.
+        executor: `concurrent.futures.Executor` to be used instead of a new process pool.
+        attrs: names of the copied attributes or function returning the `(name, value)` pairs of a node.
+               Default is all public attributes.
+        children: function returning the sequence of child nodes of a node.
+    """
+    shards = []
+    results = _run(node, _findall, filter_, workers, executor, attrs, children, shards=shards)
+    result = tuple([shard[idx][0] for shard, positions in zip(shards, results) for idx in positions])
+    return _collect(result, mincount, maxcount)
+
+
+def _run(node, work, func, workers, executor, attrs, children, shards=None):
+    if executor is None:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return _run(node, work, func, workers, executor, attrs, children, shards=shards)
+    count = (workers or _cpu_count()) * _SHARDSPERWORKER
+    partitioned = _partition(node, count, children)
+    if shards is not None:
+        shards.extend(partitioned)
+    futures = [executor.submit(work, func, _snapshot(shard, attrs, children is None)) for shard in partitioned]
+    return [future.result() for future in futures]
+
+
+def _partition(node, count, children):
+    # list of shards, every shard is a list of (node, parent position within shard)
+    getchildren = children or (lambda item: item.children)
+    sizes = {}
+    for item in PostOrderIter(node, children=children):
+        sizes[id(item)] = 1 + sum([sizes[id(child)] for child in getchildren(item)])
+    target = max(sizes[id(node)] // max(count, 1), 1)
+    # units in pre-order: whole subtrees up to `target` nodes, larger ones are split
+    units = []
+    stack = [node]
+    while stack:
+        item = stack.pop()
+        size = sizes[id(item)]
+        if size <= target:
+            units.append((item, size, True))
+        else:
+            units.append((item, 1, False))
+            stack.extend(reversed(tuple(getchildren(item))))
+    # consecutive units are merged to shards
+    shards = []
+    shard = []
+    weight = 0
+    for item, size, whole in units:
+        if shard and weight + size > target:
+            shards.append(shard)
+            shard = []
+            weight = 0
+        if whole:
+            _flatten(shard, item, getchildren)
+        else:
+            shard.append((item, -1))
+        weight += size
+    if shard:
+        shards.append(shard)
+    return shards
+
+
+def _flatten(shard, node, getchildren):
+    stack = [(node, -1)]
+    while stack:
+        item, parent = stack.pop()
+        position = len(shard)
+        shard.append((item, parent))
+        stack.extend([(child, position) for child in reversed(tuple(getchildren(item)))])
+
+
+def _snapshot(shard, attrs, ancestry):
+    """
+    Return tuple of the copied ancestors and the copied shard nodes.
+
+    Ancestors are `(parent, values)` with the position of the parent among the ancestors,
+    shard nodes are `(parent, anchor, values)` with the position of the parent within the shard
+    or the position of the parent among the ancestors (`anchor`).
+    """
+    ancestors = []
+    positions = {}
+    nodes = []
+    inshard = {}
+    for node, parent in shard:
+        anchor = -1
+        if parent < 0 and ancestry:
+            # the parent might be part of the shard, as subtrees are split
+            parent = inshard.get(id(node.parent), -1)
+            if parent < 0:
+                anchor = _copy_ancestors(ancestors, positions, node.parent, attrs)
+        inshard[id(node)] = len(nodes)
+        nodes.append((parent, anchor, _values(node, attrs)))
+    return ancestors, nodes
+
+
+def _copy_ancestors(ancestors, positions, node, attrs):
+    # copy `node` and its ancestors not copied yet, return the position of `node`
+    chain = []
+    while node is not None and id(node) not in positions:
+        chain.append(node)
+        node = node.parent
+    position = positions[id(node)] if node is not None else -1
+    for item in reversed(chain):
+        ancestors.append((position, _values(item, attrs)))
+        position = positions[id(item)] = len(ancestors) - 1
+    return position
+
+
+def _values(node, attrs):
+    items = node if isinstance(node, Mapping) else getattr(node, "__dict__", {})
+    if callable(attrs):
+        values = dict(attrs(node))
+    elif attrs is None:
+        values = dict([(attr, value) for attr, value in items.items()
+                       if isinstance(attr, six.string_types) and not attr.startswith("_")])
+    elif isinstance(node, Mapping):
+        values = dict([(attr, items[attr]) for attr in attrs if attr in items])
+    else:
+        values = dict([(attr, getattr(node, attr)) for attr in attrs if hasattr(node, attr)])
+    values.pop("parent", None)
+    values.pop("children", None)
+    return values
+
+
+def _restore(snapshot):
+    ancestors = []
+    for parent, values in snapshot[0]:
+        ancestors.append(AnyNode(parent=ancestors[parent] if parent >= 0 else None, **values))
+    nodes = []
+    for parent, anchor, values in snapshot[1]:
+        if parent >= 0:
+            parentnode = nodes[parent]
+        else:
+            parentnode = ancestors[anchor] if anchor >= 0 else None
+        nodes.append(AnyNode(parent=parentnode, **values))
+    return nodes
+
+
+def _map(func, snapshot):
+    return [func(node) for node in _restore(snapshot)]
+
+
+def _map_reduce(func, snapshot):
+    map_, reduce_ = func
+    return functools.reduce(reduce_, [map_(node) for node in _restore(snapshot)])
+
+
+def _findall(func, snapshot):
+    return [idx for idx, node in enumerate(_restore(snapshot)) if func(node)]
+
+
+def _cpu_count():
+    import multiprocessing
+    return multiprocessing.cpu_count()
@@ -7,19 +7,47 @@ Tree Rendering.
     * :any:`ContStyle`
     * :any:`ContRoundStyle`
     * :any:`DoubleStyle`
+* :any:`LiveRender`: rendered rows following all tree modifications.
 """
 
 import collections
+import itertools
 
 import six
 
+from anytree.iterators import PreOrderIter
+from anytree.node.nodemixin import NodeMixin
+
 
 Row = collections.namedtuple("Row", ("pre", "fill", "node"))
 
 
+class Elided(collections.namedtuple("Elided", ("count",))):
+
+    """Placeholder for `count` nodes not rendered, at the position of the first one."""
+
+    __slots__ = ()
+
+
+class RowChange(collections.namedtuple("RowChange", ("kind", "start", "stop", "lines"))):
+
+    """
+    Replace the rows `start` to `stop` (exclusive) by `lines`, like `rows[start:stop] = lines`.
+
+    `kind` is `"insert"` (`start == stop`), `"delete"` (no `lines`) or `"replace"`.
+    Replacements keep the number of rows, unless the number of lines of a multi-line attribute changes.
+    """
+
+    __slots__ = ()
+
+
+# number of strings written at once by `RenderTree.write`
+_WRITECHUNK = 4096
+
+
 class AbstractStyle(object):
 
-    def __init__(self, vertical, cont, end):
+    def __init__(self, vertical, cont, end, ellipsis=u'\u2026'):
         """
         Tree Render Style.
 
@@ -30,11 +58,16 @@ class AbstractStyle(object):
             cont: Chars for a continued branch.
 
             end: Chars for the last branch.
+
+        Keyword Args:
+
+            ellipsis: Chars marking elided nodes.
         """
         super(AbstractStyle, self).__init__()
         self.vertical = vertical
         self.cont = cont
         self.end = end
+        self.ellipsis = ellipsis
         assert (len(cont) == len(vertical) and len(cont) == len(end)), (
             "'%s', '%s' and '%s' need to have equal length" % (vertical, cont,
                                                                end))
@@ -69,7 +102,7 @@ class AsciiStyle(AbstractStyle):
         |   +-- Node('/root/sub0/sub0A')
         +-- Node('/root/sub1')
         """
-        super(AsciiStyle, self).__init__(u'|   ', u'|-- ', u'+-- ')
+        super(AsciiStyle, self).__init__(u'|   ', u'|-- ', u'+-- ', ellipsis=u'...')
 
 
 class ContStyle(AbstractStyle):
@@ -151,13 +184,18 @@ class DoubleStyle(AbstractStyle):
 @six.python_2_unicode_compatible
 class RenderTree(object):
 
-    def __init__(self, node, style=ContStyle(), childiter=list):
+    def __init__(self, node, style=ContStyle(), childiter=list, children=None, maxlevel=None, maxchildren=None,
+                 maxrows=None):
         u"""
         Render tree starting at `node`.
 
         Keyword Args:
             style (AbstractStyle): Render Style.
             childiter: Child iterator.
+            children: function returning the sequence of child nodes of a node.
+            maxlevel (int): maximum decending in the node hierarchy.
+            maxchildren (int): maximum number of rendered children per node.
+            maxrows (int): maximum number of rows, before the elided rest is summarized level by level.
 
         :any:`RenderTree` is an iterator, returning a tuple with 3 items:
 
@@ -248,39 +286,231 @@ class RenderTree(object):
         │   └── a
         │       b
         └── Z
+
+        Any other tree structure can be rendered by `children`:
+
+        >>> tree = ("root", [("sub0", [("sub0B", []), ("sub0A", [])]), ("sub1", [])])
+        >>> for pre, _, item in RenderTree(tree, children=lambda item: item[1]):
+        ...     print("%s%s" % (pre, item[0]))
+        root
+        ├── sub0
+        │   ├── sub0B
+        │   └── sub0A
+        └── sub1
+
+        Large trees can be truncated by `maxlevel`, `maxchildren` and `maxrows`.
+        The truncation prunes the iteration, elided nodes are summarized by :any:`Elided` rows
+        using the number of children, without visiting their subtrees:
+
+        >>> big = Node("big")
+        >>> for idx in range(1002):
+        ...     item = Node("item%d" % idx, parent=big)
+        >>> sub = Node("sub", parent=big.children[0])
+        >>> print(RenderTree(big, maxchildren=2).by_attr())
+        big
+        ├── item0
+        │   └── sub
+        ├── item1
+        └── … 1,000 more
+        >>> print(RenderTree(big, maxlevel=2, maxchildren=1).by_attr())
+        big
+        ├── item0
+        │   └── … 1 more
+        └── … 1,001 more
+        >>> print(RenderTree(big, style=AsciiStyle(), maxrows=3).by_attr())
+        big
+        |-- item0
+        |   +-- sub
+        +-- ... 1,001 more
         """
         if not isinstance(style, AbstractStyle):
             style = style()
         self.node = node
         self.style = style
         self.childiter = childiter
+        self.children = children
+        self.maxlevel = maxlevel
+        self.maxchildren = maxchildren
+        self.maxrows = maxrows
 
     def __iter__(self):
-        return self.__next(self.node, tuple())
+        style = self.style
+        return self.__next(self.node, (u'', style.vertical, style.cont, style.end, style.empty))
+
+    def __next(self, node, fragments):
+        root = fragments[0]
+        yield Row(root, root, node)
+        # stack of [child iterator, index of last item, index of next item, indent of children, number of children]
+        stack = []
+        truncate = self.maxlevel is not None or self.maxchildren is not None or self.maxrows is not None
+        self.__push(stack, node, root, None, truncate)
+        for row in self.__walk(stack, fragments, None, truncate):
+            yield row
+
+    def __push(self, stack, node, indent, collapsed, truncate):
+        if collapsed and id(node) in collapsed or isinstance(node, Elided):
+            return
+        children = node.children if self.children is None else self.children(node)
+        if not children:
+            return
+        count = len(children)
+        if truncate:
+            maxlevel, maxchildren = self.maxlevel, self.maxchildren
+            if maxlevel is not None and len(stack) + 2 > maxlevel:
+                # the children are beyond `maxlevel`
+                stack.append([iter([Elided(count)]), 0, 0, indent, count])
+                return
+            if maxchildren is not None and count > maxchildren:
+                items = list(itertools.islice(self.childiter(children), maxchildren)) + [Elided(count - maxchildren)]
+                stack.append([iter(items), maxchildren, 0, indent, count])
+                return
+        stack.append([iter(self.childiter(children)), count - 1, 0, indent, count])
+
+    def __walk(self, stack, fragments, collapsed, truncate):
+        _, vertical, cont, end, empty = fragments
+        maxrows = self.maxrows if truncate else None
+        rowcount = 1
+        while stack:
+            if maxrows is not None and rowcount >= maxrows:
+                # summarize the remaining children of all levels
+                for frame in reversed(stack):
+                    if frame[2] <= frame[1]:
+                        indent = frame[3]
+                        yield Row(indent + end, indent + empty, Elided(frame[4] - frame[2]))
+                return
+            frame = stack[-1]
+            for child in frame[0]:
+                indent = frame[3]
+                if frame[2] != frame[1]:
+                    row = Row(indent + cont, indent + vertical, child)
+                else:
+                    row = Row(indent + end, indent + empty, child)
+                frame[2] += 1
+                rowcount += 1
+                yield row
+                self.__push(stack, child, row.fill, collapsed, truncate)
+                break
+            else:
+                stack.pop()
+
+    def rows(self, start=0, stop=None, collapsed=()):
+        u"""
+        Return list of the rows `start` to `stop` (exclusive), like a slice of all rows.
+
+        Keyword Args:
+            start (int): index of the first row.
+            stop (int): index after the last row. Default is the end.
+            collapsed: nodes whose descendants are not rendered.
 
-    def __next(self, node, continues):
-        yield RenderTree.__item(node, continues, self.style)
-        children = node.children
-        if children:
+        Negative indices count from the end, like for slices.
+        The rows before `start` are skipped via the subtree sizes (:any:`subtree_size`),
+        the costs just depend on the depth, the number of siblings and the number of returned rows.
+
+        >>> from anytree import Node
+        >>> root = Node("root")
+        >>> s0 = Node("sub0", parent=root)
+        >>> s0b = Node("sub0B", parent=s0)
+        >>> s0a = Node("sub0A", parent=s0)
+        >>> s1 = Node("sub1", parent=root)
+        >>> s1a = Node("sub1A", parent=s1)
+        >>> tree = RenderTree(root)
+        >>> for row in tree.rows(2, 5):
+        ...     print("%s%s" % (row.pre, row.node.name))
+        │   ├── sub0B
+        │   └── sub0A
+        └── sub1
+        >>> for row in tree.rows(1, collapsed=[s0]):
+        ...     print("%s%s" % (row.pre, row.node.name))
+        ├── sub0
+        └── sub1
+            └── sub1A
+
+        With a custom `children` function or an overridden `children` property of the top node class,
+        the subtree sizes are calculated on every call.
+        The truncation by `maxlevel`, `maxchildren` and `maxrows` does not apply.
+        """
+        style = self.style
+        fragments = (u'', style.vertical, style.cont, style.end, style.empty)
+        collapsed = dict([(id(node), node) for node in collapsed])
+        size = self.__sizes(collapsed)
+        node = self.node
+        start, stop, _ = slice(start, stop).indices(size(node))
+        if start >= stop:
+            return []
+        # descend to row `start`, collecting the stack of the remaining siblings
+        stack = []
+        row = Row(u'', u'', node)
+        remaining = start
+        while remaining:
+            remaining -= 1
+            children = node.children if self.children is None else self.children(node)
+            ordered = list(self.childiter(children))
+            for idx, child in enumerate(ordered):
+                childsize = size(child)
+                if remaining < childsize:
+                    break
+                remaining -= childsize
+            else:
+                # sizes and children disagree, the tree has been modified meanwhile
+                return []
             lastidx = len(children) - 1
-            for idx, child in enumerate(self.childiter(children)):
-                for grandchild in self.__next(child, continues + (idx != lastidx, )):
-                    yield grandchild
-
-    @staticmethod
-    def __item(node, continues, style):
-        if not continues:
-            return Row(u'', u'', node)
-        else:
-            items = [style.vertical if cont else style.empty for cont in continues]
-            indent = ''.join(items[:-1])
-            branch = style.cont if continues[-1] else style.end
-            pre = indent + branch
-            fill = ''.join(items)
-            return Row(pre, fill, node)
+            indent = row.fill
+            stack.append([iter(ordered[idx + 1:]), lastidx, idx + 1, indent, len(children)])
+            if idx != lastidx:
+                row = Row(indent + style.cont, indent + style.vertical, child)
+            else:
+                row = Row(indent + style.end, indent + style.empty, child)
+            node = child
+        rows = [row]
+        self.__push(stack, node, row.fill, collapsed, False)
+        rows.extend(itertools.islice(self.__walk(stack, fragments, collapsed, False), stop - start - 1))
+        return rows
+
+    def __sizes(self, collapsed):
+        """Return function returning the number of rendered rows of a node."""
+        top = self.node
+        if self.children is None and getattr(top.__class__, "children", None) is NodeMixin.children:
+            # hidden rows per node, accumulated from the topmost collapsed nodes
+            hidden = {}
+            for node in self.__topmost(collapsed):
+                delta = node.subtree_size - 1
+                while node is not None:
+                    hidden[id(node)] = hidden.get(id(node), 0) + delta
+                    if node is top:
+                        break
+                    node = node.parent
+            return lambda node: node.subtree_size - hidden.get(id(node), 0)
+        children = self.children or (lambda node: node.children)
+        sizes = {}
+        stack = [(top, False)]
+        while stack:
+            node, ready = stack.pop()
+            if id(node) in collapsed:
+                sizes[id(node)] = 1
+            elif ready:
+                sizes[id(node)] = 1 + sum([sizes[id(child)] for child in children(node)])
+            else:
+                stack.append((node, True))
+                stack.extend([(child, False) for child in children(node)])
+        return lambda node: sizes[id(node)]
+
+    def __topmost(self, collapsed):
+        """Collapsed nodes within the tree without collapsed ancestor."""
+        top = self.node
+        for node in collapsed.values():
+            topmost = node is top
+            ancestor = None if topmost else node.parent
+            while ancestor is not None and id(ancestor) not in collapsed:
+                if ancestor is top:
+                    topmost = True
+                    break
+                ancestor = ancestor.parent
+            if topmost:
+                yield node
 
     def __str__(self):
-        lines = ["%s%r" % (pre, node) for pre, _, node in self]
+        lines = ["%s%s" % (pre, self.__elided(node) if isinstance(node, Elided) else repr(node))
+                 for pre, _, node in self]
         return "\n".join(lines)
 
     def __repr__(self):
@@ -294,12 +524,284 @@ class RenderTree(object):
         """Return rendered tree with node attribute `attrname`."""
         def get():
             for pre, fill, node in self:
-                attr = getattr(node, attrname, "")
-                if isinstance(attr, (list, tuple)):
-                    lines = attr
-                else:
-                    lines = str(attr).split("\n")
+                lines = self.__lines(node, attrname)
                 yield u"%s%s" % (pre, lines[0])
                 for line in lines[1:]:
                     yield u"%s%s" % (fill, line)
         return "\n".join(get())
+
+    def write(self, fp, attrname=None, encoding=None):
+        u"""
+        Write rendered tree to the file object `fp`, every line terminated by a newline.
+
+        Keyword Args:
+            attrname: render node attribute `attrname` like :any:`by_attr`. Default is the node representation.
+            encoding: encode the lines by `encoding` for binary files. Default writes text.
+
+        The lines are written in chunks, the rendered tree is never held in memory as a whole.
+
+        >>> import io
+        >>> from anytree import Node
+        >>> root = Node("root")
+        >>> s0 = Node("sub0", parent=root)
+        >>> s1 = Node("sub1", parent=root)
+        >>> fp = io.StringIO()
+        >>> RenderTree(root).write(fp, attrname="name")
+        >>> print(fp.getvalue().rstrip())
+        root
+        ├── sub0
+        └── sub1
+        >>> fp = io.BytesIO()
+        >>> RenderTree(root, style=AsciiStyle()).write(fp, encoding="utf-8")
+        >>> fp.getvalue()
+        b"Node('/root')\\n|-- Node('/root/sub0')\\n+-- Node('/root/sub1')\\n"
+        """
+        style = self.style
+        fragments = (u'', style.vertical, style.cont, style.end, style.empty)
+        newline = u"\n"
+        if encoding is not None:
+            fragments = tuple([fragment.encode(encoding) for fragment in fragments])
+            newline = newline.encode(encoding)
+        join = fragments[0].join
+        chunk = []
+        for pre, fill, node in self.__next(self.node, fragments):
+            if attrname is None:
+                lines = [self.__elided(node) if isinstance(node, Elided) else u"%r" % (node,)]
+            else:
+                lines = [u"%s" % (line,) for line in self.__lines(node, attrname)]
+            if encoding is not None:
+                lines = [line.encode(encoding) for line in lines]
+            chunk += [pre, lines[0], newline]
+            for line in lines[1:]:
+                chunk += [fill, line, newline]
+            if len(chunk) >= _WRITECHUNK:
+                fp.write(join(chunk))
+                chunk = []
+        if chunk:
+            fp.write(join(chunk))
+
+    def __lines(self, node, attrname):
+        if isinstance(node, Elided):
+            return [self.__elided(node)]
+        attr = getattr(node, attrname, "")
+        if isinstance(attr, (list, tuple)):
+            return attr
+        return str(attr).split("\n")
+
+    def __elided(self, node):
+        return u"%s %s more" % (self.style.ellipsis, _grouped(node.count))
+
+
+@six.python_2_unicode_compatible
+class LiveRender(object):
+
+    def __init__(self, node, style=ContStyle(), attrname="name"):
+        u"""
+        Rendered tree starting at `node`, which follows all tree modifications.
+
+        Keyword Args:
+            style (AbstractStyle): Render Style.
+            attrname (str): rendered node attribute, multi-line values span several rows like :any:`by_attr`.
+
+        The rows are rendered once and registered as observer at `node`.
+        Every modification just re-renders the affected rows and records a :any:`RowChange`,
+        :any:`update` returns the changes since the last call.
+        Applying the changes in order to a copy of the rows yields the current `lines`.
+
+        >>> from anytree import AttrNotifyMixin, Node
+        >>> class MyNode(AttrNotifyMixin, Node):
+        ...     pass
+        >>> root = MyNode("root")
+        >>> s0 = MyNode("sub0", parent=root)
+        >>> s0a = MyNode("sub0A", parent=s0)
+        >>> live = LiveRender(root)
+        >>> print(live)
+        root
+        └── sub0
+            └── sub0A
+        >>> s1 = MyNode("sub1", parent=root)
+        >>> s0a.name = "sub0a"
+        >>> for change in live.update():
+        ...     print(change)
+        RowChange(kind='replace', start=1, stop=3, lines=['├── sub0', '│   └── sub0A'])
+        RowChange(kind='insert', start=3, stop=3, lines=['└── sub1'])
+        RowChange(kind='replace', start=2, stop=3, lines=['│   └── sub0a'])
+        >>> print(live)
+        root
+        ├── sub0
+        │   └── sub0a
+        └── sub1
+        >>> live.update()
+        []
+
+        The costs of a modification depend on the depth, the number of siblings and the number of changed rows.
+        Attribute changes are just noticed for nodes derived from :any:`AttrNotifyMixin`,
+        use :any:`refresh` for any other node.
+        The children are rendered in their natural order.
+        """
+        if not isinstance(style, AbstractStyle):
+            style = style()
+        self.node = node
+        self.style = style
+        self.attrname = attrname
+        # per node id: [number of own rows, number of rows of the subtree]
+        self.__rows = {}
+        self.lines = self.__render(node)
+        self.__changes = []
+        node._add_observer(self)
+        self.__closed = False
+
+    def update(self):
+        """Return list of :any:`RowChange` since the last call."""
+        changes, self.__changes = self.__changes, []
+        return changes
+
+    def refresh(self, node):
+        """Re-render the rows of `node`, after an unnoticed attribute change."""
+        start = self.__row(node)
+        pre, fill = self.__prefix(node)
+        texts = self.__texts(node)
+        rows = self.__rows[id(node)]
+        count = rows[0]
+        rows[0] = len(texts)
+        self.__grow(node, len(texts) - count)
+        self.__change("replace", start, start + count, [pre + texts[0]] + [fill + text for text in texts[1:]])
+
+    def close(self):
+        """Stop following tree modifications. Further calls do nothing."""
+        if self.__closed:
+            return
+        self.__closed = True
+        self.node._remove_observer(self)
+        self.__changes = []
+
+    def __str__(self):
+        return "\n".join(self.lines)
+
+    def __repr__(self):
+        classname = self.__class__.__name__
+        args = [repr(self.node),
+                "style=%s" % repr(self.style),
+                "attrname=%r" % (self.attrname,)]
+        return "%s(%s)" % (classname, ", ".join(args))
+
+    def _observe_attach(self, node):
+        children = node.parent.children
+        if len(children) > 1 and children[-1] is node:
+            # the former last sibling got a successor
+            self.__replace(children[-2])
+        lines = self.__render(node)
+        start = self.__row(node)
+        self.__grow(node.parent, len(lines))
+        self.__change("insert", start, start, lines)
+
+    def _observe_detach(self, node, parent, index):
+        children = parent.children
+        rows = self.__rows
+        start = self.__row(parent) + rows[id(parent)][0] + sum([rows[id(child)][1] for child in children[:index]])
+        count = rows[id(node)][1]
+        for item in PreOrderIter(node):
+            rows.pop(id(item), None)
+        self.__grow(parent, -count)
+        self.__change("delete", start, start + count, [])
+        if children and index == len(children):
+            # the new last sibling lost its successor
+            self.__replace(children[-1])
+
+    def _observe_attr(self, node, name):
+        if name == self.attrname:
+            self.refresh(node)
+
+    def __change(self, kind, start, stop, lines):
+        self.lines[start:stop] = lines
+        changes = self.__changes
+        if kind == "replace" and changes:
+            last = changes[-1]
+            if last.kind == "replace" and last.start == start and last.start + len(last.lines) == stop:
+                # repeated changes of the same rows are merged
+                changes[-1] = RowChange(kind, start, last.stop, lines)
+                return
+        changes.append(RowChange(kind, start, stop, lines))
+
+    def __replace(self, node):
+        """Re-render the subtree of `node`."""
+        start = self.__row(node)
+        count = self.__rows[id(node)][1]
+        lines = self.__render(node)
+        self.__grow(node.parent, len(lines) - count)
+        self.__change("replace", start, start + count, lines)
+
+    def __render(self, node):
+        """Rendered rows of the subtree of `node`, recording the row counts."""
+        pre, fill = self.__prefix(node)
+        rows = self.__rows
+        lines = []
+        items = []
+        for row in RenderTree(node, self.style):
+            texts = self.__texts(row.node)
+            lines.append((pre if row.node is node else fill + row.pre) + texts[0])
+            lines += [fill + row.fill + text for text in texts[1:]]
+            rows[id(row.node)] = [len(texts), len(texts)]
+            items.append(row.node)
+        # children are summed up before their parents
+        for item in reversed(items[1:]):
+            rows[id(item.parent)][1] += rows[id(item)][1]
+        return lines
+
+    def __grow(self, node, delta):
+        """Add `delta` rows to the subtrees of `node` and its ancestors."""
+        if delta:
+            rows = self.__rows
+            top = self.node
+            while node is not None:
+                rows[id(node)][1] += delta
+                if node is top:
+                    break
+                node = node.parent
+
+    def __prefix(self, node):
+        """Tree prefix and fill of `node`."""
+        style = self.style
+        top = self.node
+        islast = []
+        while node is not top:
+            parent = node.parent
+            islast.append(parent.children[-1] is node)
+            node = parent
+        if not islast:
+            return u'', u''
+        indent = u''.join([style.empty if last else style.vertical for last in reversed(islast[1:])])
+        if islast[0]:
+            return indent + style.end, indent + style.empty
+        return indent + style.cont, indent + style.vertical
+
+    def __row(self, node):
+        """Row index of `node`."""
+        rows = self.__rows
+        top = self.node
+        row = 0
+        while node is not top:
+            parent = node.parent
+            for child in parent.children:
+                if child is node:
+                    break
+                row += rows[id(child)][1]
+            row += rows[id(parent)][0]
+            node = parent
+        return row
+
+    def __texts(self, node):
+        attr = getattr(node, self.attrname, "")
+        if isinstance(attr, (list, tuple)):
+            return [u"%s" % (text,) for text in attr] or [u""]
+        return (u"%s" % (attr,)).split(u"\n")
+
+
+def _grouped(number):
+    """Number with thousands separators."""
+    digits = str(number)
+    groups = []
+    while len(digits) > 3:
+        groups.insert(0, digits[-3:])
+        digits = digits[:-3]
+    return ",".join([digits] + groups)
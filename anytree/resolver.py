@@ -5,12 +5,24 @@ from __future__ import print_function
 
 import re
 
-_MAXCACHE = 20
+import six
+
+try:
+    from collections import OrderedDict
+except ImportError:  # pragma: no cover
+    from ordereddict import OrderedDict
+
+# maximum number of compiled glob paths
+_MAXCACHE = 256
+
+# glob steps
+_PARENT, _SELF, _LITERAL, _PATTERN, _RECURSIVE = range(5)
 
 
 class Resolver(object):
 
-    _match_cache = {}
+    # compiled glob paths: parts -> steps, least recently used first and dropped first
+    _match_cache = OrderedDict()
 
     def __init__(self, pathattr='name'):
         """Resolve :any:`NodeMixin` paths using attribute `pathattr`."""
@@ -21,6 +33,10 @@ class Resolver(object):
         """
         Return instance at `path`.
 
+        Children derived from :any:`AttrNotifyMixin` are looked up via a hashed child map,
+        cached per node until its children are modified or renamed. Other children are scanned.
+        If several children share the same name, the first one is returned.
+
         An example module tree:
 
         >>> from anytree import Node
@@ -44,6 +60,10 @@ class Resolver(object):
         Node('/top/sub0/sub0sub1')
         >>> r.get(sub1, ".")
         Node('/top/sub1')
+        >>> r.get(top, "..")
+        Traceback (most recent call last):
+          ...
+        anytree.resolver.ResolverError: Node('/top') has no parent.
         >>> r.get(sub1, "")
         Node('/top/sub1')
         >>> r.get(top, "sub2")
@@ -69,19 +89,86 @@ class Resolver(object):
         node, parts = self.__start(node, path)
         for part in parts:
             if part == "..":
-                node = node.parent
+                node = self.__parent(node)
             elif part in ("", "."):
                 pass
             else:
                 node = self.__get(node, part)
         return node
 
+    def get_many(self, node, paths):
+        """
+        Return list with the instances at `paths`, in the order of `paths`.
+
+        Behaves like :any:`get` for every path, but resolves shared path prefixes just once.
+        A path failing to resolve results in its :any:`ResolverError` instead of raising it.
+
+        >>> from anytree import Node
+        >>> top = Node("top", parent=None)
+        >>> sub0 = Node("sub0", parent=top)
+        >>> sub0sub0 = Node("sub0sub0", parent=sub0)
+        >>> sub0sub1 = Node("sub0sub1", parent=sub0)
+        >>> sub1 = Node("sub1", parent=top)
+        >>> r = Resolver('name')
+        >>> for item in r.get_many(top, ["sub0/sub0sub1", "sub0/sub0sub0", "sub2/sub0", "../sub0", "/top/sub1"]):
+        ...     print(repr(item))
+        Node('/top/sub0/sub0sub1')
+        Node('/top/sub0/sub0sub0')
+        ChildResolverError("Node('/top') has no child sub2. Children are: 'sub0', 'sub1'.")
+        ResolverError("Node('/top') has no parent.")
+        Node('/top/sub1')
+        """
+        # tree of resolved path elements per start node: part -> [node or error, subtree]
+        tries = {}
+        results = []
+        for path in paths:
+            try:
+                start, parts = self.__start(node, path)
+            except ResolverError as exc:
+                results.append(exc)
+                continue
+            item, trie = tries.setdefault(id(start), [start, {}])
+            for part in parts:
+                try:
+                    item, trie = trie[part]
+                except KeyError:
+                    entry = trie[part] = [self.__step(item, part), {}]
+                    item, trie = entry
+                if isinstance(item, ResolverError):
+                    break
+            results.append(item)
+        return results
+
+    def __step(self, node, part):
+        try:
+            if part == "..":
+                return self.__parent(node)
+            elif part in ("", "."):
+                return node
+            return self.__get(node, part)
+        except ResolverError as exc:
+            return exc
+
+    @staticmethod
+    def __parent(node):
+        parent = node.parent
+        if parent is None:
+            raise ResolverError(node, "..", "%r has no parent." % (node,))
+        return parent
+
     def __get(self, node, name):
-        for child in node.children:
-            if _getattr(child, self.pathattr) == name:
-                return child
+        for child in self.__children(node, name):
+            return child
         raise ChildResolverError(node, name, self.pathattr)
 
+    def __children(self, node, name):
+        pathattr = self.pathattr
+        childmap = node._child_map(pathattr)
+        if childmap is None:
+            # renames are not noticed
+            return (child for child in node.children if _getattr(child, pathattr) == name)
+        return childmap.get(name, ())
+
     def glob(self, node, path):
         """
         Return instances at `path` supporting wildcards.
@@ -91,6 +178,8 @@ class Resolver(object):
 
         * `*` matches any characters, except '/'.
         * `?` matches a single character, except '/'.
+        * `[seq]` matches any character in `seq`, `[!seq]` any character not in `seq`.
+        * `**` as path element matches the node and all its descendants. Matches below `**` are returned in pre-order.
 
         An example module tree:
 
@@ -116,6 +205,10 @@ class Resolver(object):
         [Node('/top/sub0/sub0'), Node('/top/sub0/sub1'), Node('/top/sub1/sub0')]
         >>> r.glob(top, "*/sub0")
         [Node('/top/sub0/sub0'), Node('/top/sub1/sub0')]
+        >>> r.glob(top, "sub[!0]/sub[0-9]")
+        [Node('/top/sub1/sub0')]
+        >>> r.glob(top, "**/sub1")
+        [Node('/top/sub0/sub1'), Node('/top/sub1')]
         >>> r.glob(top, "sub1/sub1")
         Traceback (most recent call last):
             ...
@@ -143,8 +236,31 @@ class Resolver(object):
           ...
         anytree.resolver.ResolverError: unknown root node '/bar'. root is '/top'.
         """
+        return list(self.iglob(node, path))
+
+    def iglob(self, node, path):
+        """
+        Iterate over the instances at `path` supporting wildcards.
+
+        Behaves identical to :any:`glob`, but returns an iterator yielding the found nodes one by one.
+
+        >>> from anytree import Node
+        >>> top = Node("top", parent=None)
+        >>> sub0 = Node("sub0", parent=top)
+        >>> sub0sub0 = Node("sub0", parent=sub0)
+        >>> sub1 = Node("sub1", parent=top)
+        >>> r = Resolver('name')
+        >>> nodes = r.iglob(top, "**")
+        >>> next(nodes)
+        Node('/top')
+        >>> next(nodes)
+        Node('/top/sub0')
+
+        The compiled paths are cached.
+        Path elements without wildcards are looked up via the hashed child map like :any:`get`.
+        """
         node, parts = self.__start(node, path)
-        return self.__glob(node, parts)
+        return self.__iglob(node, Resolver.__compile(parts))
 
     def __start(self, node, path):
         sep = node.separator
@@ -162,64 +278,168 @@ class Resolver(object):
             parts.pop(0)
         return node, parts
 
-    def __glob(self, node, parts):
-        nodes = []
-        name = parts[0]
-        remainder = parts[1:]
-        # handle relative
-        if name == "..":
-            nodes += self.__glob(node.parent, remainder)
-        elif name in ("", "."):
-            nodes += self.__glob(node, remainder)
-        else:
-            matches = self.__find(node, name, remainder)
-            if not matches and not Resolver.is_wildcard(name):
-                raise ChildResolverError(node, name, self.pathattr)
-            nodes += matches
-        return nodes
-
-    def __find(self, node, pat, remainder):
-        matches = []
-        for child in node.children:
-            name = _getattr(child, self.pathattr)
-            try:
-                if Resolver.__match(name, pat):
-                    if remainder:
-                        matches += self.__glob(child, remainder)
-                    else:
-                        matches.append(child)
-            except ResolverError as exc:
-                if not Resolver.is_wildcard(pat):
-                    raise exc
-        return matches
+    def __iglob(self, node, steps, idx=0, strict=True, descend=True):
+        pathattr = self.pathattr
+        laststep = len(steps)
+        # pending nodes in reversed order: node, step index, no wildcard passed so far
+        stack = [(node, idx, strict)]
+        while stack:
+            node, idx, strict = stack.pop()
+            if idx == laststep:
+                yield node
+                continue
+            kind, arg = steps[idx]
+            if kind == _PARENT:
+                if node.parent is not None:
+                    stack.append((node.parent, idx + 1, strict))
+                elif strict:
+                    self.__parent(node)  # raises
+            elif kind == _SELF:
+                stack.append((node, idx + 1, strict))
+            elif kind == _LITERAL:
+                children = list(self.__children(node, arg))
+                if not children and strict:
+                    raise ChildResolverError(node, arg, pathattr)
+                stack.extend([(child, idx + 1, strict) for child in reversed(children)])
+            elif kind == _PATTERN:
+                stack.extend([(child, idx + 1, False) for child in reversed(node.children)
+                              if _match(arg, _getattr(child, pathattr))])
+            elif not descend:
+                # the node itself first, the subtrees of the children afterwards
+                stack.extend([(child, idx, False) for child in reversed(node.children)])
+                stack.append((node, idx + 1, False))
+            elif any([step[0] == _PARENT for step in steps[idx:]]):
+                # '..' might leave the subtree again: collect and order the matches
+                found = {}
+                for item in self.__iglob(node, steps, idx, False, False):
+                    found.setdefault(id(item), item)
+                for item in sorted(found.values(), key=_preorder_key):
+                    yield item
+            else:
+                for item in self.__descend(node, steps, idx):
+                    yield item
+
+    def __descend(self, node, steps, idx):
+        # walk the subtree in pre-order, tracking the step indices reached at every node
+        pathattr = self.pathattr
+        laststep = len(steps)
+        stack = [(node, _closure(steps, [idx]))]
+        while stack:
+            node, reached = stack.pop()
+            if laststep in reached:
+                yield node
+            recursive = [idx for idx in reached if idx < laststep and steps[idx][0] == _RECURSIVE]
+            matching = [steps[idx] + (idx,) for idx in reached
+                        if idx < laststep and steps[idx][0] in (_LITERAL, _PATTERN)]
+            if not recursive and not matching:
+                continue
+            pending = []
+            for child in node.children:
+                name = _getattr(child, pathattr)
+                nxt = list(recursive)
+                for kind, arg, idx in matching:
+                    if (name == arg) if kind == _LITERAL else _match(arg, name):
+                        nxt.append(idx + 1)
+                if nxt:
+                    pending.append((child, _closure(steps, nxt)))
+            stack.extend(reversed(pending))
 
     @staticmethod
     def is_wildcard(path):
         """Return `True` is a wildcard."""
-        return "?" in path or "*" in path
+        return "?" in path or "*" in path or "[" in path
 
     @staticmethod
-    def __match(name, pat):
+    def __compile(parts):
+        key = tuple(parts)
+        cache = Resolver._match_cache
         try:
-            re_pat = Resolver._match_cache[pat]
+            steps = cache.pop(key)
         except KeyError:
-            res = Resolver.__translate(pat)
-            if len(Resolver._match_cache) >= _MAXCACHE:
-                Resolver._match_cache.clear()
-            Resolver._match_cache[pat] = re_pat = re.compile(res)
-        return re_pat.match(name) is not None
+            while cache and len(cache) >= _MAXCACHE:
+                cache.popitem(last=False)
+            steps = tuple([Resolver.__compile_part(part) for part in parts])
+        cache[key] = steps
+        return steps
+
+    @staticmethod
+    def __compile_part(part):
+        if part == "..":
+            return _PARENT, None
+        elif part in ("", "."):
+            return _SELF, None
+        elif part == "**":
+            return _RECURSIVE, None
+        elif Resolver.is_wildcard(part):
+            return _PATTERN, re.compile(Resolver.__translate(part), re.DOTALL).match
+        else:
+            return _LITERAL, part
 
     @staticmethod
     def __translate(pat):
-        re_pat = ''
-        for char in pat:
+        re_pat = []
+        idx, end = 0, len(pat)
+        while idx < end:
+            char = pat[idx]
+            idx += 1
             if char == "*":
-                re_pat += ".*"
+                re_pat.append(".*")
             elif char == "?":
-                re_pat += "."
+                re_pat.append(".")
+            elif char == "[":
+                stop = idx
+                if stop < end and pat[stop] == "!":
+                    stop += 1
+                if stop < end and pat[stop] == "]":
+                    stop += 1
+                while stop < end and pat[stop] != "]":
+                    stop += 1
+                if stop >= end:
+                    # unclosed
+                    re_pat.append(re.escape(char))
+                else:
+                    seq = Resolver.__translate_set(pat[idx:stop])
+                    idx = stop + 1
+                    re_pat.append(seq)
             else:
-                re_pat += re.escape(char)
-        return re_pat + r'\Z(?ms)'
+                re_pat.append(re.escape(char))
+        return "".join(re_pat) + r"\Z"
+
+    @staticmethod
+    def __translate_set(seq):
+        # like `fnmatch.translate`: ranges are kept, `-`, `[`, `&`, `~` and `|` are escaped otherwise,
+        # as `--`, `&&`, `~~`, `||` and nested sets are reserved for set operations
+        chunks = []
+        start = 0
+        idx = 2 if seq.startswith("!") else 1
+        while True:
+            idx = seq.find("-", idx)
+            if idx < 0:
+                break
+            chunks.append(seq[start:idx])
+            start = idx + 1
+            idx += 3
+        chunk = seq[start:]
+        if chunk:
+            chunks.append(chunk)
+        else:
+            chunks[-1] += "-"
+        # empty ranges are invalid
+        for idx in range(len(chunks) - 1, 0, -1):
+            if chunks[idx - 1][-1] > chunks[idx][0]:
+                chunks[idx - 1] = chunks[idx - 1][:-1] + chunks[idx][1:]
+                del chunks[idx]
+        seq = "-".join([re.sub(r"([-\\\[&~|])", r"\\\1", chunk) for chunk in chunks])
+        if not seq:
+            # empty set matches nothing
+            return "(?!)"
+        if seq == "!":
+            return "."
+        if seq.startswith("!"):
+            seq = "^" + seq[1:]
+        elif seq.startswith("^"):
+            seq = "\\" + seq
+        return "[%s]" % seq
 
 
 class ResolverError(RuntimeError):
@@ -243,3 +463,23 @@ class ChildResolverError(ResolverError):
 
 def _getattr(node, name):
     return getattr(node, name, None)
+
+
+def _closure(steps, reached):
+    # step indices reached without consuming a path element
+    reached = set(reached)
+    pending = list(reached)
+    while pending:
+        idx = pending.pop()
+        if idx < len(steps) and steps[idx][0] in (_SELF, _RECURSIVE) and idx + 1 not in reached:
+            reached.add(idx + 1)
+            pending.append(idx + 1)
+    return reached
+
+
+def _preorder_key(node):
+    return tuple([item.parent._child_positions()[id(item)] for item in node.path[1:]])
+
+
+def _match(match, name):
+    return isinstance(name, six.string_types) and match(name) is not None
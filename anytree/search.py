@@ -1,9 +1,37 @@
 """Node Searching."""
 
+import heapq
+import itertools
+import numbers
+import operator
+
+from anytree.index import AbstractIndex
+from anytree.index import BloomIndex
+from anytree.index import RangeIndex
+from anytree.index import TreeIndex
+from anytree.iterators import BestFirstIter
+from anytree.iterators import LevelOrderIter
 from anytree.iterators import PreOrderIter
 
+_MAXPREVIEW = 10
 
-def findall(node, filter_=None, stop=None, maxlevel=None, mincount=None, maxcount=None):
+_MISSING = object()
+
+_LOOKUPS = {
+    "eq": operator.eq,
+    "ne": operator.ne,
+    "lt": operator.lt,
+    "le": operator.le,
+    "gt": operator.gt,
+    "ge": operator.ge,
+    "in": lambda value, other: value in other,
+    "contains": operator.contains,
+    "startswith": lambda value, other: value.startswith(other),
+    "endswith": lambda value, other: value.endswith(other),
+}
+
+
+def findall(node, filter_=None, stop=None, maxlevel=None, mincount=None, maxcount=None, children=None):
     """
     Search nodes matching `filter_` but stop at `maxlevel` or `stop`.
 
@@ -18,6 +46,7 @@ def findall(node, filter_=None, stop=None, maxlevel=None, mincount=None, maxcoun
         maxlevel (int): maximum decending in the node hierarchy.
         mincount (int): minimum number of nodes.
         maxcount (int): maximum number of nodes.
+        children: function returning the sequence of child nodes of a node.
 
     Example tree:
 
@@ -47,22 +76,31 @@ def findall(node, filter_=None, stop=None, maxlevel=None, mincount=None, maxcoun
     >>> findall(f, filter_=lambda node: d in node.path)
     (Node('/f/b/d'), Node('/f/b/d/c'), Node('/f/b/d/e'))
 
-    The number of matches can be limited:
+    See :any:`ifindall` to iterate over the matching nodes instead.
+
+    A :any:`Q` query as `filter_` limits `maxlevel` by its depth constraints
+    and uses a :any:`TreeIndex` if available:
+
+    >>> findall(f, filter_=Q(name__in="bcd") & Q(depth__le=2))
+    (Node('/f/b'), Node('/f/b/d'))
+
+    The number of matches can be limited.
+    The search stops at the first match exceeding `maxcount`:
 
     >>> findall(f, filter_=lambda node: d in node.path, mincount=4)  # doctest: +ELLIPSIS
     Traceback (most recent call last):
       ...
     anytree.search.CountError: Expecting at least 4 elements, but found 3. ... Node('/f/b/d/e'))
-    >>> findall(f, filter_=lambda node: d in node.path, maxcount=2)  # doctest: +ELLIPSIS
+    >>> findall(f, filter_=lambda node: d in node.path, maxcount=1)  # doctest: +ELLIPSIS
     Traceback (most recent call last):
       ...
-    anytree.search.CountError: Expecting 2 elements at maximum, but found 3. ... Node('/f/b/d/e'))
+    anytree.search.CountError: Expecting 1 elements at maximum, but found at least 2. ... Node('/f/b/d/c'))
     """
     return _findall(node, filter_=filter_, stop=stop,
-                    maxlevel=maxlevel, mincount=mincount, maxcount=maxcount)
+                    maxlevel=maxlevel, mincount=mincount, maxcount=maxcount, children=children)
 
 
-def findall_by_attr(node, value, name="name", maxlevel=None, mincount=None, maxcount=None):
+def findall_by_attr(node, value, name="name", maxlevel=None, mincount=None, maxcount=None, children=None):
     """
     Search nodes with attribute `name` having `value` but stop at `maxlevel`.
 
@@ -77,6 +115,7 @@ def findall_by_attr(node, value, name="name", maxlevel=None, mincount=None, maxc
         maxlevel (int): maximum decending in the node hierarchy.
         mincount (int): minimum number of nodes.
         maxcount (int): maximum number of nodes.
+        children: function returning the sequence of child nodes of a node.
 
     Example tree:
 
@@ -103,12 +142,151 @@ def findall_by_attr(node, value, name="name", maxlevel=None, mincount=None, maxc
 
     >>> findall_by_attr(f, "d")
     (Node('/f/b/d'),)
+
+    See :any:`ifindall_by_attr` to iterate over the matching nodes instead.
+
+    A :any:`TreeIndex` on `name` covering `node` is used instead of visiting all nodes.
+    Otherwise a :any:`BloomIndex` on `name` skips subtrees not containing `value`.
+    """
+    return _collect(_iter_by_attr(node, value, name, maxlevel, children), mincount, maxcount)
+
+
+def ifindall(node, filter_=None, stop=None, maxlevel=None, mincount=None, maxcount=None, children=None):
+    """
+    Iterate over nodes matching `filter_` but stop at `maxlevel` or `stop`.
+
+    Like :any:`findall`, but the matching nodes are returned one by one while searching.
+    The `mincount` and `maxcount` checks are done while iterating,
+    the :any:`CountError` is raised at the first match exceeding `maxcount`
+    or at the end of the iteration.
+
+    Args:
+        node: top node, start searching.
+
+    Keyword Args:
+        filter_: function called with every `node` as argument, `node` is returned if `True`.
+        stop: stop iteration at `node` if `stop` function returns `True` for `node`.
+        maxlevel (int): maximum decending in the node hierarchy.
+        mincount (int): minimum number of nodes.
+        maxcount (int): maximum number of nodes.
+        children: function returning the sequence of child nodes of a node.
+
+    Example tree:
+
+    >>> from anytree import Node, RenderTree, AsciiStyle
+    >>> f = Node("f")
+    >>> b = Node("b", parent=f)
+    >>> a = Node("a", parent=b)
+    >>> d = Node("d", parent=b)
+    >>> c = Node("c", parent=d)
+    >>> e = Node("e", parent=d)
+    >>> print(RenderTree(f, style=AsciiStyle()).by_attr())
+    f
+    +-- b
+        |-- a
+        +-- d
+            |-- c
+            +-- e
+
+    >>> nodes = ifindall(f, filter_=lambda node: node.is_leaf, maxcount=2)
+    >>> next(nodes)
+    Node('/f/b/a')
+    >>> next(nodes)
+    Node('/f/b/d/c')
+    >>> next(nodes)  # doctest: +ELLIPSIS
+    Traceback (most recent call last):
+      ...
+    anytree.search.CountError: Expecting 2 elements at maximum, but found at least 3. ... Node('/f/b/d/e'))
     """
-    return _findall(node, filter_=lambda n: _filter_by_name(n, name, value),
-                    maxlevel=maxlevel, mincount=mincount, maxcount=maxcount)
+    return _icount(_iterall(node, filter_, stop, maxlevel, children), mincount, maxcount)
+
+
+def ifindall_by_attr(node, value, name="name", maxlevel=None, mincount=None, maxcount=None, children=None):
+    """
+    Iterate over nodes with attribute `name` having `value` but stop at `maxlevel`.
+
+    Like :any:`findall_by_attr`, but the matching nodes are returned one by one while searching.
+    The `mincount` and `maxcount` checks are done while iterating.
+
+    Args:
+        node: top node, start searching.
+        value: value which need to match
+
+    Keyword Args:
+        name (str): attribute name need to match
+        maxlevel (int): maximum decending in the node hierarchy.
+        mincount (int): minimum number of nodes.
+        maxcount (int): maximum number of nodes.
+        children: function returning the sequence of child nodes of a node.
+
+    >>> from anytree import Node
+    >>> f = Node("f")
+    >>> b = Node("b", parent=f, kind="dir")
+    >>> a = Node("a", parent=b, kind="file")
+    >>> g = Node("g", parent=f, kind="file")
+    >>> nodes = ifindall_by_attr(f, "file", name="kind")
+    >>> next(nodes)
+    Node('/f/b/a', kind='file')
+    >>> next(nodes)
+    Node('/f/g', kind='file')
+    """
+    return _icount(_iter_by_attr(node, value, name, maxlevel, children), mincount, maxcount)
+
+
+def findall_by_range(node, name, lo=None, hi=None, maxlevel=None, mincount=None, maxcount=None, children=None):
+    """
+    Search nodes with attribute `name` between `lo` and `hi` but stop at `maxlevel`.
+
+    Return tuple with matching nodes.
+
+    Args:
+        node: top node, start searching.
+        name (str): attribute name need to match
+
+    Keyword Args:
+        lo: lower limit (inclusive), unlimited if `None`.
+        hi: upper limit (inclusive), unlimited if `None`.
+        maxlevel (int): maximum decending in the node hierarchy.
+        mincount (int): minimum number of nodes.
+        maxcount (int): maximum number of nodes.
+        children: function returning the sequence of child nodes of a node.
 
+    Example tree:
 
-def find(node, filter_=None, stop=None, maxlevel=None):
+    >>> from anytree import Node, RenderTree, AsciiStyle
+    >>> f = Node("f", size=10)
+    >>> b = Node("b", parent=f, size=25)
+    >>> a = Node("a", parent=b, size=20)
+    >>> d = Node("d", parent=b)
+    >>> g = Node("g", parent=f, size=40)
+    >>> print(RenderTree(f, style=AsciiStyle()).by_attr())
+    f
+    |-- b
+    |   |-- a
+    |   +-- d
+    +-- g
+
+    >>> findall_by_range(f, "size", 20, 30)
+    (Node('/f/b', size=25), Node('/f/b/a', size=20))
+    >>> findall_by_range(f, "size", lo=25)
+    (Node('/f/b', size=25), Node('/f/g', size=40))
+
+    A :any:`RangeIndex` on `name` covering `node` is used instead of visiting all nodes.
+    """
+    if children is None:
+        index = RangeIndex.lookup(node, name)
+        if index is not None:
+            try:
+                result = index.range(lo, hi, node=node, maxlevel=maxlevel)
+            except TypeError:
+                pass
+            else:
+                return _checkcount(result, mincount, maxcount)
+    return _findall(node, filter_=lambda n: _filter_by_range(n, name, lo, hi),
+                    maxlevel=maxlevel, mincount=mincount, maxcount=maxcount, children=children)
+
+
+def find(node, filter_=None, stop=None, maxlevel=None, children=None, shallowest=False):
     """
     Search for *single* node matching `filter_` but stop at `maxlevel` or `stop`.
 
@@ -121,6 +299,9 @@ def find(node, filter_=None, stop=None, maxlevel=None):
         filter_: function called with every `node` as argument, `node` is returned if `True`.
         stop: stop iteration at `node` if `stop` function returns `True` for `node`.
         maxlevel (int): maximum decending in the node hierarchy.
+        children: function returning the sequence of child nodes of a node.
+        shallowest (bool): search level by level and return the first match,
+                           without checking for any further match.
 
     Example tree:
 
@@ -148,15 +329,17 @@ def find(node, filter_=None, stop=None, maxlevel=None):
     >>> find(f, lambda node: node.name == "d")
     Node('/f/b/d')
     >>> find(f, lambda node: node.name == "z")
-    >>> find(f, lambda node: b in node.path)  # doctest: +ELLIPSIS
+    >>> find(f, lambda node: b in node.path)
     Traceback (most recent call last):
         ...
-    anytree.search.CountError: Expecting 1 elements at maximum, but found 5. (Node('/f/b')... Node('/f/b/d/e'))
+    anytree.search.CountError: Expecting 1 elements at maximum, but found at least 2. (Node('/f/b'), Node('/f/b/a'))
+    >>> find(f, lambda node: node.name in ("b", "c", "i"), shallowest=True)
+    Node('/f/b')
     """
-    return _find(node, filter_=filter_, stop=stop, maxlevel=maxlevel)
+    return _find(node, filter_=filter_, stop=stop, maxlevel=maxlevel, children=children, shallowest=shallowest)
 
 
-def find_by_attr(node, value, name="name", maxlevel=None):
+def find_by_attr(node, value, name="name", maxlevel=None, children=None, shallowest=False):
     """
     Search for *single* node with attribute `name` having `value` but stop at `maxlevel`.
 
@@ -170,6 +353,9 @@ def find_by_attr(node, value, name="name", maxlevel=None):
     Keyword Args:
         name (str): attribute name need to match
         maxlevel (int): maximum decending in the node hierarchy.
+        children: function returning the sequence of child nodes of a node.
+        shallowest (bool): search level by level and return the first match,
+                           without checking for any further match.
 
     Example tree:
 
@@ -199,28 +385,461 @@ def find_by_attr(node, value, name="name", maxlevel=None):
     >>> find_by_attr(f, name="foo", value=4)
     Node('/f/b/d/c', foo=4)
     >>> find_by_attr(f, name="foo", value=8)
+
+    A :any:`TreeIndex` on `name` covering `node` is used instead of visiting all nodes.
+    Otherwise a :any:`BloomIndex` on `name` skips subtrees not containing `value`.
     """
-    return _find(node, filter_=lambda n: _filter_by_name(n, name, value),
-                 maxlevel=maxlevel)
+    index = _get_index(node, name, value, children)
+    if index is not None:
+        items = index.get(value, node=node, maxlevel=maxlevel, shallowest=shallowest)
+        items = _checkcount(items, None, 1)
+        return items[0] if items else None
+    return _find(node, filter_=lambda n: _filter_by_name(n, name, value), stop=_get_prune(node, name, value, children),
+                 maxlevel=maxlevel, children=children, shallowest=shallowest)
+
+
+def topk(node, key, k, bound=None, filter_=None, stop=None, maxlevel=None, children=None):
+    """
+    Search the `k` nodes with the highest `key`.
+
+    Return tuple with matching nodes, highest `key` first.
+
+    Args:
+        node: top node, start searching.
+        key: function returning the numeric score of a node.
+        k (int): number of nodes.
+
+    Keyword Args:
+        bound: function returning an upper limit of the score of all nodes in the subtree of a node.
+        filter_: function called with every `node` as argument, `node` is returned if `True`.
+        stop: stop iteration at `node` if `stop` function returns `True` for `node`.
+        maxlevel (int): maximum decending in the node hierarchy.
+        children: function returning the sequence of child nodes of a node.
+
+    Without `bound` all nodes are visited. With an admissible `bound` the nodes are
+    searched by :any:`BestFirstIter`, which stops as soon as no remaining subtree can beat the `k`-th node.
+
+    Example tree:
+
+    >>> from anytree import Node, RenderTree, AsciiStyle
+    >>> f = Node("f", size=20)
+    >>> b = Node("b", parent=f, size=12)
+    >>> a = Node("a", parent=b, size=3)
+    >>> d = Node("d", parent=b, size=8)
+    >>> c = Node("c", parent=d, size=2)
+    >>> e = Node("e", parent=d, size=5)
+    >>> g = Node("g", parent=f, size=7)
+    >>> print(RenderTree(f, style=AsciiStyle()).by_attr())
+    f
+    |-- b
+    |   |-- a
+    |   +-- d
+    |       |-- c
+    |       +-- e
+    +-- g
 
+    >>> topk(f, lambda n: n.size, 3, filter_=lambda n: n.is_leaf)
+    (Node('/f/g', size=7), Node('/f/b/d/e', size=5), Node('/f/b/a', size=3))
 
-def _find(node, filter_, stop=None, maxlevel=None):
-    items = _findall(node, filter_, stop=stop, maxlevel=maxlevel, maxcount=1)
+    The `size` of a node is never smaller than the `size` of its descendants,
+    so the `size` of a node is a bound for its whole subtree:
+
+    >>> topk(f, lambda n: n.size, 3, bound=lambda n: n.size, filter_=lambda n: n.is_leaf)
+    (Node('/f/g', size=7), Node('/f/b/d/e', size=5), Node('/f/b/a', size=3))
+    """
+    if bound is None:
+        nodes = PreOrderIter(node, filter_=filter_, stop=stop, maxlevel=maxlevel, children=children)
+        return tuple(heapq.nlargest(k, nodes, key=key))
+    else:
+        nodes = BestFirstIter(node, key, bound=bound, filter_=filter_, stop=stop, maxlevel=maxlevel,
+                              children=children)
+        return tuple(itertools.islice(nodes, k))
+
+
+class Q(object):
+
+    def __init__(self, **kwargs):
+        """
+        Declarative query on node attributes.
+
+        Every keyword argument `<attr>__<lookup>=<value>` describes one condition on the attribute `<attr>`.
+        Multiple conditions must match all. The lookup defaults to `eq`.
+
+        ============== =====================================
+        Lookup         Condition
+        ============== =====================================
+        `eq`           `node.<attr> == value`
+        `ne`           `node.<attr> != value`
+        `lt`           `node.<attr> < value`
+        `le`           `node.<attr> <= value`
+        `gt`           `node.<attr> > value`
+        `ge`           `node.<attr> >= value`
+        `in`           `node.<attr> in value`
+        `contains`     `value in node.<attr>`
+        `startswith`   `node.<attr>.startswith(value)`
+        `endswith`     `node.<attr>.endswith(value)`
+        ============== =====================================
+
+        Nodes without `<attr>` never match a condition.
+        Queries are combined by `&`, `|` and inverted by `~`.
+        A query is a `filter_` for all search functions and iterators.
+
+        >>> from anytree import Node, RenderTree, AsciiStyle
+        >>> f = Node("f", kind="dir")
+        >>> b = Node("b", parent=f, kind="dir")
+        >>> a = Node("a", parent=b, kind="file", size=300)
+        >>> d = Node("d", parent=b, kind="dir")
+        >>> c = Node("c", parent=d, kind="file", size=5000)
+        >>> g = Node("g", parent=f, kind="file", size=2000)
+        >>> print(RenderTree(f, style=AsciiStyle()).by_attr())
+        f
+        |-- b
+        |   |-- a
+        |   +-- d
+        |       +-- c
+        +-- g
+
+        >>> query = Q(kind="file") & Q(size__gt=1000)
+        >>> query
+        Q(kind='file') & Q(size__gt=1000)
+        >>> findall(f, filter_=query)
+        (Node('/f/b/d/c', kind='file', size=5000), Node('/f/g', kind='file', size=2000))
+        >>> findall(f, filter_=query & Q(depth__le=2))
+        (Node('/f/g', kind='file', size=2000),)
+        >>> [node.name for node in findall(f, filter_=~Q(kind="file") | Q(name="a"))]
+        ['f', 'b', 'a', 'd']
+
+        :any:`explain` shows how a search is executed:
+
+        >>> print((query & Q(depth__le=2)).explain(f))
+        plan: pre-order scan
+        maxlevel: 3
+        filter: Q(kind='file') & Q(size__gt=1000)
+        visits: at most 6
+        >>> from anytree import TreeIndex
+        >>> index = TreeIndex(f, "kind")
+        >>> print(query.explain(f))
+        plan: index lookup kind == 'file'
+        maxlevel: None
+        filter: Q(size__gt=1000)
+        visits: 3
+        """
+        conditions = tuple([Q.__condition(key, value) for key, value in sorted(kwargs.items())])
+        if len(conditions) == 1:
+            self._op, self._args = "cmp", conditions[0]._args
+        else:
+            self._op, self._args = "and", conditions
+        self._func = None
+
+    @staticmethod
+    def _new(op, args):
+        query = Q.__new__(Q)
+        query._op = op
+        query._args = args
+        query._func = None
+        return query
+
+    @staticmethod
+    def __condition(key, value):
+        attr, _, lookup = key.rpartition("__")
+        if not attr or lookup not in _LOOKUPS:
+            attr, lookup = key, "eq"
+        return Q._new("cmp", (attr, lookup, value))
+
+    def _terms(self, op):
+        return self._args if self._op == op else (self,)
+
+    def __and__(self, other):
+        if not isinstance(other, Q):
+            return NotImplemented
+        return Q._new("and", self._terms("and") + other._terms("and"))
+
+    def __or__(self, other):
+        if not isinstance(other, Q):
+            return NotImplemented
+        return Q._new("or", self._terms("or") + other._terms("or"))
+
+    def __invert__(self):
+        if self._op == "not":
+            return self._args[0]
+        return Q._new("not", (self,))
+
+    def __call__(self, node):
+        """Return `True` if `node` matches."""
+        return self.compile()(node)
+
+    def compile(self):
+        """Return function called with `node`, returning `True` if `node` matches."""
+        if self._func is None:
+            self._func = self.__compile()
+        return self._func
+
+    def __compile(self):
+        op, args = self._op, self._args
+        if op == "cmp":
+            return Q.__compile_condition(*args)
+        elif op == "not":
+            func = args[0].compile()
+            return lambda node: not func(node)
+        funcs = tuple([query.compile() for query in args])
+        if len(funcs) == 1:
+            return funcs[0]
+        elif op == "and":
+            if not funcs:
+                return lambda node: True
+
+            def match(node):
+                for func in funcs:
+                    if not func(node):
+                        return False
+                return True
+        else:
+            def match(node):
+                for func in funcs:
+                    if func(node):
+                        return True
+                return False
+        return match
+
+    @staticmethod
+    def __compile_condition(attr, lookup, value):
+        if lookup == "eq":
+            def match(node):
+                return getattr(node, attr, _MISSING) == value
+        else:
+            compare = _LOOKUPS[lookup]
+
+            def match(node):
+                try:
+                    return bool(compare(getattr(node, attr), value))
+                except (AttributeError, TypeError):
+                    return False
+        return match
+
+    def explain(self, node, maxlevel=None, stop=None, children=None):
+        """
+        Return description of the search plan for `node`.
+
+        The description contains the chosen strategy, the resulting `maxlevel`,
+        the remaining filter and the number of nodes to be visited.
+        The plan is made from the index estimates and the subtree sizes (:any:`subtree_size`),
+        without visiting any node. Scans restricted by `maxlevel` or `stop` show an upper limit.
+        """
+        return str(_QueryPlan(self, node, maxlevel=maxlevel, stop=stop, children=children))
+
+    def __repr__(self):
+        op, args = self._op, self._args
+        if op == "cmp":
+            attr, lookup, value = args
+            key = attr if lookup == "eq" else "%s__%s" % (attr, lookup)
+            return "Q(%s=%r)" % (key, value)
+        elif op == "not":
+            return "~%s" % args[0].__repr_term()
+        elif not args:
+            return "Q()"
+        sep = " & " if op == "and" else " | "
+        return sep.join([query.__repr_term() for query in args])
+
+    def __repr_term(self):
+        if self._op in ("and", "or") and len(self._args) > 1:
+            return "(%r)" % self
+        return repr(self)
+
+
+class _QueryPlan(object):
+
+    def __init__(self, query, node, maxlevel=None, stop=None, children=None):
+        terms = list(query._terms("and"))
+        maxlevel = _limit_maxlevel(terms, node, maxlevel, children)
+        # index with the fewest estimated candidates
+        self.index = self.term = self.candidates = None
+        if children is None and stop is None:
+            indexes = [observer for observer in _iter_observers(node) if isinstance(observer, AbstractIndex)]
+            best = None
+            for term in terms:
+                if term._op == "cmp":
+                    attr, lookup, value = term._args
+                    for index in indexes:
+                        if index.attr == attr:
+                            estimate = index._estimate(lookup, value)
+                            if estimate is not None and (best is None or estimate < best):
+                                self.index, self.term, best = index, term, estimate
+            if self.term is not None:
+                terms.remove(self.term)
+                _, lookup, value = self.term._args
+                self.candidates = self.index._lookup(lookup, value)
+        # bloom filters skip subtrees
+        self.pruned = []
+        if self.index is None and children is None:
+            prunes = []
+            for term in terms:
+                if term._op == "cmp" and term._args[1] == "eq":
+                    attr, _, value = term._args
+                    prune = _get_prune(node, attr, value, children)
+                    if prune is not None:
+                        self.pruned.append(attr)
+                        prunes.append(prune)
+            if stop is not None:
+                prunes.append(stop)
+            if prunes:
+                stop = prunes[0] if len(prunes) == 1 else lambda n: any([prune(n) for prune in prunes])
+        self.node = node
+        self.maxlevel = maxlevel
+        self.stop = stop
+        self.children = children
+        self.filter = Q._new("and", tuple(terms))
+
+    def __iter__(self):
+        filter_ = self.filter.compile() if self.filter._args else None
+        if self.index is not None:
+            nodes = self.index._preorder(self.candidates, self.node, maxlevel=self.maxlevel)
+            if filter_ is None:
+                return iter(nodes)
+            return (node for node in nodes if filter_(node))
+        return iter(PreOrderIter(self.node, filter_=filter_, stop=self.stop, maxlevel=self.maxlevel,
+                                 children=self.children))
+
+    def visits(self):
+        """Number of visited nodes, an upper limit if the scan is restricted or `None` if unknown."""
+        if self.index is not None:
+            return len(self.candidates)
+        if self.children is not None:
+            return None
+        return self.node.subtree_size
+
+    def __str__(self):
+        if self.index is not None:
+            attr, lookup, value = self.term._args
+            plan = "index lookup %s %s %r" % (attr, "==" if lookup == "eq" else lookup, value)
+        else:
+            plan = "pre-order scan"
+            if self.pruned:
+                plan += ", pruned by bloom filter on %s" % ", ".join(self.pruned)
+        return "\n".join([
+            "plan: %s" % plan,
+            "maxlevel: %s" % self.maxlevel,
+            "filter: %r" % self.filter,
+            "visits: %s" % self.__visits(),
+        ])
+
+    def __visits(self):
+        visits = self.visits()
+        if visits is None:
+            return "unknown"
+        elif self.index is None and (self.stop is not None or self.maxlevel is not None):
+            return "at most %d" % visits
+        return "%d" % visits
+
+
+def _limit_maxlevel(terms, node, maxlevel, children):
+    # depth constraints limit the descending, constraints implied by `maxlevel` are removed from `terms`
+    if children is None and hasattr(node, "depth"):
+        depth = node.depth
+        for term in tuple(terms):
+            if term._op == "cmp":
+                attr, lookup, value = term._args
+                if attr == "depth" and lookup in ("lt", "le", "eq") and isinstance(value, numbers.Integral):
+                    level = max((value - 1 if lookup == "lt" else value) - depth + 1, 0)
+                    maxlevel = level if maxlevel is None else min(maxlevel, level)
+                    if lookup != "eq":
+                        terms.remove(term)
+    return maxlevel
+
+
+def _get_prune(node, name, value, children):
+    # stop function skipping subtrees not containing `value` of attribute `name`
+    if children is None:
+        index = BloomIndex.lookup(node, name)
+        if index is not None:
+            return index._autoprune(value)
+    return None
+
+
+def _iter_observers(node):
+    try:
+        return node._iter_observers()
+    except AttributeError:
+        return ()
+
+
+def _find(node, filter_, stop=None, maxlevel=None, children=None, shallowest=False):
+    if shallowest:
+        if isinstance(filter_, Q):
+            maxlevel = _limit_maxlevel(list(filter_._terms("and")), node, maxlevel, children)
+            filter_ = filter_.compile()
+        for item in LevelOrderIter(node, filter_=filter_, stop=stop, maxlevel=maxlevel, children=children):
+            return item
+        return None
+    items = _findall(node, filter_, stop=stop, maxlevel=maxlevel, maxcount=1, children=children)
     return items[0] if items else None
 
 
-def _findall(node, filter_, stop=None, maxlevel=None, mincount=None, maxcount=None):
-    result = tuple(PreOrderIter(node, filter_, stop, maxlevel))
+def _findall(node, filter_, stop=None, maxlevel=None, mincount=None, maxcount=None, children=None):
+    return _collect(_iterall(node, filter_, stop, maxlevel, children), mincount, maxcount)
+
+
+def _iterall(node, filter_, stop, maxlevel, children):
+    if isinstance(filter_, Q):
+        return iter(_QueryPlan(filter_, node, maxlevel=maxlevel, stop=stop, children=children))
+    return PreOrderIter(node, filter_, stop, maxlevel, children=children)
+
+
+def _iter_by_attr(node, value, name, maxlevel, children):
+    index = _get_index(node, name, value, children)
+    if index is not None:
+        return iter(index.get(value, node=node, maxlevel=maxlevel))
+    return _iterall(node, lambda n: _filter_by_name(n, name, value), _get_prune(node, name, value, children),
+                    maxlevel, children)
+
+
+def _collect(nodes, mincount, maxcount):
+    if maxcount is not None:
+        # stop at the first match exceeding `maxcount`
+        nodes = itertools.islice(nodes, maxcount + 1)
+    return _checkcount(tuple(nodes), mincount, maxcount)
+
+
+def _icount(nodes, mincount, maxcount):
+    # just the first nodes are kept for the error message
+    preview = []
+    count = 0
+    for node in nodes:
+        count += 1
+        if count <= _MAXPREVIEW + 1:
+            preview.append(node)
+        if maxcount is not None and count > maxcount:
+            msg = "Expecting %d elements at maximum, but found at least %d."
+            raise CountError(msg % (maxcount, count), preview)
+        yield node
+    if mincount is not None and count < mincount:
+        msg = "Expecting at least %d elements, but found %d."
+        raise CountError(msg % (mincount, count), preview)
+
+
+def _checkcount(result, mincount, maxcount):
     resultlen = len(result)
+    if maxcount is not None and resultlen > maxcount:
+        msg = "Expecting %d elements at maximum, but found at least %d."
+        raise CountError(msg % (maxcount, resultlen), result)
     if mincount is not None and resultlen < mincount:
         msg = "Expecting at least %d elements, but found %d."
         raise CountError(msg % (mincount, resultlen), result)
-    if maxcount is not None and resultlen > maxcount:
-        msg = "Expecting %d elements at maximum, but found %d."
-        raise CountError(msg % (maxcount, resultlen), result)
     return result
 
 
+def _get_index(node, name, value, children):
+    # index usable for searching `value` of attribute `name` below `node`
+    if children is None:
+        index = TreeIndex.lookup(node, name)
+        if index is not None:
+            try:
+                hash(value)
+            except TypeError:
+                return None
+            return index
+    return None
+
+
 def _filter_by_name(node, name, value):
     try:
         return getattr(node, name) == value
@@ -228,10 +847,25 @@ def _filter_by_name(node, name, value):
         return False
 
 
+def _filter_by_range(node, name, lo, hi):
+    try:
+        value = getattr(node, name)
+        return value is not None and (lo is None or lo <= value) and (hi is None or value <= hi)
+    except (AttributeError, TypeError):
+        return False
+
+
 class CountError(RuntimeError):
 
     def __init__(self, msg, result):
         """Error raised on `mincount` or `maxcount` mismatch."""
         if result:
-            msg += " " + repr(result)
+            msg += " " + CountError.__preview(result)
         super(CountError, self).__init__(msg)
+
+    @staticmethod
+    def __preview(result):
+        if len(result) > _MAXPREVIEW:
+            return "(%s, ...)" % ", ".join([repr(item) for item in result[:_MAXPREVIEW]])
+        else:
+            return repr(tuple(result))
@@ -0,0 +1,216 @@
+# -*- coding: utf-8 -*-
+"""
+Vectorized Searching on Tree Snapshots.
+
+:any:`TreeSnapshot` stores a tree in pre-order as columnar `numpy` arrays.
+Searches are evaluated as boolean masks over these arrays, subtrees are pre-order intervals.
+
+This module requires `numpy`.
+"""
+
+import six
+
+from anytree.search import Q
+from anytree.search import _LOOKUPS
+from anytree.search import _checkcount
+
+
+class TreeSnapshot(object):
+
+    def __init__(self, root, attrs=None, children=None):
+        u"""
+        Frozen columnar copy of the tree below `root`.
+
+        Args:
+            root: top node.
+
+        Keyword Args:
+            attrs: attribute names copied into columns. Further columns are copied on first use.
+            children: function returning the sequence of child nodes of a node.
+
+        Later modifications of the tree are *not* reflected by the snapshot.
+
+        >>> from anytree import Node, RenderTree, AsciiStyle, Q
+        >>> f = Node("f", size=0)
+        >>> b = Node("b", parent=f, size=0)
+        >>> a = Node("a", parent=b, size=300)
+        >>> d = Node("d", parent=b, size=0)
+        >>> c = Node("c", parent=d, size=5000)
+        >>> e = Node("e", parent=d, size=7000)
+        >>> g = Node("g", parent=f, size=2000)
+        >>> print(RenderTree(f, style=AsciiStyle()).by_attr())
+        f
+        |-- b
+        |   |-- a
+        |   +-- d
+        |       |-- c
+        |       +-- e
+        +-- g
+
+        >>> snapshot = TreeSnapshot(f, attrs=["size"])
+        >>> snapshot.findall(filter_=Q(size__gt=1000))
+        (Node('/f/b/d/c', size=5000), Node('/f/b/d/e', size=7000), Node('/f/g', size=2000))
+        >>> snapshot.findall(b, filter_=Q(size__gt=1000))
+        (Node('/f/b/d/c', size=5000), Node('/f/b/d/e', size=7000))
+        >>> snapshot.findall(filter_=Q(size__gt=1000, depth__le=2))
+        (Node('/f/g', size=2000),)
+
+        The filter can also be a function returning a boolean mask over all columns:
+
+        >>> snapshot.findall(filter_=lambda columns: columns["size"] % 1000 == 300)
+        (Node('/f/b/a', size=300),)
+        """
+        import numpy
+        self.root = root
+        getchildren = children or (lambda node: node.children)
+        base = getattr(root, "depth", 0) if children is None else 0
+        nodes, depths, ends = [root], [base], [0]
+        # stack of child iterators with the position of their parent
+        stack = [(iter(getchildren(root)), 0)]
+        while stack:
+            childiter, parent = stack[-1]
+            for child in childiter:
+                depths.append(base + len(stack))
+                ends.append(0)
+                stack.append((iter(getchildren(child)), len(nodes)))
+                nodes.append(child)
+                break
+            else:
+                # the subtree interval of `parent` ends behind its last descendant
+                ends[parent] = len(nodes)
+                stack.pop()
+        self.nodes = tuple(nodes)
+        self.depth = numpy.array(depths, dtype=int)
+        self.end = numpy.array(ends, dtype=int)
+        self.__numpy = numpy
+        self.__columns = {}
+        self.__positions = None
+        for attr in attrs or ():
+            self[attr]
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def __getitem__(self, attr):
+        """Column with the values of `attr` in pre-order."""
+        return self.__column(attr)[0]
+
+    def present(self, attr):
+        """Boolean mask of all nodes having `attr`."""
+        return self.__column(attr)[1]
+
+    def __column(self, attr):
+        if attr == "depth":
+            return self.depth, self.__numpy.ones(len(self.nodes), dtype=bool)
+        try:
+            return self.__columns[attr]
+        except KeyError:
+            pass
+        numpy = self.__numpy
+        missing = object()
+        values = [getattr(node, attr, missing) for node in self.nodes]
+        present = numpy.array([value is not missing for value in values], dtype=bool)
+        existing = [value for value in values if value is not missing]
+        dtype = object
+        if existing and len(set([type(value) for value in existing])) == 1:
+            try:
+                array = numpy.array(existing)
+            except ValueError:
+                array = None
+            # sequences as values result in multi-dimensional arrays
+            if array is not None and array.ndim == 1 and array.dtype.kind in "biufU":
+                dtype = array.dtype
+        if dtype is object:
+            # element by element, as sequences would be unpacked otherwise
+            column = numpy.empty(len(values), dtype=object)
+            for idx, value in enumerate(values):
+                if value is not missing:
+                    column[idx] = value
+        else:
+            column = numpy.zeros(len(values), dtype=dtype)
+            fill = "" if dtype.kind == "U" else 0
+            column[:] = [fill if value is missing else value for value in values]
+        self.__columns[attr] = column, present
+        return column, present
+
+    def position(self, node):
+        """Pre-order position of `node`."""
+        if self.__positions is None:
+            self.__positions = dict((id(item), idx) for idx, item in enumerate(self.nodes))
+        try:
+            return self.__positions[id(node)]
+        except KeyError:
+            raise ValueError("%r is not part of the snapshot." % (node,))
+
+    def mask(self, filter_):
+        """Boolean mask of all nodes matching `filter_`, a :any:`Q` query or a function returning a mask."""
+        if isinstance(filter_, Q):
+            return self.__evaluate(filter_)
+        # copy, as the function might return a column
+        return self.__numpy.array(filter_(self), dtype=bool)
+
+    def findall(self, node=None, filter_=None, maxlevel=None, mincount=None, maxcount=None):
+        """
+        Search nodes matching `filter_` but stop at `maxlevel`.
+
+        Return tuple with matching nodes in pre-order like :any:`findall`.
+
+        Keyword Args:
+            node: top node, start searching. Default is `root`.
+            filter_: :any:`Q` query or function called with the snapshot returning a boolean mask.
+            maxlevel (int): maximum decending in the node hierarchy.
+            mincount (int): minimum number of nodes.
+            maxcount (int): maximum number of nodes.
+        """
+        numpy = self.__numpy
+        start = 0 if node is None else self.position(node)
+        stop = self.end[start]
+        if filter_ is None:
+            mask = numpy.ones(stop - start, dtype=bool)
+        else:
+            mask = self.mask(filter_)[start:stop]
+        if maxlevel is not None:
+            mask = mask & (self.depth[start:stop] < self.depth[start] + maxlevel)
+        nodes = self.nodes
+        result = tuple([nodes[idx] for idx in numpy.flatnonzero(mask) + start])
+        return _checkcount(result, mincount, maxcount)
+
+    def __evaluate(self, query):
+        numpy = self.__numpy
+        op, args = query._op, query._args
+        if op == "cmp":
+            attr, lookup, value = args
+            column, present = self.__column(attr)
+            return self.__compare(column, lookup, value) & present
+        elif op == "not":
+            return ~self.__evaluate(args[0])
+        masks = [self.__evaluate(item) for item in args]
+        if not masks:
+            return numpy.ones(len(self.nodes), dtype=bool)
+        combine = numpy.logical_and if op == "and" else numpy.logical_or
+        return combine.reduce(masks)
+
+    def __compare(self, column, lookup, value):
+        numpy = self.__numpy
+        try:
+            if lookup in ("eq", "ne", "lt", "le", "gt", "ge") and column.dtype != object:
+                mask = _LOOKUPS[lookup](column, value)
+            elif lookup == "in" and column.dtype != object and not isinstance(value, six.string_types):
+                mask = numpy.isin(column, list(value))
+            elif lookup in ("startswith", "endswith") and column.dtype.kind == "U":
+                mask = getattr(numpy.char, lookup)(column, value)
+            else:
+                mask = None
+            if isinstance(mask, numpy.ndarray) and mask.dtype == bool:
+                return mask
+        except TypeError:
+            pass
+        # element-wise fallback
+        compare = _LOOKUPS[lookup]
+
+        def match(item):
+            try:
+                return bool(compare(item, value))
+            except (AttributeError, TypeError):
+                return False
+        return numpy.fromiter((match(item) for item in column), dtype=bool, count=len(column))
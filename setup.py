@@ -37,11 +37,12 @@ config['classifiers'] = [
     'Programming Language :: Python :: 3.6',
 ]
 config['keywords'] = 'tree, tree data, treelib, tree walk, tree structure'
-config['packages'] = ['anytree', 'anytree.node', 'anytree.iterators', 'anytree.importer', 'anytree.exporter', 'anytree.util']
+config['packages'] = ['anytree', 'anytree.node', 'anytree.iterators', 'anytree.index', 'anytree.importer', 'anytree.exporter', 'anytree.util']
 config['install_requires'] = ['six>=1.9.0']
 config['extras_require'] = {
     'dev': ['check-manifest'],
     'test': ['coverage'],
+    'numpy': ['numpy'],
 }
 config['tests_require'] = ['nose']
 config['test_suite'] = 'nose.collector'
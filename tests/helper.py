@@ -20,3 +20,16 @@ def eq_str(value, expected):
         eq_(value.decode('utf-8'), expected)
     else:
         eq_(value, expected)
+
+
+class Unordered(object):
+
+    """Value, which is not comparable by order on py2 and py3."""
+
+    def __lt__(self, other):
+        raise TypeError("unorderable")
+
+    __le__ = __gt__ = __ge__ = __lt__
+
+    def __repr__(self):
+        return "Unordered()"
@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+import sys
+
+from nose.plugins.skip import SkipTest
+from nose.tools import eq_
+
+from anytree import CountError
+from anytree import Node
+
+from helper import assert_raises
+
+if sys.version_info < (3, 6):
+    raise SkipTest("asynchronous iteration requires Python 3.6")
+
+import asyncio  # noqa
+
+from anytree.aio import AsyncLevelOrderIter  # noqa
+from anytree.aio import AsyncPreOrderIter  # noqa
+from anytree.aio import async_findall  # noqa
+
+
+class Delayed(object):
+
+    """Predicate returning futures, resolved after `delay` seconds."""
+
+    def __init__(self, loop, func, delay):
+        self.loop = loop
+        self.func = func
+        self.delay = delay
+        self.pending = 0
+        self.maxpending = 0
+        self.calls = []
+
+    def __call__(self, node):
+        self.calls.append(node.name)
+        self.pending += 1
+        self.maxpending = max(self.maxpending, self.pending)
+        future = self.loop.create_future()
+        self.loop.call_later(self.delay(node), self.resolve, future, node)
+        return future
+
+    def resolve(self, future, node):
+        self.pending -= 1
+        future.set_result(self.func(node))
+
+
+def _run(loop, coro):
+    return loop.run_until_complete(coro)
+
+
+def _names(loop, iter_):
+    aiter_ = iter_.__aiter__()
+    names = []
+    while True:
+        try:
+            names.append(_run(loop, aiter_.__anext__()).name)
+        except StopAsyncIteration:  # noqa
+            return names
+
+
+def _tree():
+    f = Node("f")
+    b = Node("b", parent=f)
+    Node("a", parent=b)
+    d = Node("d", parent=b)
+    Node("c", parent=d)
+    Node("e", parent=d)
+    g = Node("g", parent=f)
+    i = Node("i", parent=g)
+    Node("h", parent=i)
+    return f
+
+
+def test_aio_iter():
+    """Asynchronous iteration."""
+    loop = asyncio.new_event_loop()
+    try:
+        f = _tree()
+        eq_(_names(loop, AsyncPreOrderIter(f)), ["f", "b", "a", "d", "c", "e", "g", "i", "h"])
+        eq_(_names(loop, AsyncLevelOrderIter(f)), ["f", "b", "g", "a", "d", "i", "c", "e", "h"])
+        eq_(_names(loop, AsyncPreOrderIter(f, maxlevel=2)), ["f", "b", "g"])
+        eq_(_names(loop, AsyncLevelOrderIter(f, maxlevel=3)), ["f", "b", "g", "a", "d", "i"])
+        eq_(_names(loop, AsyncPreOrderIter(f, maxlevel=0)), [])
+
+        # synchronous predicates
+        eq_(_names(loop, AsyncPreOrderIter(f, filter_=lambda n: n.is_leaf, stop=lambda n: n.name == "d")),
+            ["a", "h"])
+
+        # completion order does not matter, the later siblings finish first
+        order = {"f": 0, "b": 0.03, "a": 0.02, "d": 0.01, "c": 0.02, "e": 0.01, "g": 0.0, "i": 0.01, "h": 0}
+        filter_ = Delayed(loop, lambda n: n.name != "d", lambda n: order[n.name])
+        eq_(_names(loop, AsyncPreOrderIter(f, filter_=filter_)), ["f", "b", "a", "c", "e", "g", "i", "h"])
+        filter_ = Delayed(loop, lambda n: n.name != "d", lambda n: order[n.name])
+        eq_(_names(loop, AsyncLevelOrderIter(f, filter_=filter_)), ["f", "b", "g", "a", "i", "c", "e", "h"])
+
+        # stopped nodes are not filtered
+        stop = Delayed(loop, lambda n: n.name in ("d", "i"), lambda n: 0)
+        filter_ = Delayed(loop, lambda n: True, lambda n: 0)
+        eq_(_names(loop, AsyncPreOrderIter(f, filter_=filter_, stop=stop)), ["f", "b", "a", "g"])
+        eq_(sorted(stop.calls), ["a", "b", "d", "f", "g", "i"])
+        eq_(sorted(filter_.calls), ["a", "b", "f", "g"])
+
+        # asynchronous children
+        children = Delayed(loop, lambda n: n.children, lambda n: 0)
+        eq_(_names(loop, AsyncLevelOrderIter(f, children=children)), ["f", "b", "g", "a", "d", "i", "c", "e", "h"])
+    finally:
+        loop.close()
+
+
+def test_aio_concurrency():
+    """Concurrent evaluation of the frontier."""
+    loop = asyncio.new_event_loop()
+    try:
+        root = Node("root")
+        for idx in range(10):
+            Node(str(idx), parent=root)
+        filter_ = Delayed(loop, lambda n: n.name != "root", lambda n: 0.001)
+        eq_(_names(loop, AsyncLevelOrderIter(root, filter_=filter_)), [str(idx) for idx in range(10)])
+        eq_(filter_.maxpending, 10)
+        filter_ = Delayed(loop, lambda n: n.name != "root", lambda n: 0.001)
+        eq_(_names(loop, AsyncPreOrderIter(root, filter_=filter_, concurrency=3)), [str(idx) for idx in range(10)])
+        eq_(filter_.maxpending, 3)
+    finally:
+        loop.close()
+
+
+def test_async_findall():
+    """Asynchronous search."""
+    loop = asyncio.new_event_loop()
+    try:
+        f = _tree()
+        filter_ = Delayed(loop, lambda n: n.is_leaf, lambda n: 0)
+        eq_(_run(loop, async_findall(f, filter_=filter_)), tuple([n for n in f.descendants if n.is_leaf]))
+        eq_(_run(loop, async_findall(f, filter_=lambda n: n.is_leaf, maxlevel=3)), (f.children[0].children[0],))
+        with assert_raises(CountError, (
+                "Expecting at least 4 elements, but found 3. (Node('/f/b/a'), Node('/f/b/d/c'), Node('/f/b/d/e'))")):
+            _run(loop, async_findall(f, filter_=lambda n: n.is_leaf, mincount=4, stop=lambda n: n.name == "g"))
+        with assert_raises(CountError, (
+                "Expecting 1 elements at maximum, but found at least 2. (Node('/f/b/a'), Node('/f/b/d/c'))")):
+            _run(loop, async_findall(f, filter_=lambda n: n.is_leaf, maxcount=1))
+    finally:
+        loop.close()
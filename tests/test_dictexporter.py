@@ -91,3 +91,49 @@ def test_dict_exporter_filter():
             ]}
         ]}
     )
+
+
+def test_dict_exporter_children():
+    """Dict Exporter with children accessor."""
+    class Dir(object):
+
+        def __init__(self, name, entries=()):
+            self.name = name
+            self.entries = entries
+
+    root = Dir("root", [Dir("sub0", [Dir("sub0B"), Dir("sub0A")]), Dir("sub1")])
+    exporter = DictExporter(children=lambda item: item.entries,
+                            attriter=lambda attrs: [(k, v) for k, v in attrs if k == "name"])
+    eq_(exporter.export(root),
+        {'name': 'root', 'children': [
+            {'name': 'sub0', 'children': [
+                {'name': 'sub0B'},
+                {'name': 'sub0A'}
+            ]},
+            {'name': 'sub1'}
+        ]}
+    )
+
+
+def test_dict_exporter_mapping():
+    """Dict Exporter with a plain dictionary tree."""
+    tree = {'name': 'root', 'children': [
+        {'name': 'sub0', 'children': [
+            {'name': 'sub0B', 'children': []},
+            {'name': 'sub0A'}
+        ]},
+        {'name': 'sub1', 'foo': 'bar'}
+    ]}
+    exporter = DictExporter(children=lambda item: item.get('children', ()))
+    eq_(exporter.export(tree),
+        {'name': 'root', 'children': [
+            {'name': 'sub0', 'children': [
+                {'name': 'sub0B'},
+                {'name': 'sub0A'}
+            ]},
+            {'name': 'sub1', 'foo': 'bar'}
+        ]}
+    )
+    tree = ('root', [('sub0', [])])
+    exporter = DictExporter(children=lambda item: item[1])
+    eq_(exporter.export(tree), {'children': [{}]})
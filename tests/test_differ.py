@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+import random
+
+from nose.tools import eq_
+
+from anytree import AnyNode
+from anytree import Node
+from anytree import apply_patch
+from anytree import diff
+from anytree.differ import Delete
+from anytree.differ import Insert
+from anytree.differ import Move
+from anytree.differ import Update
+from anytree.exporter import DictExporter
+from anytree.importer import DictImporter
+
+from helper import assert_raises
+
+
+def _export(root):
+    return DictExporter(attriter=sorted).export(root)
+
+
+def _copy(root):
+    return DictImporter(nodecls=AnyNode).import_(_export(root))
+
+
+def _key(node):
+    return node.id
+
+
+def test_diff():
+    """Diff."""
+    old = AnyNode(id=0)
+    for idx in range(1, 6):
+        AnyNode(id=idx, parent=old)
+    new = AnyNode(id=0)
+    for idx in reversed(range(1, 6)):
+        AnyNode(id=idx, parent=new)
+    # reversing needs n - 1 moves
+    ops = diff(old, new, key=_key)
+    eq_(ops, [Move(5, 0, 0), Move(4, 0, 1), Move(3, 0, 2), Move(2, 0, 3)])
+    apply_patch(old, ops, key=_key)
+    eq_(_export(old), _export(new))
+    eq_(diff(old, new, key=_key), [])
+
+    # attributes, insert and delete
+    new.children[0].foo = 4
+    del new.children[1].id
+    new.children[1].id = 4
+    new.children[2].parent = None
+    AnyNode(id=6, parent=new.children[0], bar="x")
+    ops = diff(old, new, key=_key)
+    eq_(ops, [Update(5, {"foo": 4}, ()), Insert(6, 5, 0, {"bar": "x", "id": 6}), Delete(3)])
+    apply_patch(old, ops, key=_key)
+    eq_(_export(old), _export(new))
+    old.children[0].children[0].bar = "y"
+    del old.children[0].foo
+    eq_(diff(old, new, key=_key), [Update(5, {"foo": 4}, ()), Update(6, {"bar": "x"}, ())])
+    eq_(diff(new, old, key=_key), [Update(5, {}, ("foo",)), Update(6, {"bar": "y"}, ())])
+
+    with assert_raises(ValueError, "Root nodes differ: 0 != 1."):
+        diff(old, AnyNode(id=1), key=_key)
+    AnyNode(id=4, parent=new.children[0])
+    with assert_raises(ValueError, "Duplicate key 4."):
+        diff(old, new, key=_key)
+    with assert_raises(ValueError, "Duplicate key 4."):
+        diff(new, old, key=_key)
+
+
+def test_diff_path():
+    """Diff with path keys."""
+    old = Node("root")
+    a = Node("a", parent=old)
+    Node("b", parent=a)
+    Node("c", parent=old)
+    new = Node("root")
+    Node("c", parent=new, size=1)
+    a2 = Node("a", parent=new)
+    Node("d", parent=a2)
+    ops = diff(old, new)
+    eq_(ops, [Move(("c",), (), 0), Update(("c",), {"size": 1}, ()), Insert(("a", "d"), ("a",), 0, {"name": "d"}),
+              Delete(("a", "b"))])
+    apply_patch(old, ops)
+    eq_(_export(old), _export(new))
+    eq_(old.children[1].children[0].__class__, Node)
+
+
+def test_diff_random():
+    """Diff random trees."""
+    rnd = random.Random(42)
+    for _ in range(30):
+        old = AnyNode(id=0)
+        nodes = [old]
+        for idx in range(1, rnd.randint(1, 60)):
+            nodes.append(AnyNode(id=idx, parent=rnd.choice(nodes), value=rnd.randint(0, 3)))
+        new = _copy(old)
+        newnodes = dict([(node.id, node) for node in new.descendants])
+        maxid = len(nodes)
+        for _ in range(rnd.randint(0, 10)):
+            choice = rnd.randint(0, 3)
+            items = list(newnodes.values())
+            if not items:
+                break
+            node = rnd.choice(items)
+            if choice == 0:
+                node.value = rnd.randint(0, 3)
+            elif choice == 1:
+                newnodes[maxid] = AnyNode(id=maxid, parent=node)
+                maxid += 1
+            elif choice == 2:
+                node.parent = None
+                for item in (node,) + node.descendants:
+                    newnodes.pop(item.id, None)
+            else:
+                parent = rnd.choice([new] + items)
+                if node is not parent and node not in parent.path:
+                    node.parent = parent
+                    children = list(parent.children)
+                    rnd.shuffle(children)
+                    parent.children = children
+        ops = diff(old, new, key=_key)
+        apply_patch(old, ops, key=_key)
+        eq_(_export(old), _export(new))
+        eq_(diff(old, new, key=_key), [])
+
+
+def test_diff_modified():
+    """Diff after modifying plain nodes."""
+    old = AnyNode(id=0)
+    AnyNode(id=1, parent=old, size=1)
+    new = _copy(old)
+    eq_(diff(old, new, key=_key), [])
+    new.children[0].size = 2
+    ops = diff(old, new, key=_key)
+    eq_(ops, [Update(1, {"size": 2}, ())])
+    apply_patch(old, ops, key=_key)
+    eq_(diff(old, new, key=_key), [])
+    new.children[0].size = 3
+    eq_(diff(old, new, key=_key), [Update(1, {"size": 3}, ())])
+
+
+def test_apply_patch_targeted():
+    """Apply patch just attaches inserted and moved nodes."""
+    class Observer(object):
+
+        def __init__(self):
+            self.attached = []
+
+        def _observe_attach(self, node):
+            self.attached.append(node.id)
+
+        def _observe_detach(self, node, parent, index):
+            pass
+
+    old = AnyNode(id=0)
+    for idx in range(1, 8):
+        AnyNode(id=idx, parent=old)
+    AnyNode(id=10, parent=old.children[2])
+    new = _copy(old)
+    children = list(new.children)
+    children.insert(1, children.pop(5))
+    children.insert(4, AnyNode(id=8))
+    new.children = children
+    new.children[-1].parent = new.children[0]
+    observer = Observer()
+    old._add_observer(observer)
+    ops = diff(old, new, key=_key)
+    apply_patch(old, ops, key=_key)
+    eq_(_export(old), _export(new))
+    eq_(sorted(observer.attached), [6, 7, 8])
+    old._remove_observer(observer)
+
+
+def test_diff_duplicate_names():
+    """Path keys require unique sibling names."""
+    old = Node("root")
+    Node("a", parent=old)
+    new = Node("root")
+    Node("a", parent=new)
+    Node("a", parent=new)
+    with assert_raises(ValueError, "Duplicate key ('a',)."):
+        diff(old, new)
+    with assert_raises(ValueError, "Duplicate key ('a',)."):
+        diff(new, old)
+    eq_(Insert.__doc__, "Insert new node `key` with attributes `attrs` as child at `index` of `parent`.")
+    eq_(repr(Delete(("a",))), "Delete(key=('a',))")
@@ -0,0 +1,371 @@
+# -*- coding: utf-8 -*-
+import six
+from nose.tools import eq_
+
+from anytree import AttrNotifyMixin
+from anytree import BloomIndex
+from anytree import CountError
+from anytree import Node
+from anytree import PreOrderIter
+from anytree import PrefixIndex
+from anytree import Q
+from anytree import RangeIndex
+from anytree import TreeIndex
+from anytree import find_by_attr
+from anytree import findall
+from anytree import findall_by_range
+from anytree import findall_by_attr
+
+from helper import Unordered
+from helper import assert_raises
+
+
+class NotifyNode(AttrNotifyMixin, Node):
+    pass
+
+
+def test_treeindex():
+    """Tree Index."""
+    f = Node("f")
+    b = Node("b", parent=f)
+    a = Node("a", parent=b, kind="file")
+    d = Node("d", parent=b)
+    c = Node("c", parent=d, kind="file")
+    e = Node("e", parent=d)
+    g = Node("g", parent=f)
+    i = Node("i", parent=g, kind="file")
+
+    index = TreeIndex(f, "kind")
+    eq_(index.get("file"), (a, c, i))
+    eq_(index.get("file", node=d), (c,))
+    eq_(index.get("file", maxlevel=3), (a, i))
+    eq_(index.get("file", shallowest=True), (a,))
+    eq_(index.get("dir"), ())
+    eq_(index.get(["unhashable"]), ())
+    assert "file" in index
+    assert "dir" not in index
+
+    # structure modifications
+    e.kind = "file"
+    eq_(index.get("file"), (a, c, i))
+    e.parent = None
+    e.parent = b
+    eq_(index.get("file"), (a, c, e, i))
+    d.parent = g
+    eq_(index.get("file"), (a, e, i, c))
+    g.children = [d]
+    eq_(index.get("file"), (a, e, c))
+    i.parent = d
+    eq_(index.get("file"), (a, e, c, i))
+
+    # outside of index
+    h = Node("h", kind="file")
+    i.parent = h
+    eq_(index.get("file"), (a, e, c))
+    Node("j", parent=h, kind="file")
+    eq_(index.get("file"), (a, e, c))
+
+    index.close()
+    eq_(index.get("file"), ())
+    Node("k", parent=f, kind="file")
+    eq_(index.get("file"), ())
+    # closing again is harmless
+    index.close()
+
+
+def test_treeindex_attr():
+    """Tree Index with attribute change notification."""
+    root = NotifyNode("root")
+    s0 = NotifyNode("sub0", parent=root)
+    s1 = NotifyNode("sub1", parent=root)
+    index = TreeIndex(root)
+    eq_(index.get("sub0"), (s0,))
+    s0.name = "sub1"
+    eq_(index.get("sub0"), ())
+    eq_(index.get("sub1"), (s0, s1))
+    del s1.name
+    eq_(index.get("sub1"), (s0,))
+    s1.name = "sub2"
+    eq_(index.get("sub2"), (s1,))
+    root.name = "top"
+    eq_(index.get("top"), (root,))
+    eq_(index.get("root"), ())
+
+
+def test_search_index():
+    """Search using Tree Index."""
+    f = Node("f")
+    b = Node("b", parent=f, id=1)
+    a = Node("a", parent=b, id=2)
+    d = Node("d", parent=b, id=1)
+    Node("c", parent=d, id=3)
+    g = Node("g", parent=f, id=2)
+
+    expected = {
+        "all": findall_by_attr(f, 2, name="id"),
+        "sub": findall_by_attr(b, 1, name="id"),
+        "level": findall_by_attr(f, 1, name="id", maxlevel=2),
+        "find": find_by_attr(f, 3, name="id"),
+        "shallowest": find_by_attr(f, 1, name="id", shallowest=True),
+    }
+    eq_(expected["all"], (a, g))
+    eq_(expected["sub"], (b, d))
+    eq_(expected["level"], (b,))
+    eq_(expected["shallowest"], b)
+
+    TreeIndex(f, "id")
+    eq_(findall_by_attr(f, 2, name="id"), expected["all"])
+    eq_(findall_by_attr(b, 1, name="id"), expected["sub"])
+    eq_(findall_by_attr(f, 1, name="id", maxlevel=2), expected["level"])
+    eq_(find_by_attr(f, 3, name="id"), expected["find"])
+    eq_(find_by_attr(f, 1, name="id", shallowest=True), expected["shallowest"])
+    eq_(find_by_attr(f, 4, name="id"), None)
+    with assert_raises(CountError, "Expecting 1 elements at maximum, but found at least 2. (Node('/f/b', id=1), "
+                                   "Node('/f/b/d', id=1))"):
+        find_by_attr(f, 1, name="id")
+    with assert_raises(CountError, "Expecting at least 3 elements, but found 2. (Node('/f/b/a', id=2), "
+                                   "Node('/f/g', id=2))"):
+        findall_by_attr(f, 2, name="id", mincount=3)
+
+
+def test_prefixindex():
+    """Prefix Index."""
+    root = Node("root")
+    docs = Node("docs", parent=root)
+    document = Node("document.txt", parent=docs)
+    dot = Node("dot.png", parent=docs)
+    src = Node("src", parent=root)
+    doc = Node("doc.py", parent=src)
+    Node(42, parent=src)
+
+    index = PrefixIndex(root, ngram=3)
+    eq_(index.complete(""), ("doc.py", "docs", "document.txt", "dot.png", "root", "src"))
+    eq_(index.complete("do"), ("doc.py", "docs", "document.txt", "dot.png"))
+    eq_(index.complete("do", limit=1), ("doc.py",))
+    eq_(index.complete("x"), ())
+    eq_(index.startswith("doc"), (docs, document, doc))
+    eq_(index.startswith("doc", node=docs), (docs, document))
+    eq_(index.startswith("doc", node=docs, maxlevel=1), (docs,))
+    eq_(index.contains("o"), (root, docs, document, dot, doc))
+    eq_(index.contains("ocu"), (document,))
+    eq_(index.contains("cs"), (docs,))
+    eq_(index.contains(".p"), (dot, doc))
+    eq_(index.contains("xyz"), ())
+    eq_(index.startswith("do", ordered=False), (doc, docs, document, dot))
+    eq_(index.startswith("do", node=docs, ordered=False), (docs, document, dot))
+
+    doc2 = Node("doc.py", parent=docs)
+    eq_(index.startswith("doc.py"), (doc2, doc))
+    doc.parent = None
+    eq_(index.startswith("doc.py"), (doc2,))
+    doc2.parent = None
+    eq_(index.complete("doc"), ("docs", "document.txt"))
+    eq_(index.contains("c.p"), ())
+
+    # without n-grams
+    index = PrefixIndex(root, attr="name")
+    eq_(index.contains("ocu"), (document,))
+
+    # query
+    plain = findall(root, filter_=Q(name__contains="oc"))
+    eq_(plain, (docs, document))
+    eq_(Q(name__contains="oc").explain(root).split("\n")[0], "plan: index lookup name contains 'oc'")
+    eq_(Q(name__startswith="do").explain(root).split("\n")[-1], "visits: 3")
+    eq_(index._estimate("startswith", "do"), 3)
+    eq_(index._estimate("contains", "oc"), 5)
+    eq_(index._estimate("endswith", "oc"), None)
+    eq_(findall(root, filter_=Q(name__startswith="do", depth=2)), (document, dot))
+
+
+def test_prefixindex_query():
+    """Prefix Index answers queries like a scan."""
+    root = NotifyNode("root", tags="ab")
+    for idx, tags in enumerate(["a", "ba", None, 3, "", "abc"]):
+        NotifyNode("n%d" % idx, parent=root, tags=tags)
+    NotifyNode("notags", parent=root)
+    index = PrefixIndex(root, "tags", ngram=2)
+    lookups = ("tags__startswith", "tags__contains")
+    values = ("a", "ab", "", "x", 3, None)
+
+    def check():
+        for lookup in lookups:
+            for value in values:
+                query = Q(**{lookup: value})
+                eq_(findall(root, filter_=query), tuple(PreOrderIter(root, filter_=query)))
+
+    check()
+    eq_(index._estimate("contains", "ab"), 2)
+    # nodes with lists are not indexed
+    listed = NotifyNode("listed", parent=root, tags=["a", "b"])
+    eq_(index._estimate("contains", "ab"), None)
+    eq_(findall(root, filter_=Q(tags__contains="a"))[-1], listed)
+    check()
+    listed.tags = "ba"
+    eq_(index._estimate("contains", "ab"), 2)
+    check()
+    listed.tags = ("a",)
+    eq_(index._estimate("contains", "ab"), None)
+    listed.parent = None
+    eq_(index._estimate("contains", "ab"), 2)
+    index.close()
+
+
+def test_rangeindex():
+    """Range Index."""
+    root = NotifyNode("root", ts=10)
+    a = NotifyNode("a", parent=root, ts=25)
+    b = NotifyNode("b", parent=a, ts=20)
+    c = NotifyNode("c", parent=root, ts=40)
+    d = NotifyNode("d", parent=c, ts=30)
+    e = NotifyNode("e", parent=c, ts=None)
+    f = NotifyNode("f", parent=c, ts=Unordered())
+    NotifyNode("g", parent=c)
+
+    expected = findall_by_range(root, "ts", 20, 30)
+    eq_(expected, (a, b, d))
+
+    index = RangeIndex(root, "ts")
+    eq_(index.range(), (root, a, b, c, d))
+    eq_(index.range(20, 30), (a, b, d))
+    eq_(index.range(20, 30, node=a), (a, b))
+    eq_(index.range(20, 30, maxlevel=2), (a,))
+    eq_(index.range(hi=20), (root, b))
+    eq_(index.range(lo=31), (c,))
+    eq_(index.range(26, 29), ())
+    eq_(index.range(20, 30, ordered=False), (b, a, d))
+    eq_(findall_by_range(root, "ts", 20, 30), expected)
+    eq_(findall_by_range(c, "ts", 20, 30), (d,))
+    eq_(findall_by_range(root, "ts", "a", "z"), ())
+    # py2 orders `None`, which is not indexed
+    eq_(index._estimate("le", 25), None if six.PY2 else 3)
+    eq_(index._estimate("eq", 26), None if six.PY2 else 0)
+    eq_(index._estimate("contains", 25), None)
+
+    # values sorted at once
+    f.ts = float("nan")
+    bulk = RangeIndex(root, "ts")
+    eq_(bulk.range(), (root, a, b, c, d))
+    eq_(bulk.range(lo=21), (a, c, d))
+    bulk.close()
+    f.ts = Unordered()
+    with assert_raises(CountError, "Expecting 1 elements at maximum, but found at least 2. "
+                                   "(NotifyNode('/root/a', ts=25), NotifyNode('/root/c/d', ts=30))"):
+        findall_by_range(root, "ts", 25, 30, maxcount=1)
+
+    # modifications
+    e.ts = 22
+    eq_(index.range(20, 30), (a, b, d, e))
+    b.ts = 50
+    eq_(index.range(20, 30), (a, d, e))
+    eq_(index.range(lo=41), (b,))
+    d.parent = None
+    eq_(index.range(20, 30), (a, e))
+    c.parent = a
+    eq_(index.range(20, 30), (a, e))
+    eq_(findall_by_range(root, "ts", 20, 30), (a, e))
+
+    # query
+    eq_(Q(ts__gt=40).explain(root), "plan: index lookup ts gt 40\nmaxlevel: None\nfilter: Q()\nvisits: 1")
+    eq_(findall(root, filter_=Q(ts__ge=22, ts__lt=40)), (a, e))
+    eq_(findall(root, filter_=Q(ts=25)), (a,))
+
+
+def test_rangeindex_query():
+    """Range Index answers queries like a scan."""
+    root = NotifyNode("root")
+    for idx, size in enumerate([3, None, 7, 3, float("nan"), 0, Unordered()]):
+        NotifyNode("n%d" % idx, parent=root, size=size)
+    NotifyNode("nosize", parent=root)
+    index = RangeIndex(root, "size")
+    lookups = ("size", "size__lt", "size__le", "size__gt", "size__ge")
+    values = (None, 3, 4, -1, 10, float("nan"), Unordered(), [3])
+
+    def check():
+        for lookup in lookups:
+            for value in values:
+                query = Q(**{lookup: value})
+                eq_(findall(root, filter_=query), tuple(PreOrderIter(root, filter_=query)))
+
+    check()
+    eq_(index._estimate("eq", None), None)
+    eq_(index._estimate("le", 3), None if six.PY2 else 2)
+    # nodes with unhashable values are not indexed
+    unhashable = NotifyNode("unhashable", parent=root, size=[3])
+    eq_(index._estimate("le", 3), None)
+    check()
+    unhashable.parent = None
+    eq_(index._estimate("le", 3), None if six.PY2 else 2)
+    index.close()
+
+
+def test_bloomindex():
+    """Bloom Index."""
+    root = NotifyNode("root", kind="dir")
+    dirs = [NotifyNode("d%d" % idx, parent=root, kind="dir") for idx in range(4)]
+    for idx, parent in enumerate(dirs):
+        for sub in range(20):
+            NotifyNode("f%d_%d" % (idx, sub), parent=parent, kind="file%d" % idx)
+
+    index = BloomIndex(root, "kind", minsize=10)
+    assert index.nbytes > 0
+    assert index.might_contain("file0")
+    assert index.might_contain("file0", node=dirs[0])
+    assert not index.might_contain("file0", node=dirs[1])
+    assert not index.might_contain("link")
+    assert index.might_contain("file0", node=dirs[1].children[0])
+    assert index.might_contain(["unhashable"])
+
+    visited = []
+
+    def track(node):
+        visited.append(node)
+        return node.kind == "file2"
+    eq_(findall(root, filter_=track, stop=index._prune("file2")), dirs[2].children)
+    eq_(len(visited), 22)
+    eq_(findall_by_attr(root, "file2", name="kind"), dirs[2].children)
+    eq_(find_by_attr(root, "file3", name="kind", shallowest=True), dirs[3].children[0])
+    eq_(Q(kind="file1").explain(root).split("\n")[::3],
+        ["plan: pre-order scan, pruned by bloom filter on kind", "visits: at most 85"])
+
+    # modifications
+    dirs[3].children[0].kind = "file0"
+    assert index.might_contain("file0", node=dirs[3])
+    eq_(findall_by_attr(root, "file0", name="kind"), dirs[0].children + dirs[3].children[:1])
+    for child in dirs[1].children:
+        child.kind = "link"
+    assert not index.might_contain("file1")
+    assert index.might_contain("link")
+    dirs[0].parent = None
+    assert index.might_contain("file0")
+    assert not index.might_contain("file0", node=dirs[2])
+    eq_(findall_by_attr(root, "file0", name="kind"), dirs[3].children[:1])
+    dirs[0].parent = root
+    eq_(findall_by_attr(root, "file0", name="kind"), dirs[3].children[:1] + dirs[0].children)
+    assert not index.might_contain("file0", node=dirs[1])
+    dirs[1].children[0].parent = dirs[2]
+    assert index.might_contain("link", node=dirs[2])
+    eq_(findall_by_attr(dirs[2], "link", name="kind"), dirs[2].children[-1:])
+
+    # budget
+    index.close()
+    small = BloomIndex(root, "kind", minsize=10, maxbytes=300)
+    assert 0 < small.nbytes <= 300
+    assert small.might_contain("link", node=dirs[2])
+    eq_(findall_by_attr(root, "link", name="kind"), dirs[1].children + dirs[2].children[-1:])
+    small.close()
+
+    # summaries of plain nodes might miss attribute changes, searches do not use them
+    plain = Node("plain")
+    subs = [Node("s%d" % idx, parent=plain, kind="file") for idx in range(20)]
+    index = BloomIndex(plain, "kind", minsize=10)
+    subs[3].kind = "link"
+    assert not index.might_contain("link")
+    eq_(findall_by_attr(plain, "link", name="kind"), (subs[3],))
+    eq_(Q(kind="link").explain(plain).split("\n")[0], "plan: pre-order scan")
+    index.close()
+    index = BloomIndex(root, "kind", minsize=10)
+    eq_(Q(kind="link").explain(root).split("\n")[0], "plan: pre-order scan, pruned by bloom filter on kind")
+    plain.parent = dirs[2]
+    eq_(Q(kind="link").explain(root).split("\n")[0], "plan: pre-order scan")
+    plain.parent = None
+    eq_(Q(kind="link").explain(root).split("\n")[0], "plan: pre-order scan, pruned by bloom filter on kind")
@@ -1,3 +1,5 @@
+from anytree import BestFirstIter
+from anytree import ConcurrentModificationError
 from anytree import LevelGroupOrderIter
 from anytree import LevelOrderGroupIter
 from anytree import LevelOrderIter
@@ -7,6 +9,8 @@ from anytree import PreOrderIter
 from anytree import ZigZagGroupIter
 from nose.tools import eq_
 
+from helper import assert_raises
+
 
 def test_preorder():
     """PreOrderIter."""
@@ -159,3 +163,193 @@ def test_zigzaggroup():
     it = ZigZagGroupIter(f)
     eq_(next(it), (f, ))
     eq_(next(it), (g, b))
+
+
+def test_cursor():
+    """Resume PreOrderIter and LevelOrderIter via cursor."""
+    f = Node("f")
+    b = Node("b", parent=f)
+    a = Node("a", parent=b)
+    d = Node("d", parent=b)
+    c = Node("c", parent=d)
+    e = Node("e", parent=d)
+    g = Node("g", parent=f)
+    i = Node("i", parent=g)
+    h = Node("h", parent=i)
+
+    it = PreOrderIter(f)
+    eq_(it.cursor_of(f), ())
+    eq_(it.cursor_of(e), (0, 1, 1))
+    eq_(list(PreOrderIter(f, cursor=())), [b, a, d, c, e, g, i, h])
+    eq_(list(PreOrderIter(f, cursor=(0, 1))), [c, e, g, i, h])
+    eq_(list(PreOrderIter(f, cursor=(0, 1), maxlevel=3)), [g, i])
+    eq_(list(PreOrderIter(f, cursor=(0, 0), stop=lambda n: n.name == 'd')), [g, i, h])
+    eq_(list(PreOrderIter(f, cursor=(1, 0, 0))), [])
+    eq_(list(PreOrderIter(f, cursor=(0, 5))), [g, i, h])
+
+    eq_(list(LevelOrderIter(f, cursor=())), [b, g, a, d, i, c, e, h])
+    eq_(list(LevelOrderIter(f, cursor=(0, 1))), [i, c, e, h])
+    eq_(list(LevelOrderIter(f, cursor=(0, 1), maxlevel=3)), [i])
+    eq_(list(LevelOrderIter(f, cursor=(0, 0), stop=lambda n: n.name == 'd')), [i, h])
+    eq_(list(LevelOrderIter(f, cursor=(1, 0, 0))), [])
+
+    with assert_raises(ValueError, "Invalid cursor (0, -1)."):
+        list(PreOrderIter(f, cursor=(0, -1)))
+    with assert_raises(ValueError, "Node('/f/b') is not a descendant of Node('/f/g')."):
+        PreOrderIter(g).cursor_of(b)
+    b.parent = None
+    eq_(it.cursor_of(h), (0, 0, 0))
+    b.parent = f
+    eq_(it.cursor_of(e), (1, 1, 1))
+
+
+def test_chunks():
+    """Iterate in chunks."""
+    f = Node("f")
+    b = Node("b", parent=f)
+    a = Node("a", parent=b)
+    d = Node("d", parent=b)
+    c = Node("c", parent=d)
+    e = Node("e", parent=d)
+    g = Node("g", parent=f)
+    i = Node("i", parent=g)
+    h = Node("h", parent=i)
+
+    eq_(list(PreOrderIter(f).chunks(4)), [[f, b, a, d], [c, e, g, i], [h]])
+    eq_(list(PreOrderIter(f).chunks(9)), [[f, b, a, d, c, e, g, i, h]])
+    eq_(list(PostOrderIter(f, maxlevel=2).chunks(2)), [[b, g], [f]])
+    eq_(list(LevelOrderIter(f, filter_=lambda n: n.name not in ('e', 'g')).chunks(5)),
+        [[f, b, a, d, i], [c, h]])
+    eq_(list(LevelOrderGroupIter(f).chunks(3)), [[(f,), (b, g), (a, d, i)], [(c, e, h)]])
+    eq_(list(PreOrderIter(f, maxlevel=0).chunks(2)), [])
+
+    def batch(nodes):
+        return [n.name not in ('e', 'g') for n in nodes]
+    eq_(list(PreOrderIter(f, filter_=batch).chunks(3, batchfilter=True)), [[f, b, a], [d, c, i], [h]])
+    eq_(list(PreOrderIter(f, filter_=batch).chunks(7, batchfilter=True)), [[f, b, a, d, c, i, h]])
+    eq_(list(PreOrderIter(f).chunks(3, batchfilter=True)), [[f, b, a], [d, c, e], [g, i, h]])
+
+    with assert_raises(ValueError, "Chunk size must be at least 1, not 0."):
+        PreOrderIter(f).chunks(0)
+    with assert_raises(ValueError, "Batch filter returned 2 values for 3 nodes."):
+        list(PreOrderIter(f, filter_=lambda nodes: [True, True]).chunks(3, batchfilter=True))
+
+
+def test_concurrent_modification():
+    """Tree modification during iteration."""
+    f = Node("f")
+    b = Node("b", parent=f)
+    a = Node("a", parent=b)
+    d = Node("d", parent=b)
+    g = Node("g", parent=f)
+
+    for it, visited in ((PreOrderIter(f), [f, b, a]), (PostOrderIter(f), [a, d])):
+        eq_([next(it) for _ in visited], visited)
+        x = Node("x", parent=b)
+        with assert_raises(ConcurrentModificationError,
+                           "Children of Node('/f/b') have been modified during iteration."):
+            next(it)
+        x.parent = None
+
+    # modifying an already processed subtree is fine
+    i = Node("i", parent=g)
+    it = PreOrderIter(f)
+    eq_([next(it) for _ in range(5)], [f, b, a, d, g])
+    a.parent = None
+    eq_(next(it), i)
+
+    # level-order iterators do not keep references to the children
+    it = LevelOrderIter(f)
+    eq_([next(it), next(it)], [f, b])
+    Node("y", parent=g)
+    eq_([next(it).name for _ in range(4)], ["g", "d", "i", "y"])
+
+
+def test_children_override():
+    """Iterators use an overridden `children` property."""
+    class SortedNode(Node):
+
+        @property
+        def children(self):
+            return tuple(sorted(super(SortedNode, self).children, key=lambda node: node.name))
+
+        @children.setter
+        def children(self, children):
+            Node.children.fset(self, children)
+
+    r = SortedNode("r")
+    b = SortedNode("b", parent=r)
+    a = SortedNode("a", parent=r)
+    eq_(list(PreOrderIter(r)), [r, a, b])
+    eq_(list(PostOrderIter(r)), [a, b, r])
+    eq_(list(LevelOrderIter(r)), [r, a, b])
+    eq_(PreOrderIter(r).cursor_of(b), (1,))
+    b.name = "c"
+    eq_(PreOrderIter(r).cursor_of(b), (1,))
+    b.name = "0"
+    eq_(PreOrderIter(r).cursor_of(b), (0,))
+
+
+def test_bestfirst():
+    """BestFirstIter."""
+    f = Node("f", score=5)
+    b = Node("b", parent=f, score=7)
+    a = Node("a", parent=b, score=2)
+    d = Node("d", parent=b, score=8)
+    c = Node("c", parent=d, score=1)
+    e = Node("e", parent=d, score=9)
+    g = Node("g", parent=f, score=4)
+    i = Node("i", parent=g, score=6)
+    h = Node("h", parent=i, score=3)
+
+    def key(node):
+        return node.score
+
+    def bound(node):
+        return max(n.score for n in (node,) + node.descendants)
+
+    eq_(list(BestFirstIter(f, key)), [f, b, d, e, g, i, h, a, c])
+    eq_(list(BestFirstIter(f, key, bound=bound)), [e, d, b, i, f, g, h, a, c])
+    eq_(list(BestFirstIter(f, key, maxlevel=0)), [])
+    eq_(list(BestFirstIter(f, key, bound=bound, maxlevel=2)), [b, f, g])
+    eq_(list(BestFirstIter(f, key, bound=bound, filter_=lambda n: n.name not in ('e', 'g'))),
+        [d, b, i, f, h, a, c])
+    eq_(list(BestFirstIter(f, key, bound=bound, stop=lambda n: n.name == 'd')), [b, i, f, g, h, a])
+
+    it = BestFirstIter(f, key, bound=bound)
+    eq_(next(it), e)
+    eq_(next(it), d)
+
+
+def test_children_accessor():
+    """Iterate over foreign structures."""
+    tree = {"name": "f", "items": [
+        {"name": "b", "items": [
+            {"name": "a"},
+            {"name": "d", "items": [{"name": "c"}, {"name": "e"}]}]},
+        {"name": "g", "items": [
+            {"name": "i", "items": [{"name": "h"}]}]}]}
+
+    def children(item):
+        return item.get("items", ())
+
+    def names(items):
+        return [item["name"] for item in items]
+
+    def groupnames(groups):
+        return [names(group) for group in groups]
+
+    eq_(names(PreOrderIter(tree, children=children)), ['f', 'b', 'a', 'd', 'c', 'e', 'g', 'i', 'h'])
+    eq_(names(PreOrderIter(tree, maxlevel=3, stop=lambda n: n["name"] == "a", children=children)),
+        ['f', 'b', 'd', 'g', 'i'])
+    eq_(names(PostOrderIter(tree, children=children)), ['a', 'c', 'e', 'd', 'b', 'h', 'i', 'g', 'f'])
+    eq_(names(LevelOrderIter(tree, children=children)), ['f', 'b', 'g', 'a', 'd', 'i', 'c', 'e', 'h'])
+    eq_(names(LevelOrderIter(tree, cursor=(0, 1), children=children)), ['i', 'c', 'e', 'h'])
+    eq_(groupnames(LevelOrderGroupIter(tree, children=children)),
+        [['f'], ['b', 'g'], ['a', 'd', 'i'], ['c', 'e', 'h']])
+    eq_(names(BestFirstIter(tree, key=lambda item: -len(children(item)), children=children)),
+        ['f', 'g', 'i', 'h', 'b', 'a', 'd', 'c', 'e'])
+    eq_(PreOrderIter(tree, children=children).cursor_of(tree), ())
+    with assert_raises(ValueError, "Cursor of {'name': 'h'} is unknown, as the iterator walks by the children "
+                                   "function."):
+        PreOrderIter(tree, children=children).cursor_of({"name": "h"})
@@ -3,6 +3,7 @@ from nose.tools import eq_
 
 from helper import assert_raises
 from anytree import AnyNode
+from anytree import AttrNotifyMixin
 from anytree import LoopError
 from anytree import Node
 from anytree import NodeMixin
@@ -551,3 +552,88 @@ def test_node_slots():
     n = MyNode('foo')
     with assert_raises(AttributeError, "'MyNode' object has no attribute 'bar'"):
         n.bar = 4
+
+
+def test_subtree_hash():
+    """Subtree Hash."""
+    class NotifyNode(AttrNotifyMixin, Node):
+        pass
+
+    def build(cls):
+        root = cls("root")
+        sub0 = cls("sub0", parent=root, size=3)
+        cls("sub0A", parent=sub0)
+        sub1 = cls("sub1", parent=root)
+        cls("sub1A", parent=sub1, size=[1, 2])
+        return root
+
+    root = build(Node)
+    other = build(NotifyNode)
+    eq_(root.subtree_hash, other.subtree_hash)
+    eq_(len(root.subtree_hash), 40)
+    eq_(root.children[0].subtree_hash, other.children[0].subtree_hash)
+    eq_(root.subtree_hash == root.children[0].subtree_hash, False)
+
+    # attribute modification
+    other.children[1].children[0].size = [1, 2, 3]
+    eq_(root.subtree_hash == other.subtree_hash, False)
+    eq_(root.children[0].subtree_hash, other.children[0].subtree_hash)
+    del other.children[1].children[0].size
+    eq_(root.subtree_hash == other.subtree_hash, False)
+    other.children[1].children[0].size = [1, 2]
+    eq_(root.subtree_hash, other.subtree_hash)
+
+    # structure modification
+    moved = other.children[0].children[0]
+    moved.parent = other.children[1]
+    eq_(root.subtree_hash == other.subtree_hash, False)
+    moved.parent = other.children[0]
+    eq_(root.subtree_hash, other.subtree_hash)
+    other.children = list(reversed(other.children))
+    eq_(root.subtree_hash == other.subtree_hash, False)
+    other.children = list(reversed(other.children))
+    eq_(root.subtree_hash, other.subtree_hash)
+
+    # plain nodes are rehashed on every access
+    root.children[1].children[0].size = [1, 2, 3]
+    eq_(root.subtree_hash == other.subtree_hash, False)
+    root.children[1].children[0].size = [1, 2]
+    eq_(root.subtree_hash, other.subtree_hash)
+
+    # a plain node within a notifying tree
+    plain = Node("sub1A", parent=other.children[1])
+    hashed = other.subtree_hash
+    plain.size = 4
+    eq_(other.subtree_hash == hashed, False)
+    eq_(other.children[0].subtree_hash, root.children[0].subtree_hash)
+    plain.parent = None
+    eq_(root.subtree_hash, other.subtree_hash)
+
+    # child order and attribute placement matter
+    eq_(Node("a", x=1).subtree_hash == Node("a", y=1).subtree_hash, False)
+
+    # deeper than the recursion limit
+    node = top = Node("top")
+    for idx in range(1500):
+        node = Node(str(idx), parent=node)
+    eq_(len(top.subtree_hash), 40)
+
+
+def test_subtree_size():
+    """Subtree Size."""
+    root = Node("root")
+    sub0 = Node("sub0", parent=root)
+    sub0a = Node("sub0a", parent=sub0)
+    eq_(root.subtree_size, 3)
+    sub1 = Node("sub1", parent=root)
+    Node("sub1a", parent=sub1)
+    eq_((root.subtree_size, sub0.subtree_size, sub1.subtree_size), (5, 2, 2))
+    sub0a.parent = sub1
+    eq_((root.subtree_size, sub0.subtree_size, sub1.subtree_size), (5, 1, 3))
+    sub1.parent = None
+    eq_((root.subtree_size, sub0.subtree_size, sub1.subtree_size), (2, 1, 3))
+    root.children = [sub1, sub0]
+    eq_((root.subtree_size, sub0.subtree_size, sub1.subtree_size), (5, 1, 3))
+    eq_([node.subtree_size for node in PreOrderIter(root)], [5, 3, 1, 1, 1])
+    del root.children
+    eq_(root.subtree_size, 1)
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+import operator
+
+from nose.plugins.skip import SkipTest
+from nose.tools import eq_
+
+from anytree import CountError
+from anytree import Node
+from anytree import PreOrderIter
+from anytree import findall
+
+from helper import assert_raises
+
+try:
+    from concurrent.futures import ThreadPoolExecutor
+except ImportError:
+    raise SkipTest("concurrent.futures is not available")
+
+from anytree.parallel import partition  # noqa
+from anytree.parallel import pfindall  # noqa
+from anytree.parallel import pmap  # noqa
+from anytree.parallel import pmap_reduce  # noqa
+
+
+def _tree():
+    root = Node("root", size=0)
+    nodes = [root]
+    for idx in range(1, 200):
+        nodes.append(Node("n%d" % idx, parent=nodes[(idx - 1) // 3], size=idx))
+    return root
+
+
+def _name(node):
+    return node.name
+
+
+def _size(node):
+    return node.size
+
+
+def _odd(node):
+    return node.size % 2 == 1
+
+
+def _context(node):
+    return node.depth == 3 and node.path[1].name == "n1" and node.parent.size % 2 == 0
+
+
+def test_partition():
+    """Partition."""
+    root = _tree()
+    nodes = tuple(PreOrderIter(root))
+    for count in (1, 2, 3, 7, 16, 500):
+        shards = partition(root, count)
+        eq_(sum(shards, ()), nodes)
+        limit = max(len(nodes) // count, 1)
+        assert all(len(shard) <= limit for shard in shards)
+    eq_(partition(Node("single"), 4)[0][0].name, "single")
+
+    tree = ("root", [("sub0", [("sub0B", []), ("sub0A", [])]), ("sub1", [])])
+    shards = partition(tree, 2, children=lambda item: item[1])
+    eq_([[item[0] for item in shard] for shard in shards], [["root", "sub0"], ["sub0B", "sub0A"], ["sub1"]])
+
+
+def test_parallel_threads():
+    """Parallel processing with threads."""
+    root = _tree()
+    nodes = tuple(PreOrderIter(root))
+    executor = ThreadPoolExecutor(max_workers=3)
+    eq_(pmap(root, _name, workers=3, executor=executor), [node.name for node in nodes])
+    eq_(pmap(root, _name, workers=3, executor=executor, attrs=["name"]), [node.name for node in nodes])
+    eq_(pmap_reduce(root, _size, operator.add, workers=3, executor=executor), sum(range(200)))
+    eq_(pmap_reduce(root, _size, operator.add, initial=10, workers=3, executor=executor), sum(range(200)) + 10)
+    eq_(pfindall(root, _odd, workers=3, executor=executor), tuple([node for node in nodes if node.size % 2]))
+    eq_(pfindall(root, _context, workers=3, executor=executor), findall(root, filter_=_context))
+    eq_(pfindall(root.children[0], _context, workers=3, executor=executor),
+        findall(root.children[0], filter_=_context))
+    eq_(pmap(root.children[0], lambda node: node.root.name, workers=3, executor=executor),
+        ["root"] * root.children[0].subtree_size)
+    eq_(pmap_reduce(root, _name, lambda first, second: None, initial=None, workers=3, executor=executor), None)
+    with assert_raises(CountError, "Expecting 1 elements at maximum, but found at least 2. "
+                                   "(Node('/root/n1', size=1), Node('/root/n1/n4/n13', size=13))"):
+        pfindall(root.children[0], _odd, maxcount=1, executor=executor)
+    executor.shutdown()
+
+
+def test_parallel_processes():
+    """Parallel processing with processes."""
+    root = _tree()
+    nodes = tuple(PreOrderIter(root))
+    eq_(pmap(root, _size, workers=2), [node.size for node in nodes])
+    eq_(pfindall(root, _odd, workers=2), tuple([node for node in nodes if node.size % 2]))
+
+
+def test_parallel_children():
+    """Parallel processing of other structures."""
+    tree = {"name": "root", "size": 0, "children": [
+        {"name": "sub0", "size": 1, "children": [{"name": "sub0A", "size": 2}]},
+        {"name": "sub1", "size": 3, "_hidden": 4},
+    ]}
+    children = lambda item: item.get("children", ())  # noqa
+    executor = ThreadPoolExecutor(max_workers=2)
+    eq_(pmap(tree, _name, workers=2, executor=executor, children=children), ["root", "sub0", "sub0A", "sub1"])
+    eq_(pmap(tree, lambda node: sorted(node.__dict__), workers=2, executor=executor, children=children,
+             attrs=["size", "other"]), [["size"]] * 4)
+    eq_(pmap_reduce(tree, _size, operator.add, workers=2, executor=executor, children=children), 6)
+    eq_(pfindall(tree, _odd, workers=2, executor=executor, children=children),
+        (tree["children"][0], tree["children"][1]))
+
+    tree = ("root", 0, [("sub0", 1, [("sub0A", 2, [])]), ("sub1", 3, [])])
+    children = operator.itemgetter(2)
+    attrs = lambda item: [("name", item[0]), ("size", item[1])]  # noqa
+    eq_(pmap(tree, _name, workers=2, executor=executor, children=children, attrs=attrs),
+        ["root", "sub0", "sub0A", "sub1"])
+    eq_(pfindall(tree, _odd, workers=2, executor=executor, children=children, attrs=attrs),
+        (tree[2][0], tree[2][1]))
+    executor.shutdown()
@@ -1,4 +1,7 @@
 # -*- coding: utf-8 -*-
+import io
+import random
+
 import six
 
 from nose.tools import eq_
@@ -121,3 +124,318 @@ def test_by_attr():
         u"root\n├── sub0\n│   ├── sub0B\n│   └── sub0A\n└── sub1")
     eq_(anytree.RenderTree(root).by_attr("lines"),
         u"root\n├── su\n│   b0\n│   ├── sub\n│   │   0B\n│   └── \n└── sub1")
+
+
+def test_render_children():
+    """Render foreign structure."""
+    tree = ("root", [("sub0", [("sub0B", []), ("sub0A", [])]), ("sub1", [])])
+    r = anytree.RenderTree(tree, children=lambda item: item[1])
+    eq_([(pre, item[0]) for pre, _, item in r], [
+        (u"", "root"),
+        (u"├── ", "sub0"),
+        (u"│   ├── ", "sub0B"),
+        (u"│   └── ", "sub0A"),
+        (u"└── ", "sub1"),
+    ])
+
+
+def test_render_deep():
+    """Render trees deeper than the recursion limit."""
+    root = node = anytree.Node("0")
+    for idx in range(1, 1500):
+        node = anytree.Node(str(idx), parent=node)
+    anytree.Node("last", parent=root)
+    rows = list(anytree.RenderTree(root, style=anytree.AsciiStyle()))
+    eq_(len(rows), 1501)
+    eq_(rows[2].pre, u"|   +-- ")
+    eq_(rows[2].fill, u"|       ")
+    eq_(rows[1499].pre, u"|   " + u"    " * 1497 + u"+-- ")
+    eq_(rows[1500].pre, u"+-- ")
+    eq_(rows[1500].node.name, "last")
+
+
+def test_rows_children():
+    """Windowed rendering of other children."""
+    class HidingNode(anytree.Node):
+
+        @property
+        def children(self):
+            return tuple([child for child in super(HidingNode, self).children if not child.name.startswith("_")])
+
+    root = HidingNode("root")
+    sub0 = HidingNode("_sub0", parent=root)
+    HidingNode("sub0A", parent=sub0)
+    sub1 = HidingNode("sub1", parent=root)
+    HidingNode("_sub1A", parent=sub1)
+    HidingNode("sub1B", parent=sub1)
+    tree = anytree.RenderTree(root)
+    allrows = list(tree)
+    eq_(len(allrows), 3)
+    for start in range(-5, 6):
+        eq_(tree.rows(start), allrows[start:])
+        eq_(tree.rows(0, start), allrows[:start])
+
+    # foreign structure
+    data = {"name": "root", "items": [{"name": "a", "items": [{"name": "b"}]}, {"name": "c"}]}
+    tree = anytree.RenderTree(data, children=lambda item: item.get("items", ()))
+    allrows = list(tree)
+    eq_([row.node["name"] for row in allrows], ["root", "a", "b", "c"])
+    for start in range(-5, 6):
+        eq_(tree.rows(start), allrows[start:])
+
+
+def test_write():
+    """Write to file."""
+    root = anytree.Node("root", lines=["c0fe", "c0de"])
+    s0 = anytree.Node("sub0", parent=root, lines=["ha", "ba"])
+    anytree.Node("sub0B", parent=s0, lines=[1, 2, 3])
+    # node representations are ascii only on py2
+    anytree.Node("sub0A", parent=s0, lines=[u"a", u"ä"])
+    anytree.Node("sub1", parent=root, lines="a\nb")
+    for style in (anytree.ContStyle(), anytree.AsciiStyle()):
+        for attrname in (None, "name", "lines"):
+            tree = anytree.RenderTree(root, style=style)
+            if attrname is None:
+                expected = six.text_type(tree) + u"\n"
+            else:
+                expected = tree.by_attr(attrname) + u"\n"
+            fp = io.StringIO()
+            tree.write(fp, attrname=attrname)
+            eq_(fp.getvalue(), expected)
+            for encoding in ("utf-8", "utf-16-le"):
+                fp = io.BytesIO()
+                tree.write(fp, attrname=attrname, encoding=encoding)
+                eq_(fp.getvalue(), expected.encode(encoding))
+
+
+def test_write_chunks():
+    """Write in chunks."""
+    root = anytree.Node("root")
+    for idx in range(5000):
+        anytree.Node(str(idx), parent=root)
+
+    class File(object):
+
+        def __init__(self):
+            self.chunks = []
+
+        def write(self, data):
+            self.chunks.append(data)
+
+    fp = File()
+    tree = anytree.RenderTree(root)
+    tree.write(fp, attrname="name")
+    eq_(len(fp.chunks), 4)
+    eq_(u"".join(fp.chunks), tree.by_attr() + u"\n")
+
+
+def test_rows():
+    """Windowed rendering."""
+    rnd = random.Random(1)
+    root = anytree.Node("0")
+    nodes = [root]
+    for idx in range(1, 200):
+        nodes.append(anytree.Node(str(idx), parent=rnd.choice(nodes)))
+    sub = nodes[7]
+    orphan = anytree.Node("orphan")
+    tree = anytree.RenderTree(root)
+
+    def expected(tree, collapsed):
+        collapsed = set([id(node) for node in collapsed])
+        rows = []
+        for row in tree:
+            node = row.node
+            while node is not tree.node:
+                node = node.parent
+                if id(node) in collapsed:
+                    break
+            else:
+                rows.append(row)
+        return rows
+
+    for collapsed in ([], [nodes[3], nodes[7]], [root], [nodes[12], orphan], nodes[::5]):
+        allrows = expected(tree, collapsed)
+        eq_(tree.rows(collapsed=collapsed), allrows)
+        for _ in range(30):
+            start = rnd.randint(-len(allrows) - 2, len(allrows) + 2)
+            stop = rnd.randint(-len(allrows) - 2, len(allrows) + 2)
+            eq_(tree.rows(start, stop, collapsed=collapsed), allrows[start:stop])
+        subtree = anytree.RenderTree(sub, style=anytree.AsciiStyle(), childiter=reversed)
+        suballrows = expected(subtree, collapsed)
+        eq_(subtree.rows(1, collapsed=collapsed), suballrows[1:])
+        children = anytree.RenderTree(root, children=lambda node: node.children)
+        eq_(children.rows(9, 30, collapsed=collapsed), allrows[9:30])
+
+    eq_(tree.rows(-1), list(tree)[-1:])
+    eq_(tree.rows(0, -1), list(tree)[:-1])
+    eq_(tree.rows(-3, None), list(tree)[-3:])
+
+    # sizes follow modifications
+    nodes[3].parent = nodes[150] if nodes[3] not in nodes[150].path else None
+    anytree.Node("new", parent=nodes[20])
+    eq_(tree.rows(), list(tree))
+    eq_(tree.rows(17, 40), list(tree)[17:40])
+
+
+def test_truncate():
+    """Truncated rendering."""
+    root = anytree.Node("root")
+    for idx in range(4):
+        sub = anytree.Node("sub%d" % idx, parent=root)
+        for subidx in range(3):
+            anytree.Node("sub%d%d" % (idx, subidx), parent=sub)
+    anytree.Node("deep", parent=root.children[1].children[2])
+
+    def render(**kwargs):
+        return anytree.RenderTree(root, style=anytree.AsciiStyle(), **kwargs).by_attr()
+
+    eq_(render(maxlevel=1), u"root\n+-- ... 4 more")
+    eq_(render(maxlevel=2, maxchildren=2), u"\n".join([
+        u"root",
+        u"|-- sub0",
+        u"|   +-- ... 3 more",
+        u"|-- sub1",
+        u"|   +-- ... 3 more",
+        u"+-- ... 2 more"]))
+    eq_(render(maxchildren=1), u"\n".join([
+        u"root",
+        u"|-- sub0",
+        u"|   |-- sub00",
+        u"|   +-- ... 2 more",
+        u"+-- ... 3 more"]))
+    eq_(render(maxrows=9), u"\n".join([
+        u"root",
+        u"|-- sub0",
+        u"|   |-- sub00",
+        u"|   |-- sub01",
+        u"|   +-- sub02",
+        u"|-- sub1",
+        u"|   |-- sub10",
+        u"|   |-- sub11",
+        u"|   +-- sub12",
+        u"|       +-- ... 1 more",
+        u"+-- ... 2 more"]))
+    eq_(render(maxrows=5), u"\n".join([
+        u"root",
+        u"|-- sub0",
+        u"|   |-- sub00",
+        u"|   |-- sub01",
+        u"|   +-- sub02",
+        u"+-- ... 3 more"]))
+    eq_(render(maxrows=1), u"root\n+-- ... 4 more")
+    eq_(render(maxrows=100), render())
+    eq_(render(maxlevel=100, maxchildren=100), render())
+
+    tree = anytree.RenderTree(root, maxlevel=2, maxchildren=3, maxrows=4)
+    rows = list(tree)
+    eq_([row.node for row in rows[-2:]], [anytree.render.Elided(3), anytree.render.Elided(2)])
+    eq_(six.text_type(tree).split(u"\n")[-2:], [u"│   └── … 3 more", u"└── … 2 more"])
+    fp = io.StringIO()
+    tree.write(fp)
+    eq_(fp.getvalue(), six.text_type(tree) + u"\n")
+    # window rendering is not truncated
+    eq_(tree.rows(), list(anytree.RenderTree(root)))
+
+
+class NotifyNode(anytree.AttrNotifyMixin, anytree.Node):
+    pass
+
+
+def test_live_render():
+    """Live rendering."""
+    root = NotifyNode("root")
+    s0 = NotifyNode("sub0", parent=root)
+    s0a = NotifyNode("sub0A", parent=s0)
+    plain = anytree.Node("plain", parent=s0)
+    live = anytree.LiveRender(root, style=anytree.AsciiStyle)
+    eq_(str(live), anytree.RenderTree(root, style=anytree.AsciiStyle()).by_attr())
+    s0a.parent = None
+    eq_(live.update(), [
+        anytree.RowChange("delete", 2, 3, []),
+    ])
+    s0.name = "s0"
+    s0.name = "sub0"
+    eq_(live.update(), [
+        anytree.RowChange("replace", 1, 2, ["+-- sub0"]),
+    ])
+    plain.name = "PLAIN"
+    eq_(live.update(), [])
+    live.refresh(plain)
+    eq_(live.update(), [
+        anytree.RowChange("replace", 2, 3, ["    +-- PLAIN"]),
+    ])
+    plain.parent = None
+    eq_(live.update(), [
+        anytree.RowChange("delete", 2, 3, []),
+    ])
+    eq_(live.lines, ["root", "+-- sub0"])
+
+    # multi-line attributes
+    s1 = NotifyNode("sub1\nline", parent=s0)
+    NotifyNode("sub1A", parent=s1)
+    eq_(live.lines, ["root", "+-- sub0", "    +-- sub1", "        line", "        +-- sub1A"])
+    s1.name = "sub1"
+    plain = anytree.Node("plain", parent=s0)
+    eq_(live.lines, ["root", "+-- sub0", "    |-- sub1", "    |   +-- sub1A", "    +-- plain"])
+    plain.name = ("plain", "two", "rows")
+    live.refresh(plain)
+    eq_(live.update(), [
+        anytree.RowChange("insert", 2, 2, ["    +-- sub1", "        line"]),
+        anytree.RowChange("insert", 4, 4, ["        +-- sub1A"]),
+        anytree.RowChange("replace", 2, 4, ["    +-- sub1"]),
+        anytree.RowChange("replace", 2, 4, ["    |-- sub1", "    |   +-- sub1A"]),
+        anytree.RowChange("insert", 4, 4, ["    +-- plain"]),
+        anytree.RowChange("replace", 4, 5, ["    +-- plain", "        two", "        rows"]),
+    ])
+    s1.parent = None
+    eq_(live.lines, ["root", "+-- sub0", "    +-- plain", "        two", "        rows"])
+    plain.parent = None
+    live.update()
+    eq_(live.lines, ["root", "+-- sub0"])
+    live.close()
+    NotifyNode("sub1", parent=root)
+    eq_(live.update(), [])
+    eq_(live.lines, ["root", "+-- sub0"])
+    live.close()
+
+
+def test_live_render_random():
+    """Live rendering follows random modifications."""
+    rand = random.Random(42)
+    root = NotifyNode("root")
+    nodes = [root]
+    live = anytree.LiveRender(root)
+    rows = list(live.lines)
+    for step in range(300):
+        action = rand.random()
+        node = rand.choice(nodes)
+        if action < 0.5 or node is root:
+            nodes.append(NotifyNode("n%d" % step, parent=node))
+        elif action < 0.6:
+            node.name = "r%d" % step
+        elif action < 0.7:
+            # multi-line names span several rows
+            node.name = "\n".join(["m%d" % step] * rand.randint(1, 3))
+        elif action < 0.8:
+            node.children = list(reversed(node.children))
+        else:
+            parent = rand.choice(nodes)
+            if node in parent.path:
+                node.parent = None
+                removed = set(node.descendants) | set([node])
+                nodes = [item for item in nodes if item not in removed]
+            else:
+                siblings = [child for child in parent.children if child is not node]
+                node._set_parent(parent, rand.randint(0, len(siblings)))
+        if step % 7 == 0:
+            for change in live.update():
+                if not change.lines:
+                    eq_(change.kind, "delete")
+                elif change.start == change.stop:
+                    eq_(change.kind, "insert")
+                else:
+                    eq_(change.kind, "replace")
+                rows[change.start:change.stop] = change.lines
+            expected = anytree.RenderTree(root).by_attr().split("\n")
+            eq_(live.lines, expected)
+            eq_(rows, expected)
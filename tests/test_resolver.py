@@ -1,4 +1,6 @@
 # -*- coding: utf-8 -*-
+import warnings
+
 from nose.tools import eq_
 
 import anytree as at
@@ -18,6 +20,10 @@ def test_get():
     eq_(r.get(sub1, ".."), top)
     eq_(r.get(sub1, "../sub0/sub0sub1"), sub0sub1)
     eq_(r.get(sub1, "."), sub1)
+    with assert_raises(at.ResolverError, "Node('/top') has no parent."):
+        r.get(top, "..")
+    with assert_raises(at.ResolverError, "Node('/top') has no parent."):
+        r.get(sub0, "../../sub0")
     eq_(r.get(sub1, ""), sub1)
     with assert_raises(at.ChildResolverError,
                        "Node('/top') has no child sub2. Children are: 'sub0', 'sub1'."):
@@ -59,15 +65,80 @@ def test_glob_cache():
     sub1 = at.Node("sub1", parent=root)
     r = at.Resolver()
     # strip down cache size
+    maxcache = at.resolver._MAXCACHE
     at.resolver._MAXCACHE = 2
-    at.Resolver._match_cache.clear()
-    eq_(len(at.Resolver._match_cache), 0)
-    eq_(r.glob(root, "sub0"), [sub0])
-    eq_(len(at.Resolver._match_cache), 1)
-    eq_(r.glob(root, "sub1"), [sub1])
-    eq_(len(at.Resolver._match_cache), 2)
-    eq_(r.glob(root, "sub*"), [sub0, sub1])
-    eq_(len(at.Resolver._match_cache), 1)
+    try:
+        at.Resolver._match_cache.clear()
+        eq_(len(at.Resolver._match_cache), 0)
+        eq_(r.glob(root, "sub0"), [sub0])
+        eq_(len(at.Resolver._match_cache), 1)
+        eq_(r.glob(root, "sub1"), [sub1])
+        eq_(len(at.Resolver._match_cache), 2)
+        eq_(r.glob(root, "sub0"), [sub0])
+        # least recently used is dropped
+        eq_(r.glob(root, "sub*"), [sub0, sub1])
+        eq_(len(at.Resolver._match_cache), 2)
+        eq_(sorted(at.Resolver._match_cache), [("sub*",), ("sub0",)])
+    finally:
+        at.resolver._MAXCACHE = maxcache
+
+
+def test_glob_pattern():
+    """Wildcard patterns."""
+    top = at.Node("top", parent=None)
+    a = at.Node("a", parent=top)
+    ab = at.Node("b", parent=a)
+    abc = at.Node("c", parent=ab)
+    b = at.Node("b", parent=top)
+    bc = at.Node("c", parent=b)
+    x = at.Node("[x]", parent=top)
+    at.Node(None, parent=top)
+    r = at.Resolver()
+    eq_(r.glob(top, "[ab]"), [a, b])
+    eq_(r.glob(top, "[!a]"), [b])
+    eq_(r.glob(top, "[a-z]/[^b]"), [ab])
+    eq_(r.glob(top, "[[]x]"), [x])
+    eq_(r.glob(top, "**"), [top, a, ab, abc, b, bc, x, top.children[-1]])
+    eq_(r.glob(top, "**/c"), [abc, bc])
+    eq_(r.glob(top, "a/**/c"), [abc])
+    eq_(r.glob(top, "**/b/c"), [abc, bc])
+    eq_(r.glob(top, "**/d"), [])
+    eq_(r.glob(a, "../b/"), [b])
+    eq_(r.glob(bc, "/top/**/b"), [ab, b])
+    with assert_raises(at.ResolverError, "Node('/top') has no parent."):
+        r.glob(top, "..")
+    eq_(r.glob(top, "*/../.."), [])
+    eq_(r.glob(top, "**/**/c"), [abc, bc])
+    eq_(r.glob(top, "**/c/.."), [ab, b])
+    eq_(r.glob(top, "*/**/b"), [ab])
+    nodes = r.iglob(top, "**/c")
+    eq_(next(nodes), abc)
+    eq_(next(nodes), bc)
+    eq_(list(nodes), [])
+    with assert_raises(at.ChildResolverError, "Node('/top/b') has no child b. Children are: 'c'."):
+        list(r.iglob(top, "b/b"))
+
+
+def test_glob_set():
+    """Special characters within character sets."""
+    top = at.Node("top")
+    nodes = dict([(name, at.Node(name, parent=top)) for name in ("&", "~", "|", "-", "[", "]", "a", "b", "z")])
+    r = at.Resolver()
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        eq_(r.glob(top, "[&&]"), [nodes["&"]])
+        eq_(r.glob(top, "[~~b]"), [nodes["~"], nodes["b"]])
+        eq_(r.glob(top, "[||]"), [nodes["|"]])
+        eq_(r.glob(top, "[a--]"), [])
+        eq_(r.glob(top, "[--a]"), [nodes["-"], nodes["["], nodes["]"], nodes["a"]])
+        eq_(r.glob(top, "[-a]"), [nodes["-"], nodes["a"]])
+        eq_(r.glob(top, "[a-]"), [nodes["-"], nodes["a"]])
+        eq_(r.glob(top, "[[]"), [nodes["["]])
+        eq_(r.glob(top, "[a[]"), [nodes["["], nodes["a"]])
+        eq_(r.glob(top, "[]]"), [nodes["]"]])
+        eq_(r.glob(top, "[z-a]"), [])
+        eq_(r.glob(top, "[!z-a]"), list(top.children))
+        eq_(r.glob(top, "[!&-a]"), [nodes["~"], nodes["|"], nodes["b"], nodes["z"]])
 
 
 def test_same_name():
@@ -78,3 +149,121 @@ def test_same_name():
     r = at.Resolver()
     eq_(r.get(root, "sub"), sub0)
     eq_(r.glob(root, "sub"), [sub0, sub1])
+
+
+def test_rename():
+    """Renamed children."""
+    class NotifyNode(at.AttrNotifyMixin, at.Node):
+        pass
+
+    for cls in (at.Node, NotifyNode):
+        root = cls("r")
+        a = cls("a", parent=root)
+        b = cls("b", parent=root)
+        x = cls("x", parent=root)
+        r = at.Resolver()
+        eq_(r.get(root, "x"), x)
+        eq_(r.glob(root, "x"), [x])
+        eq_(r.get(root, "b"), b)
+        b.name = "x"
+        eq_(r.glob(root, "x"), [b, x])
+        eq_(r.get(root, "x"), b)
+        a.name = "x"
+        eq_(r.get(root, "x"), a)
+        eq_(r.glob(root, "x"), [a, b, x])
+        del a.name
+        eq_(r.get(root, "x"), b)
+        eq_(r.get_many(root, ["x", "a"])[0], b)
+
+
+def test_children_override():
+    """Hidden children are not resolved."""
+    class HidingNode(at.Node):
+
+        @property
+        def children(self):
+            return tuple([child for child in super(HidingNode, self).children if not child.name.startswith("_")])
+
+    root = HidingNode("root")
+    HidingNode("_secret", parent=root)
+    visible = HidingNode("visible", parent=root)
+    r = at.Resolver()
+    eq_(r.get(root, "visible"), visible)
+    with assert_raises(at.ChildResolverError, "HidingNode('/root') has no child _secret. Children are: 'visible'."):
+        r.get(root, "_secret")
+    eq_(r.glob(root, "_*"), [])
+
+
+def test_get_child_map():
+    """Get with hashed child lookup."""
+    class NotifyNode(at.AttrNotifyMixin, at.Node):
+        pass
+
+    top = NotifyNode("top", parent=None)
+    subs = [NotifyNode("sub%d" % idx, parent=top) for idx in range(100)]
+    r = at.Resolver('name')
+    eq_(top._child_map("name")["sub7"], [subs[7]])
+    eq_(r.get(top, "sub42"), subs[42])
+    eq_(r.get(top, "sub99"), subs[99])
+    # attach
+    new = NotifyNode("new", parent=top)
+    eq_(r.get(top, "new"), new)
+    # detach
+    subs[42].parent = None
+    with assert_raises(at.ChildResolverError, "NotifyNode('/top') has no child sub42. Children are: %s." % (
+            ", ".join([repr(node.name) for node in top.children]))):
+        r.get(top, "sub42")
+    # rename
+    subs[43].name = "renamed"
+    eq_(r.get(top, "renamed"), subs[43])
+    with assert_raises(at.ChildResolverError, "NotifyNode('/top') has no child sub43. Children are: %s." % (
+            ", ".join([repr(node.name) for node in top.children]))):
+        r.get(top, "sub43")
+    subs[44].name = "sub43"
+    eq_(r.get(top, "sub43"), subs[44])
+    # other attribute, the first of the same names wins
+    for idx, node in enumerate(top.children):
+        node.key = "key%d" % (idx // 2)
+    r = at.Resolver('key')
+    eq_(r.get(top, "key3"), top.children[6])
+    eq_(r.get(top, "key0"), top.children[0])
+    # plain children are scanned
+    at.Node("plain", parent=top)
+    eq_(top._child_map("name"), None)
+    eq_(r.get(top, "key3"), top.children[6])
+
+
+def test_get_many():
+    """Get many paths."""
+    top = at.Node("top", parent=None)
+    sub0 = at.Node("sub0", parent=top)
+    sub0sub0 = at.Node("sub0sub0", parent=sub0)
+    sub0sub1 = at.Node("sub0sub1", parent=sub0)
+    sub1 = at.Node("sub1", parent=top)
+    r = at.Resolver('name')
+    paths = ["sub0/sub0sub1", "sub0/sub0sub0", "sub0/sub2/sub0", "sub0/sub2", "/top/sub1", "/bar", "", "..",
+             "/top/sub0/../sub1", "sub0/sub0sub0"]
+    results = r.get_many(top, paths)
+    eq_(len(results), len(paths))
+    eq_(results[:2], [sub0sub1, sub0sub0])
+    eq_(results[2].__class__, at.ChildResolverError)
+    eq_(str(results[2]), "Node('/top/sub0') has no child sub2. Children are: 'sub0sub0', 'sub0sub1'.")
+    eq_(results[3], results[2])
+    eq_(results[4], sub1)
+    eq_(results[5].__class__, at.ResolverError)
+    eq_(str(results[5]), "unknown root node '/bar'. root is '/top'.")
+    eq_(results[6], top)
+    eq_(results[7].__class__, at.ResolverError)
+    eq_(str(results[7]), "Node('/top') has no parent.")
+    eq_(results[8:], [sub1, sub0sub0])
+    for path, result in zip(paths, results):
+        if isinstance(result, at.ResolverError):
+            with assert_raises(result.__class__, str(result)):
+                r.get(top, path)
+        else:
+            eq_(r.get(top, path), result)
+    results = r.get_many(sub1, ["../../sub0", "..", "../.."])
+    eq_(str(results[0]), "Node('/top') has no parent.")
+    eq_(results[1], top)
+    eq_(str(results[2]), "Node('/top') has no parent.")
+    eq_(r.get_many(sub1, []), [])
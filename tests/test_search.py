@@ -3,11 +3,17 @@ from nose.tools import eq_
 from anytree import AsciiStyle
 from anytree import Node
 from anytree import PreOrderIter
+from anytree import Q
 from anytree import RenderTree
 from anytree import find
 from anytree import find_by_attr
 from anytree import findall, CountError
 from anytree import findall_by_attr
+from anytree import ifindall
+from anytree import ifindall_by_attr
+from anytree import TreeIndex
+from anytree import topk
+from helper import Unordered
 from helper import assert_raises
 
 
@@ -26,9 +32,13 @@ def test_findall():
             "(Node('/f/b/d'), Node('/f/b/d/c'), Node('/f/b/d/e'))")):
         findall(f, filter_=lambda node: d in node.path, mincount=4)
     with assert_raises(CountError, (
-            "Expecting 2 elements at maximum, but found 3. "
+            "Expecting 2 elements at maximum, but found at least 3. "
             "(Node('/f/b/d'), Node('/f/b/d/c'), Node('/f/b/d/e'))")):
         findall(f, filter_=lambda node: d in node.path, maxcount=2)
+    with assert_raises(CountError, (
+            "Expecting 1 elements at maximum, but found at least 2. "
+            "(Node('/f/b/d'), Node('/f/b/d/c'))")):
+        findall(f, filter_=lambda node: d in node.path, maxcount=1)
 
 def test_findall_by_attr():
     f = Node("f")
@@ -57,8 +67,8 @@ def test_find():
     eq_(find(f, lambda n: n.name == "d"), d)
     eq_(find(f, lambda n: n.name == "z"), None)
     with assert_raises(CountError, (
-        "Expecting 1 elements at maximum, but found 5. "
-        "(Node('/f/b'), Node('/f/b/a'), Node('/f/b/d'), Node('/f/b/d/c'), Node('/f/b/d/e'))")):
+        "Expecting 1 elements at maximum, but found at least 2. "
+        "(Node('/f/b'), Node('/f/b/a'))")):
         find(f, lambda n: b in n.path)
 
 def test_find_by_attr():
@@ -75,3 +85,197 @@ def test_find_by_attr():
     eq_(find_by_attr(f, "d"), d)
     eq_(find_by_attr(f, name="foo", value=4), c)
     eq_(find_by_attr(f, name="foo", value=8), None)
+
+
+def test_topk():
+    f = Node("f", size=20)
+    b = Node("b", parent=f, size=12)
+    a = Node("a", parent=b, size=3)
+    d = Node("d", parent=b, size=8)
+    c = Node("c", parent=d, size=2)
+    e = Node("e", parent=d, size=5)
+    g = Node("g", parent=f, size=7)
+    x = Node("x", parent=g, size=1)
+
+    visited = set()
+
+    def key(node):
+        visited.add(node)
+        return node.size
+
+    eq_(topk(f, key, 3), (f, b, d))
+    eq_(len(visited), 8)
+    visited.clear()
+    eq_(topk(f, key, 3, bound=key), (f, b, d))
+    eq_(x in visited, False)
+    eq_(topk(f, key, 10, bound=key), (f, b, d, g, e, a, c, x))
+    eq_(topk(f, key, 2, filter_=lambda n: n.is_leaf), (e, a))
+    eq_(topk(f, key, 2, bound=key, filter_=lambda n: n.is_leaf), (e, a))
+    eq_(topk(f, key, 2, bound=key, maxlevel=2, filter_=lambda n: n.name != "f"), (b, g))
+    eq_(topk(f, key, 2, stop=lambda n: n.name == "g"), (f, b))
+    eq_(topk(f, key, 0), ())
+
+
+def test_children_accessor():
+    tree = {"name": "f", "size": 1, "items": [
+        {"name": "b", "size": 3, "items": [{"name": "a", "size": 2}]},
+        {"name": "d", "size": 4}]}
+
+    def children(item):
+        return item.get("items", ())
+
+    eq_(findall(tree, filter_=lambda n: n["size"] > 1, children=children),
+        (tree["items"][0], tree["items"][0]["items"][0], tree["items"][1]))
+    eq_(find(tree, filter_=lambda n: n["name"] == "a", children=children), tree["items"][0]["items"][0])
+    eq_(topk(tree, lambda n: n["size"], 1, children=children), (tree["items"][1], ))
+
+
+def test_find_early():
+    f = Node("f")
+    b = Node("b", parent=f)
+    a = Node("a", parent=b)
+    d = Node("d", parent=b)
+    g = Node("g", parent=f)
+    Node("x", parent=a)
+    Node("x", parent=g)
+
+    visited = []
+
+    def filter_(node):
+        visited.append(node)
+        return node.name in ("b", "a")
+
+    with assert_raises(CountError, (
+            "Expecting 1 elements at maximum, but found at least 2. (Node('/f/b'), Node('/f/b/a'))")):
+        find(f, filter_)
+    eq_(visited, [f, b, a])
+
+    del visited[:]
+    eq_(find(f, filter_, shallowest=True), b)
+    eq_(visited, [f, b])
+    eq_(find(f, lambda n: n.name == "x", shallowest=True), g.children[0])
+    eq_(find(f, lambda n: n.name == "x", shallowest=True, maxlevel=2), None)
+    eq_(find_by_attr(f, "x", shallowest=True), g.children[0])
+    eq_(find_by_attr(f, "d", shallowest=True), d)
+
+
+def test_count_error_preview():
+    f = Node("f")
+    for idx in range(12):
+        Node(str(idx), parent=f)
+    with assert_raises(CountError, (
+            "Expecting at least 20 elements, but found 13. (Node('/f'), Node('/f/0'), Node('/f/1'), "
+            "Node('/f/2'), Node('/f/3'), Node('/f/4'), Node('/f/5'), Node('/f/6'), Node('/f/7'), "
+            "Node('/f/8'), ...)")):
+        findall(f, mincount=20)
+
+
+def test_query():
+    f = Node("f", kind="dir")
+    b = Node("b", parent=f, kind="dir")
+    a = Node("a", parent=b, kind="file", size=300)
+    d = Node("d", parent=b, kind="dir")
+    c = Node("c", parent=d, kind="file", size=5000)
+    e = Node("e", parent=d, kind="link")
+    g = Node("g", parent=f, kind="file", size=2000)
+
+    eq_(findall(f, filter_=Q()), (f, b, a, d, c, e, g))
+    eq_(findall(f, filter_=Q(kind="file")), (a, c, g))
+    eq_(findall(f, filter_=Q(kind__ne="file")), (f, b, d, e))
+    eq_(findall(f, filter_=Q(size__lt=2000)), (a,))
+    eq_(findall(f, filter_=Q(size__le=2000)), (a, g))
+    eq_(findall(f, filter_=Q(size__gt=2000)), (c,))
+    eq_(findall(f, filter_=Q(size__ge=2000)), (c, g))
+    eq_(findall(f, filter_=Q(name__in=("a", "e"))), (a, e))
+    eq_(findall(f, filter_=Q(kind__contains="i")), (f, b, a, d, c, e, g))
+    eq_(findall(f, filter_=Q(kind__startswith="l")), (e,))
+    eq_(findall(f, filter_=Q(kind__endswith="e")), (a, c, g))
+    eq_(findall(f, filter_=Q(kind="file", size__gt=1000)), (c, g))
+    eq_(findall(f, filter_=Q(kind="link") | Q(size__gt=1000)), (c, e, g))
+    eq_(findall(f, filter_=~(Q(kind="link") | Q(kind="dir"))), (a, c, g))
+    eq_(findall(f, filter_=~~Q(kind="link")), (e,))
+    eq_(findall(f, filter_=Q(size__lt=Unordered())), ())
+    eq_(list(PreOrderIter(f, filter_=Q(kind="link"))), [e])
+
+    # depth
+    eq_(findall(f, filter_=Q(kind="file", depth__lt=3)), (a, g))
+    eq_(findall(f, filter_=Q(kind="file", depth__le=3)), (a, c, g))
+    eq_(findall(f, filter_=Q(depth=2)), (a, d))
+    eq_(findall(b, filter_=Q(depth=2)), (a, d))
+    eq_(findall(d, filter_=Q(depth__le=1)), ())
+    eq_(findall(f, filter_=Q(depth__ge=2), maxlevel=3), (a, d))
+    eq_(find(f, filter_=Q(kind="file", depth__le=2), shallowest=True), g)
+
+    # repr
+    eq_(repr(Q()), "Q()")
+    eq_(repr(Q(kind="file", size__gt=4)), "Q(kind='file') & Q(size__gt=4)")
+    eq_(repr(~(Q(kind="link") | Q(kind="dir")) & Q(a=1)), "~(Q(kind='link') | Q(kind='dir')) & Q(a=1)")
+
+    # plans
+    query = Q(kind="file", size__gt=1000, depth__le=2)
+    eq_(query.explain(f),
+        "plan: pre-order scan\nmaxlevel: 3\nfilter: Q(kind='file') & Q(size__gt=1000)\nvisits: at most 7")
+    index = TreeIndex(f, "kind")
+    TreeIndex(f, "name")
+    eq_(query.explain(f), "plan: index lookup kind == 'file'\nmaxlevel: 3\nfilter: Q(size__gt=1000)\nvisits: 3")
+    eq_(findall(f, filter_=query), (g,))
+    eq_(Q(kind="dir", name="d").explain(b),
+        "plan: index lookup name == 'd'\nmaxlevel: None\nfilter: Q(kind='dir')\nvisits: 1")
+    eq_(findall(b, filter_=Q(kind="dir", name="d")), (d,))
+    eq_(Q(kind="file").explain(f, stop=lambda node: node is d),
+        "plan: pre-order scan\nmaxlevel: None\nfilter: Q(kind='file')\nvisits: at most 7")
+    eq_(findall(f, filter_=Q(kind="file"), stop=lambda node: node is d), (a, g))
+    index.close()
+    eq_(findall(f, filter_=query), (g,))
+
+
+def test_ifindall():
+    f = Node("f")
+    b = Node("b", parent=f)
+    a = Node("a", parent=b)
+    d = Node("d", parent=b)
+    c = Node("c", parent=d)
+    e = Node("e", parent=d)
+    g = Node("g", parent=f)
+    i = Node("i", parent=g)
+    h = Node("h", parent=i)
+
+    eq_(list(ifindall(f)), [f, b, a, d, c, e, g, i, h])
+    eq_(list(ifindall(f, filter_=lambda n: n.name in ("a", "c", "h"), stop=lambda n: n is g)), [a, c])
+    eq_(list(ifindall(f, maxlevel=2)), [f, b, g])
+    eq_(list(ifindall(f, filter_=Q(depth=2))), [a, d, i])
+    eq_(list(ifindall(f, mincount=9, maxcount=9)), [f, b, a, d, c, e, g, i, h])
+
+    # the error is raised at the first match exceeding maxcount
+    visited = []
+
+    def filter_(node):
+        visited.append(node)
+        return True
+    nodes = ifindall(f, filter_=filter_, maxcount=3)
+    eq_([next(nodes), next(nodes), next(nodes)], [f, b, a])
+    with assert_raises(CountError, ("Expecting 3 elements at maximum, but found at least 4. "
+                                    "(Node('/f'), Node('/f/b'), Node('/f/b/a'), Node('/f/b/d'))")):
+        next(nodes)
+    eq_(visited, [f, b, a, d])
+
+    # error messages equal findall
+    for kwargs in ({"mincount": 10}, {"maxcount": 2}, {"maxcount": 0}):
+        try:
+            findall(f, **kwargs)
+        except CountError as exc:
+            expected = str(exc)
+        with assert_raises(CountError, expected):
+            list(ifindall(f, **kwargs))
+
+    eq_(list(ifindall_by_attr(f, "d")), [d])
+    eq_(list(ifindall_by_attr(f, "x")), [])
+    with assert_raises(CountError, "Expecting at least 1 elements, but found 0."):
+        list(ifindall_by_attr(f, "x", mincount=1))
+    TreeIndex(f)
+    Node("d", parent=g)
+    nodes = ifindall_by_attr(f, "d", maxcount=1)
+    eq_(next(nodes), d)
+    with assert_raises(CountError, "Expecting 1 elements at maximum, but found at least 2. "
+                                   "(Node('/f/b/d'), Node('/f/g/d'))"):
+        next(nodes)
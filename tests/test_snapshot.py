@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+from nose.plugins.skip import SkipTest
+from nose.tools import eq_
+
+from anytree import CountError
+from anytree import Node
+from anytree import Q
+from anytree import findall
+
+from helper import assert_raises
+
+try:
+    import numpy  # noqa
+except ImportError:
+    raise SkipTest("numpy is not available")
+
+from anytree.snapshot import TreeSnapshot  # noqa
+
+
+def test_snapshot():
+    """Snapshot search."""
+    f = Node("f", kind="dir")
+    b = Node("b", parent=f, kind="dir")
+    a = Node("a", parent=b, kind="file", size=300)
+    d = Node("d", parent=b, kind="dir")
+    c = Node("c", parent=d, kind="file", size=5000)
+    e = Node("e", parent=d, kind="link", size="none")
+    g = Node("g", parent=f, kind="file", size=2000)
+
+    snapshot = TreeSnapshot(f, attrs=["size", "kind"])
+    eq_(len(snapshot), 7)
+    eq_(snapshot.nodes, (f, b, a, d, c, e, g))
+    eq_(list(snapshot.depth), [0, 1, 2, 2, 3, 3, 1])
+    eq_(list(snapshot.end), [7, 6, 3, 6, 5, 6, 7])
+    eq_(list(snapshot.present("size")), [False, False, True, False, True, True, True])
+    eq_(snapshot.position(d), 3)
+    with assert_raises(ValueError, "Node('/x') is not part of the snapshot."):
+        snapshot.position(Node("x"))
+
+    queries = [
+        Q(),
+        Q(kind="file"),
+        Q(kind__ne="file"),
+        Q(size__gt=1000),
+        Q(size__le=2000),
+        Q(size__in=(300, 5000)),
+        Q(kind__startswith="f"),
+        Q(kind__endswith="k"),
+        Q(kind__contains="i"),
+        Q(name__in="abc"),
+        Q(kind="file") | Q(kind="link"),
+        ~Q(kind="file") & Q(depth__ge=2),
+        Q(depth__le=2, kind="dir"),
+    ]
+    for query in queries:
+        for node in (f, b, d, c):
+            for maxlevel in (None, 1, 2, 3):
+                eq_(snapshot.findall(node, filter_=query, maxlevel=maxlevel),
+                    findall(node, filter_=query, maxlevel=maxlevel))
+
+    eq_(snapshot.findall(filter_=lambda columns: columns["depth"] == 2), (a, d))
+    eq_(snapshot.findall(d), (d, c, e))
+    with assert_raises(CountError, "Expecting at least 3 elements, but found 2. "
+                                   "(Node('/f/b/d/c', kind='file', size=5000), Node('/f/g', kind='file', size=2000))"):
+        snapshot.findall(filter_=Q(size__gt=1000), mincount=3)
+
+    # mask functions returning a column do not modify it
+    a.flag = g.flag = True
+    flags = TreeSnapshot(f)
+    eq_(flags.findall(filter_=lambda columns: columns["flag"], maxlevel=2), (g,))
+    eq_(flags.findall(filter_=Q(flag=True)), (a, g))
+
+    # sequence values
+    a.pair = (1, 2)
+    c.pair = (3, 4)
+    pairs = TreeSnapshot(f)
+    eq_(pairs.findall(filter_=Q(pair=(1, 2))), (a,))
+    eq_(pairs.findall(filter_=Q(pair__in=[(3, 4)])), (c,))
+    eq_(pairs["pair"][2], (1, 2))
+    del a.flag, g.flag, a.pair, c.pair
+
+    # frozen
+    Node("h", parent=f, kind="file")
+    eq_(snapshot.findall(filter_=Q(kind="file")), (a, c, g))
+
+
+def test_snapshot_children():
+    """Snapshot of foreign structure."""
+    tree = ("root", [("sub0", [("sub0B", []), ("sub0A", [])]), ("sub1", [])])
+    snapshot = TreeSnapshot(tree, children=lambda item: item[1])
+    eq_([item[0] for item in snapshot.findall(filter_=lambda columns: columns["depth"] == 1)], ["sub0", "sub1"])
+    eq_([item[0] for item in snapshot.findall(tree[1][0])], ["sub0", "sub0B", "sub0A"])